@@ -2,46 +2,64 @@ import math
 
 from Library.Database.Dataframe import pl
 from Library.Database import DatabaseAPI
-from Library.Utility import BarAPI
+from Library.Market.Bar import BarAPI
 from Library.Parameters import Parameters
 
-from Library.Analyst import MARGIN, MarketAPI, IndicatorAPI
+from Library.Analyst import MARGIN, MarketAPI, GraphAPI, IndicatorAPI
 
 class AnalystAPI:
 
-    def __init__(self, analyst_management: Parameters):
+    def __init__(self, analyst_management: Parameters, capacity: int | None = None, vectorized: bool = False):
         self.AnalystManagement: Parameters = analyst_management
         self.Window: int = MARGIN
-        self.Market: MarketAPI = MarketAPI()
+        self.Market: MarketAPI = MarketAPI(capacity)
 
+        self._offset: int = 1
+        self._data: pl.DataFrame | None = None
+        self._versions: tuple[int, ...] | None = None
         self._indicators: list[IndicatorAPI] = []
         analyst_management = analyst_management if analyst_management else {}
         for indicator_name, indicator_configuration in analyst_management.items() or {}:
             indicator_function, *indicator_parameters = indicator_configuration
-            indicator = IndicatorAPI(indicator=indicator_function, parameters=indicator_parameters)
+            indicator = IndicatorAPI(indicator=indicator_function, parameters=indicator_parameters, capacity=capacity, vectorized=vectorized)
             setattr(self, indicator_name, indicator)
             self._indicators.append(indicator)
             indicator_max = max(indicator_parameters) if indicator_parameters else 0
             self.Window = math.ceil(max(self.Window, indicator_max + MARGIN))
 
-    def data(self) -> pl.DataFrame:
-        result = pl.DataFrame()
-        result = result.hstack(self.Market.data())
-        for indicator in self._indicators:
-            result = result.hstack(indicator.data())
-        return result
+    def versions(self) -> tuple[int, ...]:
+        return self.Market.version(), *(indicator.version() for indicator in self._indicators)
+
+    def data(self, columns: list[str] | None = None) -> pl.DataFrame:
+        if self._data is None or self._versions != self.versions():
+            if columns is not None:
+                frames = [component.data() for component in (self.Market, *self._indicators) if not set(columns).isdisjoint(component.columns())]
+                return pl.concat(frames or [pl.DataFrame()], how="horizontal").select(columns)
+            self._data = pl.concat([self.Market.data(), *(indicator.data() for indicator in self._indicators)], how="horizontal")
+            self._versions = self.versions()
+        return self._data.select(columns) if columns is not None else self._data
+
+    def head(self, n: int | None = None, columns: list[str] | None = None) -> pl.DataFrame:
+        return self.data(columns).head(n)
 
-    def head(self, n: int | None = None) -> pl.DataFrame:
-        return self.data().head(n)
+    def tail(self, n: int | None = None, columns: list[str] | None = None) -> pl.DataFrame:
+        return self.data(columns).tail(n)
 
-    def tail(self, n: int | None = None) -> pl.DataFrame:
-        return self.data().tail(n)
+    def last(self, shift: int = 0, columns: list[str] | None = None) -> pl.DataFrame:
+        return self.data(columns)[-(self._offset + shift)]
 
     def init_market_data(self, data: pl.DataFrame | list[BarAPI]) -> None:
         data_df = DatabaseAPI.format_market_data(data)
         self.Market.init_data(data_df)
+        graph = GraphAPI(self.Market, cache=IndicatorAPI.Cache)
+        for indicator in self._indicators:
+            indicator.init_data(self.Market, graph=graph)
+
+    def init_market_slice(self, source: MarketAPI, begin: int, length: int) -> None:
+        self.Market.init_slice(source, begin, length)
+        graph = GraphAPI(source, cache=IndicatorAPI.Cache)
         for indicator in self._indicators:
-            indicator.init_data(self.Market)
+            indicator.init_data(self.Market, self.Window, graph)
 
     def update_market_data(self, data: BarAPI) -> None:
         data_df = DatabaseAPI.format_market_data(data)
@@ -50,6 +68,7 @@ class AnalystAPI:
             indicator.update_data(self.Market, self.Window)
 
     def update_market_offset(self, offset: int) -> None:
+        self._offset = offset
         self.Market.update_offset(offset)
         for indicator in self._indicators:
             indicator.update_offset(offset)
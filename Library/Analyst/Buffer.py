@@ -0,0 +1,99 @@
+import numpy as np
+
+from typing import Any, Sequence
+
+from Library.Database.Dataframe import pl
+
+class BufferAPI:
+
+    MINIMUM = 16
+
+    def __init__(self, capacity: int | None = None):
+        self.Capacity: int | None = capacity
+        self.Version: int = 0
+        self._schema: dict[str, pl.DataType] = {}
+        self._columns: dict[str, np.ndarray] = {}
+        self._start: int = 0
+        self._stop: int = 0
+        self._shared: bool = False
+        self._view: pl.DataFrame | None = None
+
+    def __len__(self) -> int:
+        return self._stop - self._start
+
+    def names(self) -> list[str]:
+        return list(self._columns)
+
+    def size(self) -> int:
+        return next(iter(self._columns.values())).shape[0] if self._columns else 0
+
+    def column(self, name: str) -> np.ndarray:
+        return self._columns[name][self._start:self._stop]
+
+    def value(self, name: str, index: int) -> Any:
+        if not -len(self) <= index < 0:
+            raise IndexError(f"index {index} is out of bounds for buffer of length {len(self)}")
+        return self._columns[name][self._stop + index].item()
+
+    def series(self, name: str) -> pl.Series:
+        series = pl.Series(name, self.column(name))
+        return series if series.dtype == self._schema[name] else series.cast(self._schema[name])
+
+    def data(self) -> pl.DataFrame:
+        if self._view is None:
+            self._view = pl.DataFrame([self.series(name) for name in self._columns])
+        return self._view
+
+    def init_data(self, data: pl.DataFrame) -> None:
+        length = data.height if self.Capacity is None else min(data.height, self.Capacity)
+        self._schema = dict(data.schema)
+        self._columns = {series.name: series.tail(length).to_numpy() for series in data.iter_columns()}
+        self._start, self._stop = 0, length
+        self._shared = True
+        self._view = None
+        self.Version += 1
+
+    def init_slice(self, source: "BufferAPI", begin: int, length: int) -> None:
+        begin = source._start + begin
+        self._schema = dict(source._schema)
+        self._columns = {name: column[begin:begin + length] for name, column in source._columns.items()}
+        self._start, self._stop = 0, len(next(iter(self._columns.values()))) if self._columns else 0
+        self._shared = True
+        self._view = None
+        self.Version += 1
+
+    def reserve(self, length: int) -> None:
+        if self.Capacity is not None:
+            self._start = min(max(self._start, self._stop + length - self.Capacity), self._stop)
+        if not self._shared and self._stop + length <= self.size():
+            return
+        live = len(self)
+        size = max(2 * self.Capacity, live + length) if self.Capacity is not None else max(2 * (live + length), self.MINIMUM)
+        for name, column in self._columns.items():
+            array = np.empty(size, dtype=column.dtype)
+            array[:live] = column[self._start:self._stop]
+            self._columns[name] = array
+        self._start, self._stop = 0, live
+        self._shared = False
+
+    def update_data(self, data: pl.DataFrame) -> None:
+        if not self._columns:
+            self.init_data(data)
+            return
+        self.reserve(data.height)
+        for name, column in self._columns.items():
+            column[self._stop:self._stop + data.height] = data[name].to_numpy()
+        self._stop += data.height
+        self._view = None
+        self.Version += 1
+
+    def append(self, values: Sequence) -> None:
+        self.reserve(1)
+        for column, value in zip(self._columns.values(), values):
+            column[self._stop] = np.nan if value is None else value
+        self._stop += 1
+        self._view = None
+        self.Version += 1
+
+    def __repr__(self) -> str:
+        return repr(self.data())
@@ -0,0 +1,91 @@
+import hashlib
+import threading
+
+from pathlib import Path
+from collections import OrderedDict
+
+from Library.Database.Dataframe import pl
+
+class IndicatorCacheAPI:
+
+    def __init__(self, capacity: int = 512 * 1024 * 1024, path: str | Path | None = None):
+        self.Capacity: int = capacity
+        self.Hits: int = 0
+        self.Misses: int = 0
+        self.Size: int = 0
+
+        self.Path: Path | None = Path(path) if path else None
+        self._entries: OrderedDict[tuple, pl.DataFrame] = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def fingerprint(df: pl.DataFrame) -> str:
+        digest = hashlib.blake2b(digest_size=16)
+        digest.update(repr([(name, str(dtype)) for name, dtype in df.schema.items()]).encode())
+        for series in df.iter_columns():
+            physical = series.to_physical()
+            digest.update(series.is_null().to_numpy().tobytes())
+            if physical.dtype.is_numeric() or physical.dtype == pl.Boolean:
+                digest.update(physical.fill_null(0).to_numpy().tobytes())
+            else:
+                digest.update("\x1f".join(map(repr, physical.to_list())).encode())
+        return digest.hexdigest()
+
+    @staticmethod
+    def key(fingerprint: str, indicator: str, parameters: list | tuple | None) -> tuple:
+        return fingerprint, indicator, tuple(parameters or ())
+
+    def _file(self, key: tuple) -> Path:
+        fingerprint, indicator, parameters = key
+        return self.Path / fingerprint / f"{'_'.join([indicator, *map(str, parameters)])}.arrow"
+
+    def _insert(self, key: tuple, df: pl.DataFrame) -> None:
+        if key in self._entries:
+            return
+        size = df.estimated_size()
+        if size > self.Capacity:
+            return
+        self._entries[key] = df
+        self.Size += size
+        while self.Size > self.Capacity:
+            _, evicted = self._entries.popitem(last=False)
+            self.Size -= evicted.estimated_size()
+
+    def get(self, key: tuple) -> pl.DataFrame | None:
+        with self._lock:
+            if (df := self._entries.get(key)) is not None:
+                self._entries.move_to_end(key)
+                self.Hits += 1
+                return df
+        if self.Path is not None and (file := self._file(key)).exists():
+            df = pl.read_ipc(file)
+            with self._lock:
+                self._insert(key, df)
+                self.Hits += 1
+            return df
+        with self._lock:
+            self.Misses += 1
+        return None
+
+    def put(self, key: tuple, df: pl.DataFrame) -> None:
+        with self._lock:
+            self._insert(key, df)
+        if self.Path is not None and not (file := self._file(key)).exists():
+            file.parent.mkdir(parents=True, exist_ok=True)
+            temporary = file.with_suffix(f".{threading.get_ident()}.tmp")
+            df.write_ipc(temporary)
+            temporary.replace(file)
+
+    def statistics(self) -> dict:
+        with self._lock:
+            return {"Hits": self.Hits, "Misses": self.Misses, "Entries": len(self._entries), "Size": self.Size}
+
+    def reset(self) -> None:
+        with self._lock:
+            self.Hits = 0
+            self.Misses = 0
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.Size = 0
@@ -0,0 +1,38 @@
+from Library.Database.Dataframe import pl
+
+class ExpressionAPI:
+
+    def __init__(self, sid: str):
+        self._sid: str = sid
+
+    def last(self, shift: int = 0) -> pl.Expr:
+        return pl.col(self._sid).cast(pl.Float64).fill_nan(None).shift(shift)
+
+    @staticmethod
+    def value(other, shift: int = 0) -> pl.Expr | None:
+        if isinstance(other, ExpressionAPI):
+            return other.last(shift)
+        return pl.lit(other, dtype=pl.Float64) if other is not None else None
+
+    def over(self, other, shift: int = 0) -> pl.Expr:
+        other_last = self.value(other, shift)
+        return (self.last(shift) > other_last).fill_null(False) if other_last is not None else pl.repeat(False, pl.len())
+
+    def under(self, other, shift: int = 0) -> pl.Expr:
+        other_last = self.value(other, shift)
+        return (self.last(shift) < other_last).fill_null(False) if other_last is not None else pl.repeat(False, pl.len())
+
+    def crossover(self, other, shift: int = 0) -> pl.Expr:
+        return self.over(other, shift) & self.under(other, shift + 1)
+
+    def crossunder(self, other, shift: int = 0) -> pl.Expr:
+        return self.under(other, shift) & self.over(other, shift + 1)
+
+    def __repr__(self) -> str:
+        return repr(self.last())
+
+class ExpressionsAPI:
+
+    def __init__(self, columns: dict[str, str]):
+        for name, sid in columns.items():
+            setattr(self, name, ExpressionAPI(sid))
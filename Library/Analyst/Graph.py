@@ -0,0 +1,64 @@
+import hashlib
+import talib
+
+import numpy as np
+
+from typing import Callable
+
+from Library.Database.Dataframe import pl
+from Library.Analyst import IndicatorCacheAPI, MarketAPI
+
+class NodeAPI:
+
+    def __init__(self, function: str, *inputs: "NodeAPI | str", **parameters):
+        self.Function: str = function
+        self.Inputs: tuple[NodeAPI | str, ...] = inputs
+        self.Parameters: dict = {name: value.item() if hasattr(value, "item") else value for name, value in parameters.items()}
+        self.Key: tuple = (function, tuple(node.Key if isinstance(node, NodeAPI) else node for node in inputs), tuple(sorted(self.Parameters.items())))
+
+    def columns(self) -> list[str]:
+        return list(dict.fromkeys(name for source in self.Inputs for name in (source.columns() if isinstance(source, NodeAPI) else (source,))))
+
+    def digest(self) -> str:
+        return hashlib.blake2b(repr(self.Key).encode(), digest_size=16).hexdigest()
+
+    def __repr__(self) -> str:
+        return repr(self.Key)
+
+class GraphAPI:
+
+    NODE = "Node"
+    FUNCTIONS: dict[str, Callable] = {
+        "HULL": lambda half, full: 2 * half - full
+    }
+
+    def __init__(self, market: MarketAPI, window: int | None = None, cache: IndicatorCacheAPI | None = None):
+        self.Market: MarketAPI = market
+        self.Window: int | None = window
+        self.Cache: IndicatorCacheAPI | None = cache if window is None else None
+        self.Computed: int = 0
+        self._values: dict[tuple, tuple[np.ndarray, ...]] = {}
+
+    def column(self, name: str) -> np.ndarray:
+        values = getattr(self.Market, name).values().astype(np.float64, copy=False)
+        return values[-self.Window:] if self.Window else values
+
+    def resolve(self, node: NodeAPI) -> tuple[np.ndarray, ...]:
+        if (values := self._values.get(node.Key)) is not None:
+            return values
+        key = IndicatorCacheAPI.key(self.Market.fingerprint(), self.NODE, (node.digest(),)) if self.Cache is not None else None
+        if key is not None and (df := self.Cache.get(key)) is not None:
+            values = tuple(series.to_numpy() for series in df.iter_columns())
+        else:
+            arguments = [array for source in node.Inputs for array in (self.resolve(source) if isinstance(source, NodeAPI) else (self.column(source),))]
+            function = self.FUNCTIONS[node.Function] if node.Function in self.FUNCTIONS else getattr(talib, node.Function)
+            output = function(*arguments, **node.Parameters)
+            values = tuple(output) if isinstance(output, tuple) else (output,)
+            self.Computed += 1
+            if key is not None:
+                self.Cache.put(key, pl.DataFrame(list(values)))
+        self._values[node.Key] = values
+        return values
+
+    def evaluate(self, *nodes: NodeAPI) -> list[np.ndarray]:
+        return [array for node in nodes for array in self.resolve(node)]
@@ -1,70 +1,155 @@
+import numpy as np
+
 from Library.Database.Dataframe import pl
-from Library.Utility import IndicatorConfigurationAPI
-from Library.Analyst import SeriesAPI, MarketAPI, IndicatorsAPI
+from Library.Indicator import IndicatorConfigurationAPI
+from Library.Analyst import IndicatorCacheAPI, BufferAPI, SeriesAPI, MarketAPI, KernelAPI, ExpressionsAPI, NodeAPI, GraphAPI, IndicatorsAPI
 
 class IndicatorAPI:
 
-    def __init__(self, indicator: str, parameters: list | None = None):
+    Cache: IndicatorCacheAPI | None = IndicatorCacheAPI()
+    Sliceable: dict[tuple, bool] = {}
+    Tolerance: float = 1e-9
+
+    def __init__(self, indicator: str, parameters: list | None = None, capacity: int | None = None, vectorized: bool = False):
+        self.Vectorized: bool = vectorized
         self._offset: int = 1
+        self._name: str = indicator
+        self._values: tuple = tuple(parameters or ())
 
         self._indicator: IndicatorConfigurationAPI = getattr(IndicatorsAPI, indicator)
         self._parameters: dict = dict(zip(self._indicator.Parameters.keys(), parameters))
         self._sids = [f"{indicator}_{'_'.join(map(str, parameters)) + '_' if parameters else ''}{output}" for output in self._indicator.Output]
 
         self._series: list[SeriesAPI] | None = None
-        self._data: pl.DataFrame | None = None
+        self._buffer: BufferAPI = BufferAPI(capacity)
+        self._kernel: KernelAPI | None = None
+        self._rules: dict[tuple[str, int], np.ndarray | bool | None] = {}
 
     def data(self) -> pl.DataFrame:
-        return self._data if self._data is not None else pl.DataFrame()
+        return self._buffer.data()
+
+    def version(self) -> int:
+        return self._buffer.Version
+
+    def columns(self) -> list[str]:
+        return list(self._sids)
 
     def head(self, n: int | None = None) -> pl.DataFrame:
-        return self._data.head(n)
+        return self.data().head(n)
 
     def tail(self, n: int | None = None) -> pl.DataFrame:
-        return self._data.tail(n)
+        return self.data().tail(n)
 
     def last(self, shift: int = 0) -> pl.DataFrame:
         return self.data()[-(self._offset + shift)]
 
-    def calculate(self, market: MarketAPI, window: int | None = None) -> pl.DataFrame:
-        input_series = [tseries.tail(window) if window else tseries.data() for tseries in self._indicator.Input(market)]
-        df = pl.DataFrame(self._indicator.Function(input_series, **self._parameters))
+    def nodes(self) -> tuple[NodeAPI, ...] | None:
+        return self._indicator.Graph(**self._parameters) if self._indicator.Graph is not None else None
+
+    def inputs(self, market: MarketAPI) -> list[SeriesAPI]:
+        if (nodes := self.nodes()) is None:
+            return self._indicator.Input(market)
+        return [getattr(market, name) for name in dict.fromkeys(name for node in nodes for name in node.columns())]
+
+    def calculate(self, market: MarketAPI, window: int | None = None, graph: GraphAPI | None = None) -> pl.DataFrame:
+        if (nodes := self.nodes()) is not None:
+            graph = graph if graph is not None and graph.Market is market and graph.Window == window else GraphAPI(market, window)
+            df = pl.DataFrame(graph.evaluate(*nodes))
+        else:
+            input_series = [tseries.tail(window) if window else tseries.data() for tseries in self._indicator.Input(market)]
+            df = pl.DataFrame(self._indicator.Function(input_series, **self._parameters))
         df.columns = self._sids
         return df
 
-    def init_data(self, market: MarketAPI) -> None:
+    def compute(self, market: MarketAPI, graph: GraphAPI | None = None) -> pl.DataFrame:
+        graph = graph if graph is not None and graph.Market is market else GraphAPI(market, cache=self.Cache)
+        if self.Cache is None:
+            return self.calculate(market, graph=graph)
+        if (output_df := self.Cache.get(key := IndicatorCacheAPI.key(market.fingerprint(), self._name, self._values))) is None:
+            output_df = self.calculate(market, graph=graph).rechunk()
+            self.Cache.put(key, output_df)
+        return output_df
+
+    def sliceable(self, source: MarketAPI, window: int) -> bool:
+        key = (*IndicatorCacheAPI.key(source.fingerprint(), self._name, self._values), window)
+        if (safe := self.Sliceable.get(key)) is None:
+            safe = False
+            if source.data().height >= 3 * window:
+                probe = MarketAPI()
+                probe.init_slice(source, window, 2 * window)
+                actual_df = self.calculate(probe).slice(window - 2)
+                expected_df = self.compute(source).slice(2 * window - 2, actual_df.height)
+                safe = all(np.allclose(actual.cast(pl.Float64).to_numpy(), expected.cast(pl.Float64).to_numpy(), rtol=self.Tolerance, atol=0.0, equal_nan=True) for actual, expected in zip(actual_df, expected_df))
+            self.Sliceable[key] = safe
+        return safe
+
+    def init_data(self, market: MarketAPI, window: int | None = None, graph: GraphAPI | None = None) -> None:
+        if market.Source is not None and self.Cache is not None and window is not None and (market.Begin == 0 or self.sliceable(market.Source, window)):
+            output_df = self.compute(market.Source, graph).slice(market.Begin, market.data().height)
+        else:
+            output_df = self.compute(market, graph)
+        self._kernel = None
+        self._rules = {}
         self._series = []
-        self._data = pl.DataFrame()
-        output_df = self.calculate(market)
-        for name, sid, series in zip(self._indicator.Output, self._sids, output_df):
-            series = series.fill_nan(None)
+        self._buffer.init_data(output_df.rechunk())
+        for name, sid in zip(self._indicator.Output, self._sids):
             tseries = SeriesAPI(sid)
             setattr(self, name, tseries)
             self._series.append(tseries)
-            self._data = self._data.with_columns(series)
-        self._data = self._data.rechunk()
-        for tseries in self._series:
-            tseries.init_data(self._data)
+            tseries.init_data(self._buffer)
 
     def update_data(self, market: MarketAPI, window: int) -> None:
-        self._data.extend(self.calculate(market, window)[-1])
+        self._rules = {}
+        if self._indicator.Kernel is None:
+            self._buffer.update_data(self.calculate(market, window)[-1])
+            return
+        input_values = [tseries.values() for tseries in self.inputs(market)]
+        if self._kernel is None:
+            self._kernel = self._indicator.Kernel(**self._parameters)
+            self._kernel.seed(*(values[:-1].astype(np.float64) for values in input_values))
+        self._buffer.append(self._kernel.update(*(values[-1] for values in input_values)))
 
     def update_offset(self, offset: int) -> None:
         self._offset = offset
         for tseries in self._series:
             tseries.update_offset(offset)
 
+    def vectorize(self, rule: str, market: MarketAPI | None, shift: int) -> np.ndarray | bool | None:
+        market_expressions = ExpressionsAPI({name: name for name in market.data().columns}) if market is not None else None
+        indicator_expressions = ExpressionsAPI(dict(zip(self._indicator.Output, self._sids)))
+        try:
+            expression = getattr(self._indicator, rule)(market_expressions, indicator_expressions, shift)
+        except (AttributeError, TypeError):
+            return None
+        if isinstance(expression, bool):
+            return expression
+        if not isinstance(expression, pl.Expr):
+            return None
+        frames = [market.data(), self.data()] if market is not None else [self.data()]
+        return pl.concat(frames, how="horizontal").select(expression.alias(rule)).to_series().to_numpy()
+
+    def evaluate(self, rule: str, market: MarketAPI | None, shift: int) -> bool:
+        if self.Vectorized:
+            if (key := (rule, shift)) not in self._rules:
+                self._rules[key] = self.vectorize(rule, market, shift)
+            values = self._rules[key]
+            if isinstance(values, bool):
+                return values
+            if values is not None and (index := values.shape[0] - self._offset) - shift - 1 >= 0:
+                return bool(values[index])
+        return getattr(self._indicator, rule)(market, self, shift)
+
     def filter_buy(self, market: MarketAPI | None = None, shift: int = 0) -> bool:
-        return self._indicator.FilterBuy(market, self, shift)
+        return self.evaluate("FilterBuy", market, shift)
 
     def filter_sell(self, market: MarketAPI | None = None, shift: int = 0) -> bool:
-        return self._indicator.FilterSell(market, self, shift)
+        return self.evaluate("FilterSell", market, shift)
 
     def signal_buy(self, market: MarketAPI | None = None, shift: int = 0) -> bool:
-        return self._indicator.SignalBuy(market, self, shift)
+        return self.evaluate("SignalBuy", market, shift)
 
     def signal_sell(self, market: MarketAPI | None = None, shift: int = 0) -> bool:
-        return self._indicator.SignalSell(market, self, shift)
+        return self.evaluate("SignalSell", market, shift)
 
     def __repr__(self) -> str:
         return repr(self.data())
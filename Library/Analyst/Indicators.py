@@ -1,7 +1,7 @@
 import math
-import talib
 
-from Library.Utility import IndicatorType, IndicatorConfigurationAPI
+from Library.Indicator import IndicatorType, IndicatorConfigurationAPI
+from Library.Analyst import NodeAPI, SMAKernelAPI, EMAKernelAPI, WMAKernelAPI, HMAKernelAPI, DEMAKernelAPI, TEMAKernelAPI, KAMAKernelAPI, ATRKernelAPI, CrossKernelAPI
 
 class IndicatorsAPI:
 
@@ -13,10 +13,10 @@ class IndicatorsAPI:
     SMA = IndicatorConfigurationAPI(
         Name="Simple Moving Average (Short-Term)",
         IndicatorType=IndicatorType.Baseline,
-        Input=lambda market: [market.ClosePrice],
         Parameters={"window": [[5, 50, 5], [-20, +20, 2], [-10, +10, 1]]},
         Constraints=lambda window: window >= 5,
-        Function=lambda series, window: talib.SMA(*series, timeperiod=window),
+        Kernel=lambda window: SMAKernelAPI(window),
+        Graph=lambda window: (NodeAPI("SMA", "ClosePrice", timeperiod=window),),
         Output=["Result"],
         FilterBuy=lambda market, indicator, shift: market.ClosePrice.over(indicator.Result, shift),
         FilterSell=lambda market, indicator, shift: market.ClosePrice.under(indicator.Result, shift),
@@ -26,10 +26,10 @@ class IndicatorsAPI:
     EMA = IndicatorConfigurationAPI(
         Name="Exponential Moving Average",
         IndicatorType=IndicatorType.Baseline,
-        Input=lambda market: [market.ClosePrice],
         Parameters={"window": [[5, 50, 5], [-20, +20, 2], [-10, +10, 1]]},
         Constraints=lambda window: window >= 5,
-        Function=lambda series, window: talib.EMA(*series, timeperiod=window),
+        Kernel=lambda window: EMAKernelAPI(window),
+        Graph=lambda window: (NodeAPI("EMA", "ClosePrice", timeperiod=window),),
         Output=["Result"],
         FilterBuy=lambda market, indicator, shift: market.ClosePrice.over(indicator.Result, shift),
         FilterSell=lambda market, indicator, shift: market.ClosePrice.under(indicator.Result, shift),
@@ -39,10 +39,10 @@ class IndicatorsAPI:
     WMA = IndicatorConfigurationAPI(
         Name="Weighted Moving Average",
         IndicatorType=IndicatorType.Baseline,
-        Input=lambda market: [market.ClosePrice],
         Parameters={"window": [[5, 50, 5], [-20, +20, 2], [-10, +10, 1]]},
         Constraints=lambda window: window >= 5,
-        Function=lambda series, window: talib.WMA(*series, timeperiod=window),
+        Kernel=lambda window: WMAKernelAPI(window),
+        Graph=lambda window: (NodeAPI("WMA", "ClosePrice", timeperiod=window),),
         Output=["Result"],
         FilterBuy=lambda market, indicator, shift: market.ClosePrice.over(indicator.Result, shift),
         FilterSell=lambda market, indicator, shift: market.ClosePrice.under(indicator.Result, shift),
@@ -50,17 +50,17 @@ class IndicatorsAPI:
         SignalSell=lambda market, indicator, shift: market.ClosePrice.crossunder(indicator.Result, shift))
 
     @staticmethod
-    def custom_HMA(series, window):
-        return talib.WMA(2 * talib.WMA(*series, timeperiod=math.floor(window / 2)) - talib.WMA(*series, timeperiod=window), timeperiod=math.floor(math.sqrt(window)))
+    def graph_HMA(window):
+        return NodeAPI("WMA", NodeAPI("HULL", NodeAPI("WMA", "ClosePrice", timeperiod=math.floor(window / 2)), NodeAPI("WMA", "ClosePrice", timeperiod=window)), timeperiod=math.floor(math.sqrt(window)))
 
 
     HMA = IndicatorConfigurationAPI(
         Name="Hull Moving Average",
         IndicatorType=IndicatorType.Baseline,
-        Input=lambda market: [market.ClosePrice],
         Parameters={"window": [[5, 50, 5], [-20, +20, 2], [-10, +10, 1]]},
         Constraints=lambda window: window >= 5,
-        Function=lambda series, window: IndicatorsAPI.custom_HMA(series, window),
+        Kernel=lambda window: HMAKernelAPI(window),
+        Graph=lambda window: (IndicatorsAPI.graph_HMA(window),),
         Output=["Result"],
         FilterBuy=lambda market, indicator, shift: market.ClosePrice.over(indicator.Result, shift),
         FilterSell=lambda market, indicator, shift: market.ClosePrice.under(indicator.Result, shift),
@@ -70,10 +70,10 @@ class IndicatorsAPI:
     DEMA = IndicatorConfigurationAPI(
         Name="Double Exponential Moving Average",
         IndicatorType=IndicatorType.Baseline,
-        Input=lambda market: [market.ClosePrice],
         Parameters={"window": [[5, 50, 5], [-20, +20, 2], [-10, +10, 1]]},
         Constraints=lambda window: window >= 5,
-        Function=lambda series, window: talib.DEMA(*series, timeperiod=window),
+        Kernel=lambda window: DEMAKernelAPI(window),
+        Graph=lambda window: (NodeAPI("DEMA", "ClosePrice", timeperiod=window),),
         Output=["Result"],
         FilterBuy=lambda market, indicator, shift: market.ClosePrice.over(indicator.Result, shift),
         FilterSell=lambda market, indicator, shift: market.ClosePrice.under(indicator.Result, shift),
@@ -83,10 +83,10 @@ class IndicatorsAPI:
     TEMA = IndicatorConfigurationAPI(
         Name="Triple Exponential Moving Average",
         IndicatorType=IndicatorType.Baseline,
-        Input=lambda market: [market.ClosePrice],
         Parameters={"window": [[5, 50, 5], [-20, +20, 2], [-10, +10, 1]]},
         Constraints=lambda window: window >= 5,
-        Function=lambda series, window: talib.TEMA(*series, timeperiod=window),
+        Kernel=lambda window: TEMAKernelAPI(window),
+        Graph=lambda window: (NodeAPI("TEMA", "ClosePrice", timeperiod=window),),
         Output=["Result"],
         FilterBuy=lambda market, indicator, shift: market.ClosePrice.over(indicator.Result, shift),
         FilterSell=lambda market, indicator, shift: market.ClosePrice.under(indicator.Result, shift),
@@ -96,10 +96,9 @@ class IndicatorsAPI:
     TRIMA = IndicatorConfigurationAPI(
         Name="Triangular Moving Average",
         IndicatorType=IndicatorType.Baseline,
-        Input=lambda market: [market.ClosePrice],
         Parameters={"window": [[5, 50, 5], [-20, +20, 2], [-10, +10, 1]]},
         Constraints=lambda window: window >= 5,
-        Function=lambda series, window: talib.TRIMA(*series, timeperiod=window),
+        Graph=lambda window: (NodeAPI("TRIMA", "ClosePrice", timeperiod=window),),
         Output=["Result"],
         FilterBuy=lambda market, indicator, shift: market.ClosePrice.over(indicator.Result, shift),
         FilterSell=lambda market, indicator, shift: market.ClosePrice.under(indicator.Result, shift),
@@ -109,10 +108,10 @@ class IndicatorsAPI:
     KAMA = IndicatorConfigurationAPI(
         Name="Kaufman Adaptive Moving Average",
         IndicatorType=IndicatorType.Baseline,
-        Input=lambda market: [market.ClosePrice],
         Parameters={"window": [[5, 50, 5], [-20, +20, 2], [-10, +10, 1]]},
         Constraints=lambda window: window >= 5,
-        Function=lambda series, window: talib.KAMA(*series, timeperiod=window),
+        Kernel=lambda window: KAMAKernelAPI(window),
+        Graph=lambda window: (NodeAPI("KAMA", "ClosePrice", timeperiod=window),),
         Output=["Result"],
         FilterBuy=lambda market, indicator, shift: market.ClosePrice.over(indicator.Result, shift),
         FilterSell=lambda market, indicator, shift: market.ClosePrice.under(indicator.Result, shift),
@@ -123,10 +122,10 @@ class IndicatorsAPI:
     SMAC = IndicatorConfigurationAPI(
         Name="Simple Moving Average Cross",
         IndicatorType=IndicatorType.Overlap,
-        Input=lambda market: [market.ClosePrice],
         Parameters={"fast_window": [[5, 50, 5], [-20, +20, 2], [-10, +10, 1]], "slow_window": [[5, 50, 5], [-20, +20, 2], [-10, +10, 1]]},
-        Constraints=lambda fast_window, slow_window: 5 <= fast_window < slow_window,
-        Function=lambda series, fast_window, slow_window: (talib.SMA(*series, timeperiod=fast_window), talib.SMA(*series, timeperiod=slow_window)),
+        Constraints=lambda fast_window, slow_window: (fast_window >= 5) & (fast_window < slow_window),
+        Kernel=lambda fast_window, slow_window: CrossKernelAPI(SMAKernelAPI(fast_window), SMAKernelAPI(slow_window)),
+        Graph=lambda fast_window, slow_window: (NodeAPI("SMA", "ClosePrice", timeperiod=fast_window), NodeAPI("SMA", "ClosePrice", timeperiod=slow_window)),
         Output=["Fast", "Slow"],
         FilterBuy=lambda _, indicator, shift: indicator.Fast.over(indicator.Slow),
         FilterSell=lambda _, indicator, shift: indicator.Fast.under(indicator.Slow),
@@ -137,10 +136,10 @@ class IndicatorsAPI:
     EMAC = IndicatorConfigurationAPI(
         Name="Exponential Moving Average Cross",
         IndicatorType=IndicatorType.Overlap,
-        Input=lambda market: [market.ClosePrice],
         Parameters={"fast_window": [[5, 50, 5], [-20, +20, 2], [-10, +10, 1]], "slow_window": [[5, 50, 5], [-20, +20, 2], [-10, +10, 1]]},
-        Constraints=lambda fast_window, slow_window: 5 <= fast_window < slow_window,
-        Function=lambda series, fast_window, slow_window: (talib.EMA(*series, timeperiod=fast_window), talib.EMA(*series, timeperiod=slow_window)),
+        Constraints=lambda fast_window, slow_window: (fast_window >= 5) & (fast_window < slow_window),
+        Kernel=lambda fast_window, slow_window: CrossKernelAPI(EMAKernelAPI(fast_window), EMAKernelAPI(slow_window)),
+        Graph=lambda fast_window, slow_window: (NodeAPI("EMA", "ClosePrice", timeperiod=fast_window), NodeAPI("EMA", "ClosePrice", timeperiod=slow_window)),
         Output=["Fast", "Slow"],
         FilterBuy=lambda _, indicator, shift: indicator.Fast.over(indicator.Slow),
         FilterSell=lambda _, indicator, shift: indicator.Fast.under(indicator.Slow),
@@ -150,10 +149,10 @@ class IndicatorsAPI:
     WMAC = IndicatorConfigurationAPI(
         Name="Weighted Moving Average Cross",
         IndicatorType=IndicatorType.Overlap,
-        Input=lambda market: [market.ClosePrice],
         Parameters={"fast_window": [[5, 50, 5], [-20, +20, 2], [-10, +10, 1]], "slow_window": [[5, 50, 5], [-20, +20, 2], [-10, +10, 1]]},
-        Constraints=lambda fast_window, slow_window: 5 <= fast_window < slow_window,
-        Function=lambda series, fast_window, slow_window: (talib.WMA(*series, timeperiod=fast_window), talib.WMA(*series, timeperiod=slow_window)),
+        Constraints=lambda fast_window, slow_window: (fast_window >= 5) & (fast_window < slow_window),
+        Kernel=lambda fast_window, slow_window: CrossKernelAPI(WMAKernelAPI(fast_window), WMAKernelAPI(slow_window)),
+        Graph=lambda fast_window, slow_window: (NodeAPI("WMA", "ClosePrice", timeperiod=fast_window), NodeAPI("WMA", "ClosePrice", timeperiod=slow_window)),
         Output=["Fast", "Slow"],
         FilterBuy=lambda _, indicator, shift: indicator.Fast.over(indicator.Slow),
         FilterSell=lambda _, indicator, shift: indicator.Fast.under(indicator.Slow),
@@ -163,10 +162,10 @@ class IndicatorsAPI:
     HMAC = IndicatorConfigurationAPI(
         Name="Hull Moving Average Cross",
         IndicatorType=IndicatorType.Overlap,
-        Input=lambda market: [market.ClosePrice],
         Parameters={"fast_window": [[5, 50, 5], [-20, +20, 2], [-10, +10, 1]], "slow_window": [[5, 50, 5], [-20, +20, 2], [-10, +10, 1]]},
-        Constraints=lambda fast_window, slow_window: 5 <= fast_window < slow_window,
-        Function=lambda series, fast_window, slow_window: (IndicatorsAPI.custom_HMA(series, fast_window), IndicatorsAPI.custom_HMA(series, slow_window)),
+        Constraints=lambda fast_window, slow_window: (fast_window >= 5) & (fast_window < slow_window),
+        Kernel=lambda fast_window, slow_window: CrossKernelAPI(HMAKernelAPI(fast_window), HMAKernelAPI(slow_window)),
+        Graph=lambda fast_window, slow_window: (IndicatorsAPI.graph_HMA(fast_window), IndicatorsAPI.graph_HMA(slow_window)),
         Output=["Fast", "Slow"],
         FilterBuy=lambda _, indicator, shift: indicator.Fast.over(indicator.Slow),
         FilterSell=lambda _, indicator, shift: indicator.Fast.under(indicator.Slow),
@@ -176,10 +175,10 @@ class IndicatorsAPI:
     DEMAC = IndicatorConfigurationAPI(
         Name="Double Exponential Moving Average Cross",
         IndicatorType=IndicatorType.Overlap,
-        Input=lambda market: [market.ClosePrice],
         Parameters={"fast_window": [[5, 50, 5], [-20, +20, 2], [-10, +10, 1]], "slow_window": [[5, 50, 5], [-20, +20, 2], [-10, +10, 1]]},
-        Constraints=lambda fast_window, slow_window: 5 <= fast_window < slow_window,
-        Function=lambda series, fast_window, slow_window: (talib.DEMA(*series, timeperiod=fast_window), talib.DEMA(*series, timeperiod=slow_window)),
+        Constraints=lambda fast_window, slow_window: (fast_window >= 5) & (fast_window < slow_window),
+        Kernel=lambda fast_window, slow_window: CrossKernelAPI(DEMAKernelAPI(fast_window), DEMAKernelAPI(slow_window)),
+        Graph=lambda fast_window, slow_window: (NodeAPI("DEMA", "ClosePrice", timeperiod=fast_window), NodeAPI("DEMA", "ClosePrice", timeperiod=slow_window)),
         Output=["Fast", "Slow"],
         FilterBuy=lambda _, indicator, shift: indicator.Fast.over(indicator.Slow),
         FilterSell=lambda _, indicator, shift: indicator.Fast.under(indicator.Slow),
@@ -189,10 +188,10 @@ class IndicatorsAPI:
     TEMAC = IndicatorConfigurationAPI(
         Name="Triple Exponential Moving Average Cross",
         IndicatorType=IndicatorType.Overlap,
-        Input=lambda market: [market.ClosePrice],
         Parameters={"fast_window": [[5, 50, 5], [-20, +20, 2], [-10, +10, 1]], "slow_window": [[5, 50, 5], [-20, +20, 2], [-10, +10, 1]]},
-        Constraints=lambda fast_window, slow_window: 5 <= fast_window < slow_window,
-        Function=lambda series, fast_window, slow_window: (talib.TEMA(*series, timeperiod=fast_window), talib.TEMA(*series, timeperiod=slow_window)),
+        Constraints=lambda fast_window, slow_window: (fast_window >= 5) & (fast_window < slow_window),
+        Kernel=lambda fast_window, slow_window: CrossKernelAPI(TEMAKernelAPI(fast_window), TEMAKernelAPI(slow_window)),
+        Graph=lambda fast_window, slow_window: (NodeAPI("TEMA", "ClosePrice", timeperiod=fast_window), NodeAPI("TEMA", "ClosePrice", timeperiod=slow_window)),
         Output=["Fast", "Slow"],
         FilterBuy=lambda _, indicator, shift: indicator.Fast.over(indicator.Slow),
         FilterSell=lambda _, indicator, shift: indicator.Fast.under(indicator.Slow),
@@ -202,10 +201,9 @@ class IndicatorsAPI:
     TRIMAC = IndicatorConfigurationAPI(
         Name="Triangular Moving Average Cross",
         IndicatorType=IndicatorType.Overlap,
-        Input=lambda market: [market.ClosePrice],
         Parameters={"fast_window": [[5, 50, 5], [-20, +20, 2], [-10, +10, 1]], "slow_window": [[5, 50, 5], [-20, +20, 2], [-10, +10, 1]]},
-        Constraints=lambda fast_window, slow_window: 5 <= fast_window < slow_window,
-        Function=lambda series, fast_window, slow_window: (talib.TRIMA(*series, timeperiod=fast_window), talib.TRIMA(*series, timeperiod=slow_window)),
+        Constraints=lambda fast_window, slow_window: (fast_window >= 5) & (fast_window < slow_window),
+        Graph=lambda fast_window, slow_window: (NodeAPI("TRIMA", "ClosePrice", timeperiod=fast_window), NodeAPI("TRIMA", "ClosePrice", timeperiod=slow_window)),
         Output=["Fast", "Slow"],
         FilterBuy=lambda _, indicator, shift: indicator.Fast.over(indicator.Slow),
         FilterSell=lambda _, indicator, shift: indicator.Fast.under(indicator.Slow),
@@ -215,10 +213,10 @@ class IndicatorsAPI:
     KAMAC = IndicatorConfigurationAPI(
         Name="Kaufman Adaptive Moving Average Cross",
         IndicatorType=IndicatorType.Overlap,
-        Input=lambda market: [market.ClosePrice],
         Parameters={"fast_window": [[5, 50, 5], [-20, +20, 2], [-10, +10, 1]], "slow_window": [[5, 50, 5], [-20, +20, 2], [-10, +10, 1]]},
-        Constraints=lambda fast_window, slow_window: 5 <= fast_window < slow_window,
-        Function=lambda series, fast_window, slow_window: (talib.KAMA(*series, timeperiod=fast_window), talib.KAMA(*series, timeperiod=slow_window)),
+        Constraints=lambda fast_window, slow_window: (fast_window >= 5) & (fast_window < slow_window),
+        Kernel=lambda fast_window, slow_window: CrossKernelAPI(KAMAKernelAPI(fast_window), KAMAKernelAPI(slow_window)),
+        Graph=lambda fast_window, slow_window: (NodeAPI("KAMA", "ClosePrice", timeperiod=fast_window), NodeAPI("KAMA", "ClosePrice", timeperiod=slow_window)),
         Output=["Fast", "Slow"],
         FilterBuy=lambda _, indicator, shift: indicator.Fast.over(indicator.Slow),
         FilterSell=lambda _, indicator, shift: indicator.Fast.under(indicator.Slow),
@@ -230,10 +228,9 @@ class IndicatorsAPI:
     AROON = IndicatorConfigurationAPI(
         Name="Aroon Up and Down Indicator",
         IndicatorType=IndicatorType.Momentum,
-        Input=lambda market: [market.HighPrice, market.LowPrice],
         Parameters={"window": [[5, 50, 5], [-20, +20, 2], [-10, +10, 1]]},
         Constraints=lambda window: window >= 5,
-        Function=lambda series, window: talib.AROON(*series, timeperiod=window),
+        Graph=lambda window: (NodeAPI("AROON", "HighPrice", "LowPrice", timeperiod=window),),
         Output=["Down", "Up"],
         FilterBuy=lambda _, indicator, shift: indicator.Up.over(indicator.Down),
         FilterSell=lambda _, indicator, shift: indicator.Down.over(indicator.Up),
@@ -243,10 +240,9 @@ class IndicatorsAPI:
     CCI = IndicatorConfigurationAPI(
         Name="Commodity Channel Index",
         IndicatorType=IndicatorType.Momentum,
-        Input=lambda market: [market.HighPrice, market.LowPrice, market.ClosePrice],
         Parameters={"window": [[5, 50, 5], [-20, +20, 2], [-10, +10, 1]]},
         Constraints=lambda window: window >= 5,
-        Function=lambda series, window: talib.CCI(*series, timeperiod=window),
+        Graph=lambda window: (NodeAPI("CCI", "HighPrice", "LowPrice", "ClosePrice", timeperiod=window),),
         Output=["Result"],
         FilterBuy=lambda _, indicator, shift: indicator.Result.over(0, shift),
         FilterSell=lambda _, indicator, shift: indicator.Result.under(0, shift),
@@ -256,10 +252,9 @@ class IndicatorsAPI:
     MACD = IndicatorConfigurationAPI(
         Name="Moving Average Convergence Divergence",
         IndicatorType=IndicatorType.Momentum,
-        Input=lambda market: [market.ClosePrice],
         Parameters={"fast_window": [[5, 50, 5], [-20, +20, 2], [-10, +10, 1]], "slow_window": [[5, 50, 5], [-20, +20, 2], [-10, +10, 1]], "signal_window": [[5, 50, 5], [-20, +20, 2], [-10, +10, 1]]},
-        Constraints=lambda fast_window, slow_window, signal_window: 5 <= signal_window < fast_window < slow_window,
-        Function=lambda series, fast_window, slow_window, signal_window: talib.MACD(*series, fastperiod=fast_window, slowperiod=slow_window, signalperiod=signal_window),
+        Constraints=lambda fast_window, slow_window, signal_window: (signal_window >= 5) & (signal_window < fast_window) & (fast_window < slow_window),
+        Graph=lambda fast_window, slow_window, signal_window: (NodeAPI("MACD", "ClosePrice", fastperiod=fast_window, slowperiod=slow_window, signalperiod=signal_window),),
         Output=["MACD", "Signal", "Histogram"],
         FilterBuy=lambda _, indicator, shift: indicator.MACD.over(indicator.Signal, shift),
         FilterSell=lambda _, indicator, shift: indicator.MACD.under(indicator.Signal, shift),
@@ -269,10 +264,9 @@ class IndicatorsAPI:
     PSAR = IndicatorConfigurationAPI(
         Name="Parabolic SAR",
         IndicatorType=IndicatorType.Momentum,
-        Input=lambda market: [market.HighPrice, market.LowPrice],
         Parameters={"acceleration": [[0.01, 0.2, 0.01], [-0.05, +0.05, 0.01], [-0.02, +0.02, 0.01]], "maximum": [[0.1, 0.5, 0.05], [-0.1, +0.1, 0.01], [-0.05, +0.05, 0.01]]},
-        Constraints=lambda acceleration, maximum: 0.0 < acceleration < maximum,
-        Function=lambda series, acceleration, maximum: talib.SAR(*series, acceleration=acceleration, maximum=maximum),
+        Constraints=lambda acceleration, maximum: (acceleration > 0.0) & (acceleration < maximum),
+        Graph=lambda acceleration, maximum: (NodeAPI("SAR", "HighPrice", "LowPrice", acceleration=acceleration, maximum=maximum),),
         Output=["PSAR"],
         FilterBuy=lambda market, indicator, shift: market.ClosePrice.over(indicator.PSAR, shift),
         FilterSell=lambda market, indicator, shift: market.ClosePrice.under(indicator.PSAR, shift),
@@ -309,10 +303,9 @@ class IndicatorsAPI:
     ADOSC = IndicatorConfigurationAPI(
         Name="Chaikin A/D Oscillator",
         IndicatorType=IndicatorType.Volume,
-        Input=lambda market: [market.HighPrice, market.LowPrice, market.ClosePrice, market.TickVolume],
         Parameters={"fast_window": [[5, 50, 5], [-20, +20, 2], [-10, +10, 1]], "slow_window": [[5, 50, 5], [-20, +20, 2], [-10, +10, 1]]},
-        Constraints=lambda fast_window, slow_window: 5 <= fast_window < slow_window,
-        Function=lambda series, fast_window, slow_window: (talib.ADOSC(*series, fastperiod=fast_window, slowperiod=slow_window),),
+        Constraints=lambda fast_window, slow_window: (fast_window >= 5) & (fast_window < slow_window),
+        Graph=lambda fast_window, slow_window: (NodeAPI("ADOSC", "HighPrice", "LowPrice", "ClosePrice", "TickVolume", fastperiod=fast_window, slowperiod=slow_window),),
         Output=["ADOSC"],
         FilterBuy=lambda _, indicator, shift: indicator.ADOSC.over(0.0, shift),
         FilterSell=lambda _, indicator, shift: indicator.ADOSC.over(0.0, shift),
@@ -336,10 +329,10 @@ class IndicatorsAPI:
     ATR = IndicatorConfigurationAPI(
         Name="Average True Range",
         IndicatorType=IndicatorType.Volatility,
-        Input=lambda market: [market.HighPrice, market.LowPrice, market.ClosePrice],
         Parameters={"window": [[5, 50, 5], [-20, +20, 2], [-10, +10, 1]]},
         Constraints=lambda window: window >= 5,
-        Function=lambda series, window: talib.ATR(*series, timeperiod=window),
+        Kernel=lambda window: ATRKernelAPI(window),
+        Graph=lambda window: (NodeAPI("ATR", "HighPrice", "LowPrice", "ClosePrice", timeperiod=window),),
         Output=["Result"],
         FilterBuy=lambda market, indicator, shift: False,
         FilterSell=lambda market, indicator, shift: False,
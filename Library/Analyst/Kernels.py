@@ -0,0 +1,254 @@
+import math
+
+import numpy as np
+
+from abc import ABC, abstractmethod
+from collections import deque
+
+class KernelAPI(ABC):
+
+    def __init__(self, outputs: int = 1):
+        self.Outputs: int = outputs
+        self._started: bool = False
+
+    @abstractmethod
+    def step(self, *values: float) -> tuple[float, ...]:
+        raise NotImplementedError
+
+    def update(self, *values: float | None) -> tuple[float, ...]:
+        values = tuple(math.nan if value is None else float(value) for value in values)
+        if not self._started and any(math.isnan(value) for value in values):
+            return (math.nan,) * self.Outputs
+        self._started = True
+        return self.step(*values)
+
+    def seed(self, *inputs: np.ndarray) -> np.ndarray:
+        return np.array([self.update(*values) for values in zip(*inputs)], dtype=np.float64).reshape(-1, self.Outputs)
+
+class SMAKernelAPI(KernelAPI):
+
+    def __init__(self, window: int):
+        super().__init__()
+        self._window: int = window
+        self._values: deque[float] = deque(maxlen=window)
+        self._total: float = 0.0
+
+    def step(self, value: float) -> tuple[float]:
+        self._values.append(value)
+        self._total += value
+        if len(self._values) < self._window:
+            return math.nan,
+        result = self._total / self._window
+        self._total -= self._values[0]
+        return result,
+
+class EMAKernelAPI(KernelAPI):
+
+    def __init__(self, window: int):
+        super().__init__()
+        self._window: int = window
+        self._k: float = 2.0 / (window + 1)
+        self._count: int = 0
+        self._total: float = 0.0
+        self._average: float = math.nan
+
+    def step(self, value: float) -> tuple[float]:
+        self._count += 1
+        if self._count < self._window:
+            self._total += value
+            return math.nan,
+        if self._count == self._window:
+            self._total += value
+            self._average = self._total / self._window
+        else:
+            self._average = ((value - self._average) * self._k) + self._average
+        return self._average,
+
+class WMAKernelAPI(KernelAPI):
+
+    def __init__(self, window: int):
+        super().__init__()
+        self._window: int = window
+        self._divider: int = (window * (window + 1)) >> 1
+        self._values: deque[float] = deque()
+        self._sum: float = 0.0
+        self._sub: float = 0.0
+        self._trailing: float = 0.0
+
+    def step(self, value: float) -> tuple[float]:
+        self._values.append(value)
+        if len(self._values) < self._window:
+            self._sub += value
+            self._sum += value * len(self._values)
+            return math.nan,
+        self._sub += value
+        self._sub -= self._trailing
+        self._sum += value * self._window
+        self._trailing = self._values.popleft()
+        result = self._sum / self._divider
+        self._sum -= self._sub
+        return result,
+
+class DEMAKernelAPI(KernelAPI):
+
+    def __init__(self, window: int):
+        super().__init__()
+        self._first: EMAKernelAPI = EMAKernelAPI(window)
+        self._second: EMAKernelAPI = EMAKernelAPI(window)
+
+    def step(self, value: float) -> tuple[float]:
+        first, = self._first.update(value)
+        second, = self._second.update(first)
+        return (2.0 * first) - second,
+
+class TEMAKernelAPI(KernelAPI):
+
+    def __init__(self, window: int):
+        super().__init__()
+        self._first: EMAKernelAPI = EMAKernelAPI(window)
+        self._second: EMAKernelAPI = EMAKernelAPI(window)
+        self._third: EMAKernelAPI = EMAKernelAPI(window)
+
+    def step(self, value: float) -> tuple[float]:
+        first, = self._first.update(value)
+        second, = self._second.update(first)
+        third, = self._third.update(second)
+        return (3.0 * first) - (3.0 * second) + third,
+
+class HMAKernelAPI(KernelAPI):
+
+    def __init__(self, window: int):
+        super().__init__()
+        self._half: WMAKernelAPI = WMAKernelAPI(math.floor(window / 2))
+        self._full: WMAKernelAPI = WMAKernelAPI(window)
+        self._hull: WMAKernelAPI = WMAKernelAPI(math.floor(math.sqrt(window)))
+
+    def step(self, value: float) -> tuple[float]:
+        half, = self._half.update(value)
+        full, = self._full.update(value)
+        return self._hull.update(2 * half - full)
+
+class KAMAKernelAPI(KernelAPI):
+
+    FAST = 2.0 / (2.0 + 1.0)
+    SLOW = 2.0 / (30.0 + 1.0)
+
+    def __init__(self, window: int):
+        super().__init__()
+        self._window: int = window
+        self._values: deque[float] = deque(maxlen=window + 1)
+        self._count: int = 0
+        self._roc: float = 0.0
+        self._trailing: float = math.nan
+        self._average: float = math.nan
+
+    def step(self, value: float) -> tuple[float]:
+        self._values.append(value)
+        self._count += 1
+        if self._count == 1:
+            return math.nan,
+        if self._count <= self._window + 1:
+            self._roc += math.fabs(self._values[-2] - value)
+            if self._count <= self._window:
+                return math.nan,
+            self._average = self._values[-2]
+        else:
+            self._roc -= math.fabs(self._trailing - self._values[0])
+            self._roc += math.fabs(value - self._values[-2])
+        period_roc = value - self._values[0]
+        self._trailing = self._values[0]
+        efficiency = 1.0 if self._roc <= period_roc or -1e-8 < self._roc < 1e-8 else math.fabs(period_roc / self._roc)
+        constant = (efficiency * (self.FAST - self.SLOW)) + self.SLOW
+        constant *= constant
+        self._average = ((value - self._average) * constant) + self._average
+        return self._average,
+
+class TRKernelAPI(KernelAPI):
+
+    def __init__(self):
+        super().__init__()
+        self._close: float = math.nan
+
+    def step(self, high: float, low: float, close: float) -> tuple[float]:
+        previous, self._close = self._close, close
+        if math.isnan(previous):
+            return math.nan,
+        greatest = high - low
+        if (gap := math.fabs(previous - high)) > greatest:
+            greatest = gap
+        if (gap := math.fabs(previous - low)) > greatest:
+            greatest = gap
+        return greatest,
+
+class ATRKernelAPI(KernelAPI):
+
+    def __init__(self, window: int):
+        super().__init__()
+        self._window: int = window
+        self._range: TRKernelAPI = TRKernelAPI()
+        self._count: int = 0
+        self._total: float = 0.0
+        self._average: float = math.nan
+
+    def step(self, high: float, low: float, close: float) -> tuple[float]:
+        true_range, = self._range.update(high, low, close)
+        if math.isnan(true_range):
+            return math.nan,
+        if self._window <= 1:
+            return true_range,
+        self._count += 1
+        if self._count < self._window:
+            self._total += true_range
+            return math.nan,
+        if self._count == self._window:
+            self._total += true_range
+            self._average = self._total / self._window
+        else:
+            self._average *= self._window - 1
+            self._average += true_range
+            self._average /= self._window
+        return self._average,
+
+class RSIKernelAPI(KernelAPI):
+
+    def __init__(self, window: int):
+        super().__init__()
+        self._window: int = window
+        self._count: int = 0
+        self._previous: float = math.nan
+        self._gain: float = 0.0
+        self._loss: float = 0.0
+
+    def step(self, value: float) -> tuple[float]:
+        change, self._previous = value - self._previous, value
+        self._count += 1
+        if self._count == 1:
+            return math.nan,
+        if self._count <= self._window + 1:
+            if change < 0:
+                self._loss -= change
+            else:
+                self._gain += change
+            if self._count <= self._window:
+                return math.nan,
+        else:
+            self._loss *= self._window - 1
+            self._gain *= self._window - 1
+            if change < 0:
+                self._loss -= change
+            else:
+                self._gain += change
+        self._loss /= self._window
+        self._gain /= self._window
+        total = self._gain + self._loss
+        return 100.0 * (self._gain / total) if not -1e-8 < total < 1e-8 else 0.0,
+
+class CrossKernelAPI(KernelAPI):
+
+    def __init__(self, fast: KernelAPI, slow: KernelAPI):
+        super().__init__(outputs=2)
+        self._fast: KernelAPI = fast
+        self._slow: KernelAPI = slow
+
+    def step(self, *values: float) -> tuple[float, float]:
+        return self._fast.update(*values) + self._slow.update(*values)
@@ -1,39 +1,68 @@
 from Library.Database.Dataframe import pl
-from Library.Analyst import SeriesAPI
+from Library.Analyst import IndicatorCacheAPI, BufferAPI, SeriesAPI
 
 class MarketAPI:
 
-    def __init__(self):
+    def __init__(self, capacity: int | None = None):
         self._offset: int = 1
+        self.Source: MarketAPI | None = None
+        self.Begin: int = 0
         self._series: list[SeriesAPI] | None = None
-        self._data: pl.DataFrame | None = None
+        self._buffer: BufferAPI = BufferAPI(capacity)
+        self._fingerprint: str | None = None
 
     def data(self) -> pl.DataFrame:
-        return self._data if self._data is not None else pl.DataFrame()
-    
+        return self._buffer.data()
+
+    def version(self) -> int:
+        return self._buffer.Version
+
+    def columns(self) -> list[str]:
+        return self._buffer.names()
+
     def head(self, n: int | None = None) -> pl.DataFrame:
-        return self._data.head(n)
+        return self.data().head(n)
 
     def tail(self, n: int | None = None) -> pl.DataFrame:
-        return self._data.tail(n)
+        return self.data().tail(n)
 
     def last(self, shift: int = 0) -> pl.DataFrame:
         return self.data()[-(self._offset + shift)]
     
-    def init_data(self, data: pl.DataFrame) -> None:
+    def fingerprint(self) -> str:
+        if self._fingerprint is None and self.Source is not None:
+            self._fingerprint = f"{self.Source.fingerprint()}:{self.Begin}:{len(self._buffer)}"
+        elif self._fingerprint is None:
+            self._fingerprint = IndicatorCacheAPI.fingerprint(self.data())
+        return self._fingerprint
+
+    def init_series(self) -> None:
         self._series = []
-        self._data = pl.DataFrame()
-        for series in data.iter_columns():
-            tseries = SeriesAPI(series.name)
-            setattr(self, series.name, tseries)
+        for name in self._buffer.names():
+            tseries = SeriesAPI(name)
+            setattr(self, name, tseries)
             self._series.append(tseries)
-            self._data = self._data.with_columns(series)
-        self._data = self._data.rechunk()
-        for tseries in self._series:
-            tseries.init_data(self._data)
-            
+            tseries.init_data(self._buffer)
+
+    def init_data(self, data: pl.DataFrame) -> None:
+        self._fingerprint = None
+        self.Source = None
+        self.Begin = 0
+        self._buffer.init_data(data.rechunk())
+        self.init_series()
+
+    def init_slice(self, source: "MarketAPI", begin: int, length: int) -> None:
+        self._fingerprint = None
+        self.Source = source
+        self.Begin = begin
+        self._buffer.init_slice(source._buffer, begin, length)
+        self.init_series()
+
     def update_data(self, data: pl.DataFrame) -> None:
-        self._data.extend(data)
+        self._fingerprint = None
+        self.Source = None
+        self.Begin = 0
+        self._buffer.update_data(data)
         
     def update_offset(self, offset: int) -> None:
         self._offset = offset
@@ -1,14 +1,20 @@
+import numpy as np
+
 from Library.Database.Dataframe import pl
+from Library.Analyst import BufferAPI
 
 class SeriesAPI:
 
     def __init__(self, sid: str):
         self._sid: str = sid
         self._offset: int = 1
-        self._data: pl.DataFrame | None = None
+        self._buffer: BufferAPI | None = None
 
     def data(self) -> pl.Series:
-        return self._data[self._sid] if self._data is not None else pl.Series()
+        return self._buffer.data()[self._sid] if self._buffer is not None else pl.Series()
+
+    def values(self) -> np.ndarray:
+        return self._buffer.column(self._sid) if self._buffer is not None else np.empty(0)
 
     def head(self, n: int | None = None) -> pl.Series:
         return self.data().head(n)
@@ -16,14 +22,15 @@ class SeriesAPI:
     def tail(self, n: int | None = None) -> pl.Series:
         return self.data().tail(n)
 
-    def init_data(self, data: pl.DataFrame) -> None:
-        self._data = data
+    def init_data(self, buffer: BufferAPI) -> None:
+        self._buffer = buffer
 
     def update_offset(self, offset: int) -> None:
         self._offset = offset
 
-    def last(self, shift: int = 0) -> float | int:
-        return self.data()[-(self._offset + shift)]
+    def last(self, shift: int = 0) -> float | int | None:
+        value = self._buffer.value(self._sid, -(self._offset + shift))
+        return value if value == value else None
 
     def over(self, other, shift: int = 0) -> bool:
         this_last = self.last(shift)
@@ -1,15 +1,51 @@
 MARGIN = 200
 
+from Library.Analyst.Cache import IndicatorCacheAPI
+from Library.Analyst.Buffer import BufferAPI
 from Library.Analyst.Series import SeriesAPI
 from Library.Analyst.Market import MarketAPI
-from Library.Analyst.Indicator import IndicatorAPI
+from Library.Analyst.Expression import ExpressionAPI, ExpressionsAPI
+from Library.Analyst.Kernels import (
+    KernelAPI,
+    SMAKernelAPI,
+    EMAKernelAPI,
+    WMAKernelAPI,
+    HMAKernelAPI,
+    DEMAKernelAPI,
+    TEMAKernelAPI,
+    KAMAKernelAPI,
+    TRKernelAPI,
+    ATRKernelAPI,
+    RSIKernelAPI,
+    CrossKernelAPI
+)
+from Library.Analyst.Graph import NodeAPI, GraphAPI
 from Library.Analyst.Indicators import IndicatorsAPI
+from Library.Analyst.Indicator import IndicatorAPI
 from Library.Analyst.Analyst import AnalystAPI
 
 __all__ = [
     "MARGIN",
+    "IndicatorCacheAPI",
+    "BufferAPI",
     "SeriesAPI",
     "MarketAPI",
+    "ExpressionAPI",
+    "ExpressionsAPI",
+    "KernelAPI",
+    "SMAKernelAPI",
+    "EMAKernelAPI",
+    "WMAKernelAPI",
+    "HMAKernelAPI",
+    "DEMAKernelAPI",
+    "TEMAKernelAPI",
+    "KAMAKernelAPI",
+    "TRKernelAPI",
+    "ATRKernelAPI",
+    "RSIKernelAPI",
+    "CrossKernelAPI",
+    "NodeAPI",
+    "GraphAPI",
     "IndicatorsAPI",
     "IndicatorAPI",
     "AnalystAPI"
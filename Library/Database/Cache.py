@@ -0,0 +1,140 @@
+from __future__ import annotations
+
+import os
+import json
+import threading
+from pathlib import Path
+from typing import Callable
+from collections.abc import Sequence
+from datetime import date, datetime, timedelta
+
+from Library.Database.Dataframe import pl
+
+class CacheAPI:
+    """
+    Read-through on-disk cache of market data partitioned by month and stored as memory-mapped Arrow IPC files.
+    """
+
+    _SUFFIX_: str = ".arrow"
+    _MANIFEST_: str = "Manifest.json"
+    _LOCKS_: dict[Path, threading.RLock] = {}
+    _LOCKS_LOCK_: threading.Lock = threading.Lock()
+
+    def __init__(self, *,
+                 path: str | Path,
+                 key: str | Sequence[str],
+                 pull: Callable[[date, date], pl.DataFrame],
+                 watermark: Callable[[date, date], datetime | None] | None = None,
+                 column: str = "Timestamp") -> None:
+        key = [key] if isinstance(key, str) else list(key)
+        self._path_: Path = Path(path).joinpath(*map(str, key))
+        self._pull_: Callable[[date, date], pl.DataFrame] = pull
+        self._watermark_: Callable[[date, date], datetime | None] | None = watermark
+        self._column_: str = column
+        with CacheAPI._LOCKS_LOCK_:
+            self._lock_: threading.RLock = CacheAPI._LOCKS_.setdefault(self._path_, threading.RLock())
+
+    @staticmethod
+    def partitions(start: date, stop: date) -> list[tuple[date, date]]:
+        partitions = []
+        month = date(start.year, start.month, 1)
+        while month < stop:
+            following = date(month.year + month.month // 12, month.month % 12 + 1, 1)
+            partitions.append((month, following))
+            month = following
+        return partitions
+
+    def _file_(self, month: date) -> Path:
+        return self._path_ / f"{month:%Y-%m}{self._SUFFIX_}"
+
+    def _manifest_(self) -> dict:
+        file = self._path_ / self._MANIFEST_
+        return json.loads(file.read_text()) if file.exists() else {}
+
+    def _persist_(self, manifest: dict) -> None:
+        file = self._path_ / self._MANIFEST_
+        temporary = file.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+        temporary.write_text(json.dumps(manifest, indent=4, sort_keys=True))
+        os.replace(temporary, file)
+
+    def _stale_(self, entry: dict | None, start: date, stop: date) -> bool:
+        if entry is None or not self._file_(start).exists():
+            return True
+        if self._watermark_ is None:
+            return False
+        watermark = self._watermark_(start, stop)
+        return watermark is not None and (entry["Watermark"] is None or watermark > datetime.fromisoformat(entry["Watermark"]))
+
+    def _write_(self, start: date, df: pl.DataFrame) -> None:
+        file = self._file_(start)
+        temporary = file.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+        df.write_ipc(temporary, compression="uncompressed")
+        os.replace(temporary, file)
+
+    def _fill_(self, start: date, stop: date) -> dict:
+        df = self._pull_(start, stop)
+        if not df.is_empty():
+            df = df.filter((pl.col(self._column_) >= start) & (pl.col(self._column_) < stop)).sort(self._column_)
+        self._write_(start, df)
+        watermark = self._watermark_(start, stop) if self._watermark_ is not None else None
+        return {"Pulled": date.today().isoformat(), "Rows": df.height, "Watermark": watermark.isoformat() if watermark is not None else None}
+
+    def _extend_(self, entry: dict, start: date, stop: date) -> dict:
+        cached = pl.read_ipc(self._file_(start))
+        if cached.is_empty():
+            return self._fill_(start, stop)
+        last = cached[self._column_].max()
+        df = self._pull_(last.date() if isinstance(last, datetime) else last, stop)
+        if not df.is_empty():
+            df = df.filter((pl.col(self._column_) > last) & (pl.col(self._column_) < stop)).sort(self._column_)
+        if not df.is_empty():
+            cached = pl.concat([cached, df], how="vertical_relaxed")
+            self._write_(start, cached)
+        return {**entry, "Pulled": date.today().isoformat(), "Rows": cached.height}
+
+    def _refresh_(self, manifest: dict, start: date, stop: date) -> bool:
+        month = f"{start:%Y-%m}"
+        if self._stale_(entry := manifest.get(month), start, stop):
+            manifest[month] = self._fill_(start, stop)
+            return True
+        if self._watermark_ is None and date.fromisoformat(entry["Pulled"]) < stop:
+            manifest[month] = self._extend_(entry, start, stop)
+            return True
+        return False
+
+    def load(self, start: date, stop: date, window: int | None = None) -> pl.DataFrame:
+        with self._lock_:
+            self._path_.mkdir(parents=True, exist_ok=True)
+            manifest = self._manifest_()
+            partitions = self.partitions(start, stop)
+            frames = []
+            dirty = False
+            for partition_start, partition_stop in partitions:
+                dirty |= self._refresh_(manifest, partition_start, partition_stop)
+                frames.append(pl.read_ipc(self._file_(partition_start)))
+            month = partitions[0][0] if partitions else date(start.year, start.month, 1)
+            while window and sum(frame.filter(pl.col(self._column_) < start).height for frame in frames) < window:
+                previous = (month - timedelta(days=1)).replace(day=1)
+                dirty |= self._refresh_(manifest, previous, month)
+                frame = pl.read_ipc(self._file_(previous))
+                if frame.is_empty():
+                    break
+                frames.insert(0, frame)
+                month = previous
+            df = pl.concat(frames, how="vertical_relaxed") if frames else pl.DataFrame()
+            if not df.is_empty():
+                df = pl.concat([df.filter(pl.col(self._column_) < start).tail(window or 0), df.filter((pl.col(self._column_) >= start) & (pl.col(self._column_) < stop))], how="vertical_relaxed")
+            if dirty:
+                self._persist_(manifest)
+            return df
+
+    def invalidate(self, start: date | None = None, stop: date | None = None) -> None:
+        with self._lock_:
+            manifest = self._manifest_()
+            for month in list(manifest):
+                month_start = date.fromisoformat(f"{month}-01")
+                if (start is None or month_start >= date(start.year, start.month, 1)) and (stop is None or month_start < stop):
+                    self._file_(month_start).unlink(missing_ok=True)
+                    del manifest[month]
+            if self._path_.exists():
+                self._persist_(manifest)
@@ -0,0 +1,228 @@
+from __future__ import annotations
+
+import os
+import time
+import pickle
+import threading
+from pathlib import Path
+from typing import Any
+from collections.abc import Sequence
+from abc import ABC, abstractmethod
+
+from Library.Database.Query import QueryAPI
+from Library.Database.Database import DatabaseAPI
+
+class QueueAPI(ABC):
+    """
+    Leased work queue shared between a coordinator publishing tasks and the workers claiming them.
+    """
+
+    def __init__(self, *, namespace: str, lease: float) -> None:
+        self._namespace_: str = namespace
+        self._lease_: float = lease
+
+    @property
+    def namespace(self) -> str:
+        return self._namespace_
+
+    @property
+    def lease_timeout(self) -> float:
+        return self._lease_
+
+    def close(self) -> None:
+        """
+        Releases the resources held by the queue backend.
+        """
+
+    @abstractmethod
+    def publish(self, task: str, payload: Any) -> bool:
+        """
+        Queues a task unless it is already pending, leased or completed.
+        :param task: The unique task identifier.
+        :param payload: The picklable task payload.
+        :return: True if the task was queued.
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def lease(self, worker: str) -> tuple[str, Any] | None:
+        """
+        Claims the next pending task, or a task whose lease expired.
+        :param worker: The identifier of the claiming worker.
+        :return: The task identifier and payload, or None if nothing is pending.
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def renew(self, task: str, worker: str) -> bool:
+        """
+        Extends the lease of a task still held by the worker.
+        :param task: The task identifier.
+        :param worker: The identifier of the leasing worker.
+        :return: True if the lease was still held.
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def complete(self, task: str, worker: str, result: Any) -> None:
+        """
+        Publishes the result of a leased task.
+        :param task: The task identifier.
+        :param worker: The identifier of the leasing worker.
+        :param result: The picklable task result.
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def collect(self, tasks: Sequence[str]) -> dict[str, Any]:
+        """
+        Removes and returns the results of completed tasks.
+        :param tasks: The task identifiers to look up.
+        :return: The results of the completed tasks by identifier.
+        """
+        raise NotImplementedError
+
+class SpoolQueueAPI(QueueAPI):
+    """
+    Directory spool queue whose task files move between states by atomic renames.
+    """
+
+    _PENDING_: str = "Pending"
+    _LEASED_: str = "Leased"
+    _DONE_: str = "Done"
+    _TEMPORARY_: str = "Temporary"
+    _SEPARATOR_: str = "@"
+
+    def __init__(self, *, path: str | Path, namespace: str, lease: float = 300.0) -> None:
+        super().__init__(namespace=namespace, lease=lease)
+        self._path_: Path = Path(path) / namespace
+        for state in (self._PENDING_, self._LEASED_, self._DONE_, self._TEMPORARY_):
+            (self._path_ / state).mkdir(parents=True, exist_ok=True)
+
+    def _file_(self, state: str, task: str, worker: str | None = None) -> Path:
+        return self._path_ / state / (f"{task}{self._SEPARATOR_}{worker}" if worker is not None else task)
+
+    def _write_(self, file: Path, content: Any) -> None:
+        temporary = self._file_(self._TEMPORARY_, f"{file.name}.{os.getpid()}.{threading.get_ident()}")
+        temporary.write_bytes(pickle.dumps(content))
+        os.replace(temporary, file)
+
+    def _expire_(self) -> None:
+        for file in (self._path_ / self._LEASED_).iterdir():
+            try:
+                if os.path.getmtime(file) + self._lease_ < time.time():
+                    os.rename(file, self._file_(self._PENDING_, file.name.rpartition(self._SEPARATOR_)[0]))
+            except FileNotFoundError:
+                continue
+
+    def publish(self, task: str, payload: Any) -> bool:
+        if self._file_(self._PENDING_, task).exists() or self._file_(self._DONE_, task).exists():
+            return False
+        if any((self._path_ / self._LEASED_).glob(f"{task}{self._SEPARATOR_}*")):
+            return False
+        self._write_(self._file_(self._PENDING_, task), payload)
+        return True
+
+    def lease(self, worker: str) -> tuple[str, Any] | None:
+        self._expire_()
+        for file in sorted((self._path_ / self._PENDING_).iterdir()):
+            leased = self._file_(self._LEASED_, file.name, worker)
+            try:
+                os.utime(file)
+                os.rename(file, leased)
+                return file.name, pickle.loads(leased.read_bytes())
+            except FileNotFoundError:
+                continue
+        return None
+
+    def renew(self, task: str, worker: str) -> bool:
+        try:
+            os.utime(self._file_(self._LEASED_, task, worker))
+            return True
+        except FileNotFoundError:
+            return False
+
+    def complete(self, task: str, worker: str, result: Any) -> None:
+        self._write_(self._file_(self._DONE_, task), result)
+        self._file_(self._LEASED_, task, worker).unlink(missing_ok=True)
+        self._file_(self._PENDING_, task).unlink(missing_ok=True)
+
+    def collect(self, tasks: Sequence[str]) -> dict[str, Any]:
+        results = {}
+        for task in tasks:
+            file = self._file_(self._DONE_, task)
+            try:
+                content = file.read_bytes()
+            except FileNotFoundError:
+                continue
+            file.unlink(missing_ok=True)
+            results[task] = pickle.loads(content)
+        return results
+
+class PostgresQueueAPI(QueueAPI):
+    """
+    Postgres table queue whose workers claim tasks with FOR UPDATE SKIP LOCKED.
+    """
+
+    _CREATE_QUERY_: QueryAPI = QueryAPI(
+        'CREATE TABLE IF NOT EXISTS ::target:: ('
+        '"Task" VARCHAR PRIMARY KEY, "Namespace" VARCHAR NOT NULL, "Payload" BYTEA NOT NULL, "Worker" VARCHAR, '
+        '"Expiry" TIMESTAMP, "Attempts" INTEGER NOT NULL DEFAULT 0, "Result" BYTEA, "Created" TIMESTAMP NOT NULL DEFAULT now())'
+    )
+    _PUBLISH_QUERY_: QueryAPI = QueryAPI(
+        'INSERT INTO ::target:: ("Task", "Namespace", "Payload") VALUES (:task:, :namespace:, :payload:) '
+        'ON CONFLICT ("Task") DO NOTHING RETURNING "Task"'
+    )
+    _LEASE_QUERY_: QueryAPI = QueryAPI(
+        'UPDATE ::target:: SET "Worker" = :worker:, "Expiry" = now() + make_interval(secs => :lease:), "Attempts" = "Attempts" + 1 '
+        'WHERE "Task" = (SELECT "Task" FROM ::target:: WHERE "Namespace" = :namespace: AND "Result" IS NULL AND ("Expiry" IS NULL OR "Expiry" < now()) '
+        'ORDER BY "Created" LIMIT 1 FOR UPDATE SKIP LOCKED) RETURNING "Task", "Payload"'
+    )
+    _RENEW_QUERY_: QueryAPI = QueryAPI(
+        'UPDATE ::target:: SET "Expiry" = now() + make_interval(secs => :lease:) '
+        'WHERE "Task" = :task: AND "Worker" = :worker: AND "Result" IS NULL RETURNING "Task"'
+    )
+    _COMPLETE_QUERY_: QueryAPI = QueryAPI(
+        'UPDATE ::target:: SET "Result" = :result:, "Expiry" = NULL WHERE "Task" = :task: AND "Result" IS NULL RETURNING "Task"'
+    )
+    _COLLECT_QUERY_: QueryAPI = QueryAPI(
+        'DELETE FROM ::target:: WHERE "Task" = ANY(:tasks:) AND "Result" IS NOT NULL RETURNING "Task", "Result"'
+    )
+
+    def __init__(self, *, database: DatabaseAPI, namespace: str, lease: float = 300.0, schema: str = "public", table: str = "Queue") -> None:
+        super().__init__(namespace=namespace, lease=lease)
+        self._database_: DatabaseAPI = database
+        self._target_: str = f'"{schema}"."{table}"'
+        self._lock_ = threading.Lock()
+        self._execute_(self._CREATE_QUERY_, fetch=False)
+
+    def _execute_(self, query: QueryAPI, fetch: bool = True, **kwargs) -> list[tuple]:
+        with self._lock_:
+            self._database_.executeone(query, target=self._target_, **kwargs)
+            rows = self._database_.fetchall().rows() if fetch else []
+            self._database_.commit()
+        return rows
+
+    def close(self) -> None:
+        self._database_.disconnect()
+
+    def publish(self, task: str, payload: Any) -> bool:
+        return bool(self._execute_(self._PUBLISH_QUERY_, task=task, namespace=self._namespace_, payload=pickle.dumps(payload)))
+
+    def lease(self, worker: str) -> tuple[str, Any] | None:
+        rows = self._execute_(self._LEASE_QUERY_, worker=worker, lease=self._lease_, namespace=self._namespace_)
+        if not rows:
+            return None
+        task, payload = rows[0]
+        return task, pickle.loads(payload)
+
+    def renew(self, task: str, worker: str) -> bool:
+        return bool(self._execute_(self._RENEW_QUERY_, task=task, worker=worker, lease=self._lease_))
+
+    def complete(self, task: str, worker: str, result: Any) -> None:
+        self._execute_(self._COMPLETE_QUERY_, task=task, result=pickle.dumps(result))
+
+    def collect(self, tasks: Sequence[str]) -> dict[str, Any]:
+        if not tasks:
+            return {}
+        return {task: pickle.loads(result) for task, result in self._execute_(self._COLLECT_QUERY_, tasks=list(tasks))}
@@ -1,4 +1,6 @@
 from Library.Database.Query import QueryAPI
+from Library.Database.Cache import CacheAPI
+from Library.Database.Queue import QueueAPI, SpoolQueueAPI, PostgresQueueAPI
 from Library.Database.Database import (
     DatabaseAPI,
     IdentityKey,
@@ -17,6 +19,10 @@ from Library.Database.Microsoft import *
 
 __all__ = [
     "QueryAPI",
+    "CacheAPI",
+    "QueueAPI",
+    "SpoolQueueAPI",
+    "PostgresQueueAPI",
     "DatabaseAPI",
     "IdentityKey",
     "PrimaryKey",
@@ -24,15 +24,17 @@ class IndicatorMode(Enum):
 class IndicatorConfigurationAPI(DataclassAPI):
     Name: str = field(init=True, repr=True)
     IndicatorType: IndicatorType = field(init=True, repr=True)
-    Input: Callable = field(init=True, repr=True)
+    Input: Callable | None = field(init=True, repr=True, default=None)
     Parameters: dict[str, list[list[int | float]]] = field(init=True, repr=True)
     Constraints: Callable = field(init=True, repr=True)
-    Function: Callable = field(init=True, repr=True)
+    Function: Callable | None = field(init=True, repr=True, default=None)
     Output: list[str] = field(init=True, repr=True)
     FilterBuy: Callable = field(init=True, repr=True)
     FilterSell: Callable = field(init=True, repr=True)
     SignalBuy: Callable = field(init=True, repr=True)
     SignalSell: Callable = field(init=True, repr=True)
+    Kernel: Callable | None = field(init=True, repr=False, default=None)
+    Graph: Callable | None = field(init=True, repr=False, default=None)
 
     def __post_init__(self):
         self.IndicatorType = IndicatorType(self.IndicatorType)
@@ -1,11 +1,12 @@
-import math
+from __future__ import annotations
 
-from datetime import date, timedelta
+from datetime import date
+from typing import TYPE_CHECKING
 
 from Library.Database.Dataframe import pl
 from Library.Database import DatabaseAPI
-from Library.Classes import TradeType, Account, Trade
 from Library.Manager import EPSILON
+if TYPE_CHECKING: from Library.Classes import Account, Trade
 
 class StatisticsAPI:
 
@@ -16,6 +17,10 @@ class StatisticsAPI:
     BUY_METRICS_AGGREGATED = "Buy Metrics (Aggregated)"
     SELL_METRICS_AGGREGATED = "Sell Metrics (Aggregated)"
     TOTAL_METRICS_AGGREGATED = "Total Metrics (Aggregated)"
+    BACKTEST_ID_LABEL = "Backtest ID"
+    INITIAL_BALANCE_LABEL = "Initial Balance"
+    START_TIMESTAMP_LABEL = "Start Timestamp"
+    STOP_TIMESTAMP_LABEL = "Stop Timestamp"
 
     TOTALTRADESVALUE = "Nr Total of Trades"
     TOTALPOINTSVALUE = "Total Points"
@@ -169,344 +174,252 @@ class StatisticsAPI:
         FITNESSRATIO
     ]
 
+
     def __init__(self):
         self._data : pl.DataFrame = DatabaseAPI.format_trade_data(None)        
 
     def update_data(self, trade: Trade) -> None:
         self._data.extend(DatabaseAPI.format_trade_data(trade))
 
+    def trades(self) -> pl.DataFrame:
+        return self._data
+
     @staticmethod
     def sort_trades(trades_df: pl.DataFrame) -> pl.DataFrame:
-        return trades_df.sort(by=Trade.ExitTimestamp, descending=False)
+        return trades_df.sort(by="ExitTimestamp", descending=False)
 
     @staticmethod
-    def aggregate_trades(trades_df: pl.DataFrame) -> pl.DataFrame:
-        return trades_df.group_by(Trade.PositionID).agg([
-            pl.col(str(Trade.TradeID)),
-            pl.col(str(Trade.PositionType)).first().alias(Trade.PositionType),
-            pl.col(str(Trade.TradeType)).first().alias(Trade.TradeType),
-            pl.col(str(Trade.EntryTimestamp)).min().alias(Trade.EntryTimestamp),
-            pl.col(str(Trade.ExitTimestamp)).max().alias(Trade.ExitTimestamp),
-            pl.col(str(Trade.EntryPrice)).first().alias(Trade.EntryPrice),
-            pl.col(str(Trade.ExitPrice)).last().alias(Trade.ExitPrice),
-            pl.col(str(Trade.Volume)).sum().alias(Trade.Volume),
-            pl.col(str(Trade.Points)).sum().alias(Trade.Points),
-            pl.col(str(Trade.Pips)).sum().alias(Trade.Pips),
-            pl.col(str(Trade.GrossPnL)).sum().alias(Trade.GrossPnL),
-            pl.col(str(Trade.CommissionPnL)).sum().alias(Trade.CommissionPnL),
-            pl.col(str(Trade.SwapPnL)).sum().alias(Trade.SwapPnL),
-            pl.col(str(Trade.NetPnL)).sum().alias(Trade.NetPnL),
-            pl.col(str(Trade.DrawdownPoints)).min().alias(Trade.DrawdownPoints),
-            pl.col(str(Trade.DrawdownPips)).min().alias(Trade.DrawdownPips),
-            pl.col(str(Trade.DrawdownPnL)).min().alias(Trade.DrawdownPnL),
-            pl.col(str(Trade.DrawdownReturn)).min().alias(Trade.DrawdownReturn),
-            pl.col(str(Trade.NetReturn)).sum().alias(Trade.NetReturn),
-            pl.col(str(Trade.NetLogReturn)).sum().alias(Trade.NetLogReturn),
-            pl.col(str(Trade.NetReturnDrawdown)).sum().alias(Trade.NetReturnDrawdown),
-            pl.col(str(Trade.BaseBalance)).first().alias(Trade.BaseBalance),
-            pl.col(str(Trade.EntryBalance)).first().alias(Trade.EntryBalance),
-            pl.col(str(Trade.ExitBalance)).last().alias(Trade.ExitBalance),
+    def aggregate_trades(trades_df: pl.DataFrame, *keys: str) -> pl.DataFrame:
+        return trades_df.group_by([*keys, "PositionID"] if keys else "PositionID", maintain_order=bool(keys)).agg([
+            pl.col("TradeID"),
+            pl.col("PositionType").first(),
+            pl.col("TradeType").first(),
+            pl.col("EntryTimestamp").min(),
+            pl.col("ExitTimestamp").max(),
+            pl.col("EntryPrice").first(),
+            pl.col("ExitPrice").last(),
+            pl.col("Volume").sum(),
+            pl.col("Points").sum(),
+            pl.col("Pips").sum(),
+            pl.col("GrossPnL").sum(),
+            pl.col("CommissionPnL").sum(),
+            pl.col("SwapPnL").sum(),
+            pl.col("NetPnL").sum(),
+            pl.col("DrawdownPoints").min(),
+            pl.col("DrawdownPips").min(),
+            pl.col("DrawdownPnL").min(),
+            pl.col("DrawdownReturn").min(),
+            pl.col("NetReturn").sum(),
+            pl.col("NetLogReturn").sum(),
+            pl.col("NetReturnDrawdown").sum(),
+            pl.col("BaseBalance").first(),
+            pl.col("EntryBalance").first(),
+            pl.col("ExitBalance").last(),
         ])
 
     @staticmethod
-    def split_buy_sell_trades(trades_df: pl.DataFrame) -> tuple[pl.DataFrame, pl.DataFrame]:
-        return (trades_df.filter(pl.col(str(Trade.TradeType)) == TradeType.Buy.name),
-                trades_df.filter(pl.col(str(Trade.TradeType)) == TradeType.Sell.name))
-    
-    @staticmethod
-    def split_winning_losing_trades(trades_df: pl.DataFrame) -> tuple[pl.DataFrame, pl.DataFrame]:
-        return (trades_df.filter(pl.col(str(Trade.NetPnL)) > 0),
-                trades_df.filter(pl.col(str(Trade.NetPnL)) <= 0))
-
-    @staticmethod
-    def calculate_total_trades(trades_df: pl.DataFrame) -> int:
-        return trades_df.shape[0]
-    
-    @staticmethod
-    def calculate_rate_perc(nr_cases: int, nr_trades: int) -> float:
-        return (nr_cases / nr_trades) * 100 if nr_trades else 0.0
-    
-    @staticmethod
-    def calculate_min_avg_max(nr_trades: int, trades_df: pl.DataFrame, column) -> tuple[float, float, float]:
-        if nr_trades > 0:
-            max_value = trades_df[column].max()
-            avg_value = trades_df[column].mean()
-            min_value = trades_df[column].min()
-            return max_value, avg_value, min_value
-        return 0.0, 0.0, 0.0
-    
-    @staticmethod
-    def calculate_sum(trades_df: pl.DataFrame, column: str) -> float:
-        return trades_df[column].sum()
-    
-    @staticmethod
-    def calculate_average_value(net_value: float, nr_trades: int) -> float:
-        return net_value / nr_trades if nr_trades else 0.0
-
-    @staticmethod
-    def calculate_expected_value(winning_perc: float, avg_winning_value: float, losing_perc: float, avg_losing_value: float) -> float:
-        return (winning_perc / 100 * avg_winning_value) - (losing_perc / 100 * avg_losing_value)
-
-    @staticmethod
-    def calculate_return_and_volatility_perc(trades_df: pl.DataFrame) -> tuple[float, float, float]:
-        expected_log_return = trades_df[str(Trade.NetLogReturn)].mean()
-        total_log_return = trades_df[str(Trade.NetLogReturn)].sum()
-        log_return_volatility = trades_df[str(Trade.NetLogReturn)].std()
-        expected_return_perc = (math.exp(expected_log_return) - 1) * 100 if expected_log_return else 0.0
-        total_return_perc = (math.exp(total_log_return) - 1) * 100 if total_log_return else 0.0
-        return_volatility_perc = math.sqrt(math.exp(log_return_volatility**2) - 1) * 100 if log_return_volatility else 0.0
-        return expected_return_perc, total_return_perc, return_volatility_perc
-
-    @staticmethod
-    def calculate_return_annualized_perc(start_timestamp: date, stop_timestamp: date, return_value_perc: float, trading_days: int = 365) -> float:
-        if not return_value_perc:
-            return 0.0
-        days = (stop_timestamp - start_timestamp).days
-        return (((1 + (return_value_perc / 100)) ** (trading_days / days)) - 1) * 100
-
-    @staticmethod
-    def calculate_volatility_annualized_perc(start_timestamp: date, stop_timestamp: date, volatility_value_perc: float, trading_days: int = 365) -> float:
-        if not volatility_value_perc:
-            return 0.0
-        days = (stop_timestamp - start_timestamp).days
-        return (volatility_value_perc / 100) * math.sqrt(trading_days / days) * 100
-    
-    @staticmethod
-    def calculate_risk_to_reward(avg_winning_trade: float, avg_losing_trade: float)  -> float:
-        return abs(avg_losing_trade) / avg_winning_trade if avg_winning_trade else 0.0
-    
-    @staticmethod
-    def calculate_profit_factor(winning_pnl_value: float, losing_pnl_value: float) -> float:
-        return winning_pnl_value / abs(losing_pnl_value) if losing_pnl_value else 0.0
-
-    @staticmethod
-    def calculate_max_and_mean_drawdown(initial_account: Account, trades_df: pl.DataFrame) -> tuple[float, float, float, float]:
-        if trades_df.is_empty():
-            return 0.0, 0.0, 0.0, 0.0
-        initial_balance = initial_account.Balance
-        cumulative_balance = trades_df[str(Trade.NetPnL)].cum_sum() + pl.Series([initial_balance])
-        running_max = cumulative_balance.cum_max()
-        drawdown = running_max - cumulative_balance
-        max_drawdown_value = drawdown.max()
-        cumulative_max = running_max.max()
-        max_drawdown_perc = (max_drawdown_value / cumulative_max) * 100 if cumulative_max else 0.0
-        mean_drawdown_value = drawdown.mean()
-        mean_drawdown_perc = (mean_drawdown_value / cumulative_max) * 100 if cumulative_max else 0.0
-        return max_drawdown_value, max_drawdown_perc, mean_drawdown_value, mean_drawdown_perc
-
-    @staticmethod
-    def calculate_holding_times(trades_df: pl.DataFrame) -> tuple[float, float, float]:
-        if trades_df.is_empty():
-            return 0.0, 0.0, 0.0
-        holding_times: pl.Series = trades_df[str(Trade.ExitTimestamp)] - trades_df[str(Trade.EntryTimestamp)]
-        def format_timedelta(td: timedelta):
-            days = td.days
-            hours = td.seconds // 3600
-            return days + hours / 100
-        max_holding_time = format_timedelta(holding_times.max())
-        avg_holding_time = format_timedelta(holding_times.mean())
-        min_holding_time = format_timedelta(holding_times.min())
-        return max_holding_time, avg_holding_time, min_holding_time
+    def _ratio(numerator: pl.Expr, denominator: pl.Expr) -> pl.Expr:
+        return pl.when(denominator != 0).then(numerator / denominator).otherwise(0.0)
 
     @staticmethod
-    def calculate_sharpe_ratio(annualized_return_perc: float, annualized_volatility_perc: float, risk_free_rate: float = 0.0) -> float:
-        annualized_volatility_perc = annualized_volatility_perc if annualized_volatility_perc else EPSILON
-        return (annualized_return_perc - risk_free_rate) / annualized_volatility_perc
+    def _guarded(expression: pl.Expr) -> pl.Expr:
+        return pl.when(expression != 0).then(expression).otherwise(EPSILON)
 
     @staticmethod
-    def calculate_sortino_ratio(annualized_return_perc: float, downside_volatility_perc: float, risk_free_rate: float = 0.0) -> float:
-        downside_volatility_perc = downside_volatility_perc if downside_volatility_perc else EPSILON
-        return (annualized_return_perc - risk_free_rate) / downside_volatility_perc if downside_volatility_perc else 0.0
+    def _truthy(expression: pl.Expr) -> pl.Expr:
+        return expression.is_not_null() & (expression != 0)
+
+    @classmethod
+    def _streaks(cls, trades_df: pl.DataFrame, view: str) -> pl.DataFrame:
+        backtest, winning = cls.BACKTEST_ID_LABEL, pl.col("NetPnL") > 0
+        run = (winning != winning.shift(1)).fill_null(True).cum_sum().over(backtest)
+        trades_df = trades_df.with_columns(run.alias("Run")).with_columns(pl.len().over(backtest, "Run").alias("Length"))
+        for label, mask in [("Winning", winning), ("Losing", ~winning)]:
+            longest = pl.when(mask).then(pl.col("Length")).max().over(backtest)
+            first = pl.when(mask & (pl.col("Length") == longest)).then(pl.col("Run")).min().over(backtest)
+            trades_df = trades_df.with_columns((pl.col("Run") == first).fill_null(False).alias(f"{label} Streak"))
+        trades_df = trades_df.select(backtest, "TradeType", "NetPnL", "Points", "Pips", "GrossPnL", "CommissionPnL", "SwapPnL", "NetLogReturn", "EntryTimestamp", "ExitTimestamp", "Winning Streak", "Losing Streak").with_columns(pl.lit(view).alias("View"))
+        return pl.concat([trades_df.with_columns(pl.lit("Total").alias("Side")),
+                          *[trades_df.filter(pl.col("TradeType") == side).with_columns(pl.lit(side).alias("Side")) for side in ("Buy", "Sell")]], how="vertical_relaxed")
+
+    @classmethod
+    def _sums(cls, stacked_df: pl.DataFrame) -> pl.DataFrame:
+        net, log_return = pl.col("NetPnL"), pl.col("NetLogReturn")
+        masks = {"Winning": net > 0, "Losing": net <= 0}
+        balance = net.cum_sum() + pl.col(cls.INITIAL_BALANCE_LABEL)
+        drawdown = balance.cum_max() - balance
+        holding = pl.col("ExitTimestamp") - pl.col("EntryTimestamp")
+        return stacked_df.group_by(cls.BACKTEST_ID_LABEL, "View", "Side", maintain_order=True).agg(
+            pl.len().alias("Trades"), pl.col("Points").sum(), pl.col("Pips").sum(),
+            pl.col("GrossPnL").sum(), pl.col("CommissionPnL").sum(), pl.col("SwapPnL").sum(), net.sum(),
+            *[expression for label, mask in masks.items() for expression in [
+                mask.sum().alias(f"{label} Trades"),
+                pl.col("Points").filter(mask).sum().alias(f"{label} Points"),
+                pl.col("Pips").filter(mask).sum().alias(f"{label} Pips"),
+                net.filter(mask).sum().alias(f"{label} PnL"),
+                *[getattr(pl.col(column).filter(mask), statistic.lower())().alias(f"{statistic} {label} {column}") for column in ("NetPnL", "Points", "Pips") for statistic in ("Max", "Mean", "Min")]
+            ]],
+            *[expression for label, returns in [("Winning", log_return.filter(masks["Winning"])), ("Losing", log_return.filter(masks["Losing"])), ("Net", log_return)] for expression in [
+                returns.mean().alias(f"Mean {label} Log Return"), returns.sum().alias(f"Total {label} Log Return"), returns.std().alias(f"Std {label} Log Return")
+            ]],
+            drawdown.max().alias("Max Drawdown"), drawdown.mean().alias("Mean Drawdown"), balance.cum_max().max().alias("Peak Balance"),
+            *[getattr(holding, statistic.lower())().dt.total_microseconds().alias(f"{statistic} Holding") for statistic in ("Max", "Mean", "Min")],
+            pl.col("Winning Streak").sum(), pl.col("Losing Streak").sum()
+        )
+
+    @classmethod
+    def _returns(cls, label: str) -> list[pl.Expr]:
+        mean, total, std = pl.col(f"Mean {label} Log Return"), pl.col(f"Total {label} Log Return"), pl.col(f"Std {label} Log Return")
+        return [pl.when(cls._truthy(mean)).then((mean.exp() - 1) * 100).otherwise(0.0).alias(f"Expected {label} Return"),
+                pl.when(cls._truthy(total)).then((total.exp() - 1) * 100).otherwise(0.0).alias(f"{label} Return"),
+                pl.when(cls._truthy(std)).then(((std ** 2).exp() - 1).sqrt() * 100).otherwise(0.0).alias(f"{label} Volatility")]
+
+    @classmethod
+    def _annualized(cls, label: str, trading_days: int = 365) -> list[pl.Expr]:
+        total, volatility, days = pl.col(f"{label} Return"), pl.col(f"{label} Volatility"), pl.col("Days")
+        return [pl.when(cls._truthy(total)).then(((1 + total / 100) ** (trading_days / days) - 1) * 100).otherwise(0.0).alias(f"Annualized {label} Return"),
+                pl.when(cls._truthy(volatility)).then((volatility / 100) * (trading_days / days).sqrt() * 100).otherwise(0.0).alias(f"Annualized {label} Volatility")]
 
     @staticmethod
-    def calculate_calmar_ratio(annualized_return_perc: float, max_drawdown_perc: float, risk_free_rate: float = 0.0) -> float:
-        max_drawdown_perc = max_drawdown_perc if max_drawdown_perc else EPSILON
-        return (annualized_return_perc - risk_free_rate) / abs(max_drawdown_perc) if max_drawdown_perc else 0.0
+    def _extremes(label: str, column: str) -> list[pl.Expr]:
+        return [pl.when(pl.col(f"{label} Trades") > 0).then(pl.col(f"{statistic} {label} {column}")).otherwise(0.0).alias(f"{statistic} {label} {column}") for statistic in ("Max", "Mean", "Min")]
 
     @staticmethod
-    def calculate_fitness_ratio(annualized_return_perc: float, mean_drawdown_perc: float, risk_free_rate: float = 0.0) -> float:
-        mean_drawdown_perc = mean_drawdown_perc if mean_drawdown_perc else EPSILON
-        return (annualized_return_perc - risk_free_rate) / abs(mean_drawdown_perc) if mean_drawdown_perc else 0.0
-
-    def calculate_independent_metrics(self, initial_account: Account, start_timestamp: date, stop_timestamp: date, total_trades_df: pl.DataFrame) -> dict:
-        winning_trades_df, losing_trades_df = self.split_winning_losing_trades(total_trades_df)
-        total_nr_trades = self.calculate_total_trades(total_trades_df)
-        total_points_value = self.calculate_sum(total_trades_df, str(Trade.Points))
-        total_pips_value = self.calculate_sum(total_trades_df, str(Trade.Pips))
-        winning_nr_trades = self.calculate_total_trades(winning_trades_df)
-        winning_points_value = self.calculate_sum(winning_trades_df, str(Trade.Points))
-        winning_pips_value = self.calculate_sum(winning_trades_df, str(Trade.Pips))
-        losing_nr_trades = self.calculate_total_trades(losing_trades_df)
-        losing_points_value = self.calculate_sum(losing_trades_df, str(Trade.Points))
-        losing_pips_value = self.calculate_sum(losing_trades_df, str(Trade.Pips))
-        winning_rate_perc = self.calculate_rate_perc(winning_nr_trades, total_nr_trades)
-        losing_rate_perc = self.calculate_rate_perc(losing_nr_trades, total_nr_trades)
-        winning_max_trade, winning_avg_trade, winning_min_trade = self.calculate_min_avg_max(winning_nr_trades, winning_trades_df, str(Trade.NetPnL))
-        losing_min_trade, losing_avg_trade, losing_max_trade = self.calculate_min_avg_max(losing_nr_trades, losing_trades_df, str(Trade.NetPnL))
-        winning_max_points, winning_avg_points, winning_min_points = self.calculate_min_avg_max(winning_nr_trades, winning_trades_df, str(Trade.Points))
-        losing_min_points, losing_avg_points, losing_max_points = self.calculate_min_avg_max(losing_nr_trades, losing_trades_df, str(Trade.Points))
-        winning_max_pips, winning_avg_pips, winning_min_pips = self.calculate_min_avg_max(winning_nr_trades, winning_trades_df, str(Trade.Pips))
-        losing_min_pips, losing_avg_pips, losing_max_pips = self.calculate_min_avg_max(losing_nr_trades, losing_trades_df, str(Trade.Pips))
-        gross_pnl_value = self.calculate_sum(total_trades_df, str(Trade.GrossPnL))
-        commissions_value = self.calculate_sum(total_trades_df, str(Trade.CommissionPnL))
-        swaps_value = self.calculate_sum(total_trades_df, str(Trade.SwapPnL))
-        winning_pnl_value = self.calculate_sum(winning_trades_df, str(Trade.NetPnL))
-        losing_pnl_value = self.calculate_sum(losing_trades_df, str(Trade.NetPnL))
-        total_pnl_value = self.calculate_sum(total_trades_df, str(Trade.NetPnL))
-        
-        expected_winning_return_perc, winning_return_perc, winning_volatility_perc = self.calculate_return_and_volatility_perc(winning_trades_df)
-        expected_losing_return_perc, losing_return_perc, losing_volatility_perc = self.calculate_return_and_volatility_perc(losing_trades_df)
-        expected_net_return_perc, net_return_perc, net_volatility_perc = self.calculate_return_and_volatility_perc(total_trades_df)
-        
-        winning_return_annualized_perc = self.calculate_return_annualized_perc(start_timestamp, stop_timestamp, winning_return_perc)
-        winning_volatility_annualized_perc = self.calculate_volatility_annualized_perc(start_timestamp, stop_timestamp, winning_volatility_perc)
-        losing_return_annualized_perc = self.calculate_return_annualized_perc(start_timestamp, stop_timestamp, losing_return_perc)
-        losing_volatility_annualized_perc = self.calculate_volatility_annualized_perc(start_timestamp, stop_timestamp, losing_volatility_perc)
-        net_return_annualized_perc = self.calculate_return_annualized_perc(start_timestamp, stop_timestamp, net_return_perc)
-        net_volatility_annualized_perc = self.calculate_volatility_annualized_perc(start_timestamp, stop_timestamp, net_volatility_perc)
-        
-        average_trade = self.calculate_average_value(total_pnl_value, total_nr_trades)
-        average_points = self.calculate_average_value(total_points_value, total_nr_trades)
-        average_pips = self.calculate_average_value(total_pips_value, total_nr_trades)
-        expected_trade = self.calculate_expected_value(winning_rate_perc, winning_avg_trade, losing_rate_perc, losing_avg_trade)
-        expected_points = self.calculate_expected_value(winning_rate_perc, winning_avg_points, losing_rate_perc, losing_avg_points)
-        expected_pips = self.calculate_expected_value(winning_rate_perc, winning_avg_pips, losing_rate_perc, losing_avg_pips)
-        
-        risk_to_reward = self.calculate_risk_to_reward(winning_avg_trade, losing_avg_trade)
-        profit_factor = self.calculate_profit_factor(winning_pnl_value, losing_pnl_value)
-        max_drawdown_value, max_drawdown_perc, mean_drawdown_value, mean_drawdown_perc = self.calculate_max_and_mean_drawdown(initial_account, total_trades_df)
-        max_holding_time, avg_holding_time, min_holding_time = self.calculate_holding_times(total_trades_df)
-        
-        sharpe_ratio = self.calculate_sharpe_ratio(net_return_annualized_perc, net_volatility_annualized_perc)
-        sortino_ratio = self.calculate_sortino_ratio(net_return_annualized_perc, losing_volatility_annualized_perc)
-        calmar_ratio = self.calculate_calmar_ratio(net_return_annualized_perc, max_drawdown_perc)
-        fitness_ratio = self.calculate_fitness_ratio(net_return_annualized_perc, mean_drawdown_perc)
-        
+    def _holding_time(name: str) -> pl.Expr:
+        microseconds = pl.col(name)
+        days = microseconds.floordiv(86_400_000_000)
+        hours = ((microseconds - days * 86_400_000_000) // 1_000_000) // 3600
+        return pl.when(pl.col("Trades") > 0).then(days + hours / 100).otherwise(0.0).alias(name)
+
+    @classmethod
+    def _drawdowns(cls) -> list[pl.Expr]:
+        traded = pl.col("Trades") > 0
+        return [pl.when(traded).then(pl.col("Max Drawdown")).otherwise(0.0).alias("Max Drawdown"),
+                pl.when(traded).then(cls._ratio(pl.col("Max Drawdown"), pl.col("Peak Balance")) * 100).otherwise(0.0).alias("Max Drawdown (%)"),
+                pl.when(traded).then(pl.col("Mean Drawdown")).otherwise(0.0).alias("Mean Drawdown"),
+                pl.when(traded).then(cls._ratio(pl.col("Mean Drawdown"), pl.col("Peak Balance")) * 100).otherwise(0.0).alias("Mean Drawdown (%)")]
+
+    @classmethod
+    def _metrics(cls) -> dict[str, pl.Expr]:
+        def expected(column: str) -> pl.Expr:
+            return pl.col("Winning Rate") / 100 * pl.col(f"Mean Winning {column}") - pl.col("Losing Rate") / 100 * pl.col(f"Mean Losing {column}")
+        net_return = pl.col("Annualized Net Return")
         return {
-            self.TOTALTRADESVALUE: total_nr_trades,
-            self.TOTALPOINTSVALUE: total_points_value,
-            self.TOTALPIPSVALUE: total_pips_value,
-                
-            self.WINNINGTRADESVALUE: winning_nr_trades,
-            self.WINNINGPOINTSVALUE: winning_points_value,
-            self.WINNINGPIPSVALUE: winning_pips_value,
-            self.WINNINGRATEPERC: winning_rate_perc,
-            self.MAXWINNINGTRADE: winning_max_trade,
-            self.AVERAGEWINNINGTRADE: winning_avg_trade,
-            self.MINWINNINGTRADE: winning_min_trade,
-            self.MAXWINNINGPOINTS: winning_max_points,
-            self.AVERAGEWINNINGPOINTS: winning_avg_points,
-            self.MINWINNINGPOINTS: winning_min_points,
-            self.MAXWINNINGPIPS: winning_max_pips,
-            self.AVERAGEWINNINGPIPS: winning_avg_pips,
-            self.MINWINNINGPIPS: winning_min_pips,
-            self.EXPECTEDWINNINGRETURNPERC: expected_winning_return_perc,
-            self.WINNINGRETURNPERC: winning_return_perc,
-            self.WINNINGRETURNANNPERC: winning_return_annualized_perc,
-            self.WINNINGVOLATILITYPERC: winning_volatility_perc,
-            self.WINNINGVOLATILITYANNPERC: winning_volatility_annualized_perc,
-
-            self.LOSINGTRADESVALUE: losing_nr_trades,
-            self.LOSINGPOINTSVALUE: losing_points_value,
-            self.LOSINGPIPSVALUE: losing_pips_value,
-            self.LOSINGRATEPERC: losing_rate_perc,
-            self.MAXLOSINGTRADE: losing_max_trade,
-            self.AVERAGELOSINGTRADE: losing_avg_trade,
-            self.MINLOSINGTRADE: losing_min_trade,
-            self.MAXLOSINGPOINTS: losing_max_points,
-            self.AVERAGELOSINGPOINTS: losing_avg_points,
-            self.MINLOSINGPOINTS: losing_min_points,
-            self.MAXLOSINGPIPS: losing_max_pips,
-            self.AVERAGELOSINGPIPS: losing_avg_pips,
-            self.MINLOSINGPIPS: losing_min_pips,
-            self.EXPECTEDLOSINGRETURNPERC: expected_losing_return_perc,
-            self.LOSINGRETURNPERC: losing_return_perc,
-            self.LOSINGRETURNANNPERC: losing_return_annualized_perc,
-            self.LOSINGVOLATILITYPERC: losing_volatility_perc,
-            self.LOSINGVOLATILITYANNPERC: losing_volatility_annualized_perc,
-
-            self.AVERAGETRADE: average_trade,
-            self.AVERAGEPOINTS: average_points,
-            self.AVERAGEPIPS: average_pips,
-            self.EXPECTEDTRADE: expected_trade,
-            self.EXPECTEDPOINTS: expected_points,
-            self.EXPECTEDPIPS: expected_pips,
-
-            self.GROSSPNLVALUE:gross_pnl_value,
-            self.COMMISSIONSPNLVALUE: commissions_value,
-            self.SWAPSPNLVALUE: swaps_value,
-            self.NETPNLVALUE: total_pnl_value,
-            self.EXPECTEDNETRETURNPERC: expected_net_return_perc,
-            self.NETRETURNPERC: net_return_perc,
-            self.NETRETURNANNPERC: net_return_annualized_perc,
-            self.NETVOLATILITYPERC: net_volatility_perc,
-            self.NETVOLATILITYANNPERC: net_volatility_annualized_perc,
-
-            self.PROFITFACTOR: profit_factor,
-            self.RISKTOREWARDRATIO: risk_to_reward,
-            self.MAXDRAWDOWNVALUE: max_drawdown_value,
-            self.MAXDRAWDOWNPERC: max_drawdown_perc,
-            self.MEANDRAWDOWNVALUE: mean_drawdown_value,
-            self.MEANDRAWDOWNPERC: mean_drawdown_perc,
-            self.MAXHOLDINGTIME: max_holding_time,
-            self.AVERAGEHOLDINGTIME: avg_holding_time,
-            self.MINHOLDINGTIME: min_holding_time,
-            self.SHARPERATIO: sharpe_ratio,
-            self.SORTINORATIO: sortino_ratio,
-            self.CALMARRATIO: calmar_ratio,
-            self.FITNESSRATIO: fitness_ratio
+            cls.TOTALTRADESVALUE: pl.col("Trades"),
+            cls.TOTALPOINTSVALUE: pl.col("Points"),
+            cls.TOTALPIPSVALUE: pl.col("Pips"),
+
+            cls.WINNINGTRADESVALUE: pl.col("Winning Trades"),
+            cls.WINNINGPOINTSVALUE: pl.col("Winning Points"),
+            cls.WINNINGPIPSVALUE: pl.col("Winning Pips"),
+            cls.WINNINGRATEPERC: pl.col("Winning Rate"),
+            cls.MAXWINNINGTRADE: pl.col("Max Winning NetPnL"),
+            cls.AVERAGEWINNINGTRADE: pl.col("Mean Winning NetPnL"),
+            cls.MINWINNINGTRADE: pl.col("Min Winning NetPnL"),
+            cls.MAXWINNINGPOINTS: pl.col("Max Winning Points"),
+            cls.AVERAGEWINNINGPOINTS: pl.col("Mean Winning Points"),
+            cls.MINWINNINGPOINTS: pl.col("Min Winning Points"),
+            cls.MAXWINNINGPIPS: pl.col("Max Winning Pips"),
+            cls.AVERAGEWINNINGPIPS: pl.col("Mean Winning Pips"),
+            cls.MINWINNINGPIPS: pl.col("Min Winning Pips"),
+            cls.MAXWINNINGSTREAK: pl.col("Winning Streak"),
+            cls.EXPECTEDWINNINGRETURNPERC: pl.col("Expected Winning Return"),
+            cls.WINNINGRETURNPERC: pl.col("Winning Return"),
+            cls.WINNINGRETURNANNPERC: pl.col("Annualized Winning Return"),
+            cls.WINNINGVOLATILITYPERC: pl.col("Winning Volatility"),
+            cls.WINNINGVOLATILITYANNPERC: pl.col("Annualized Winning Volatility"),
+
+            cls.LOSINGTRADESVALUE: pl.col("Losing Trades"),
+            cls.LOSINGPOINTSVALUE: pl.col("Losing Points"),
+            cls.LOSINGPIPSVALUE: pl.col("Losing Pips"),
+            cls.LOSINGRATEPERC: pl.col("Losing Rate"),
+            cls.MAXLOSINGTRADE: pl.col("Min Losing NetPnL"),
+            cls.AVERAGELOSINGTRADE: pl.col("Mean Losing NetPnL"),
+            cls.MINLOSINGTRADE: pl.col("Max Losing NetPnL"),
+            cls.MAXLOSINGPOINTS: pl.col("Min Losing Points"),
+            cls.AVERAGELOSINGPOINTS: pl.col("Mean Losing Points"),
+            cls.MINLOSINGPOINTS: pl.col("Max Losing Points"),
+            cls.MAXLOSINGPIPS: pl.col("Min Losing Pips"),
+            cls.AVERAGELOSINGPIPS: pl.col("Mean Losing Pips"),
+            cls.MINLOSINGPIPS: pl.col("Max Losing Pips"),
+            cls.MAXLOSINGSTREAK: pl.col("Losing Streak"),
+            cls.EXPECTEDLOSINGRETURNPERC: pl.col("Expected Losing Return"),
+            cls.LOSINGRETURNPERC: pl.col("Losing Return"),
+            cls.LOSINGRETURNANNPERC: pl.col("Annualized Losing Return"),
+            cls.LOSINGVOLATILITYPERC: pl.col("Losing Volatility"),
+            cls.LOSINGVOLATILITYANNPERC: pl.col("Annualized Losing Volatility"),
+
+            cls.AVERAGETRADE: cls._ratio(pl.col("NetPnL"), pl.col("Trades")),
+            cls.AVERAGEPOINTS: cls._ratio(pl.col("Points"), pl.col("Trades")),
+            cls.AVERAGEPIPS: cls._ratio(pl.col("Pips"), pl.col("Trades")),
+            cls.EXPECTEDTRADE: expected("NetPnL"),
+            cls.EXPECTEDPOINTS: expected("Points"),
+            cls.EXPECTEDPIPS: expected("Pips"),
+
+            cls.GROSSPNLVALUE: pl.col("GrossPnL"),
+            cls.COMMISSIONSPNLVALUE: pl.col("CommissionPnL"),
+            cls.SWAPSPNLVALUE: pl.col("SwapPnL"),
+            cls.NETPNLVALUE: pl.col("NetPnL"),
+            cls.EXPECTEDNETRETURNPERC: pl.col("Expected Net Return"),
+            cls.NETRETURNPERC: pl.col("Net Return"),
+            cls.NETRETURNANNPERC: net_return,
+            cls.NETVOLATILITYPERC: pl.col("Net Volatility"),
+            cls.NETVOLATILITYANNPERC: pl.col("Annualized Net Volatility"),
+
+            cls.PROFITFACTOR: cls._ratio(pl.col("Winning PnL"), pl.col("Losing PnL").abs()),
+            cls.RISKTOREWARDRATIO: cls._ratio(pl.col("Mean Losing NetPnL").abs(), pl.col("Mean Winning NetPnL")),
+            cls.MAXDRAWDOWNVALUE: pl.col("Max Drawdown"),
+            cls.MAXDRAWDOWNPERC: pl.col("Max Drawdown (%)"),
+            cls.MEANDRAWDOWNVALUE: pl.col("Mean Drawdown"),
+            cls.MEANDRAWDOWNPERC: pl.col("Mean Drawdown (%)"),
+            cls.MAXHOLDINGTIME: pl.col("Max Holding"),
+            cls.AVERAGEHOLDINGTIME: pl.col("Mean Holding"),
+            cls.MINHOLDINGTIME: pl.col("Min Holding"),
+            cls.SHARPERATIO: net_return / cls._guarded(pl.col("Annualized Net Volatility")),
+            cls.SORTINORATIO: net_return / cls._guarded(pl.col("Annualized Losing Volatility")),
+            cls.CALMARRATIO: net_return / cls._guarded(pl.col("Max Drawdown (%)")).abs(),
+            cls.FITNESSRATIO: net_return / cls._guarded(pl.col("Mean Drawdown (%)")).abs()
         }
 
-    def calculate_dependent_metrics(self, initial_account: Account, start_timestamp: date, stop_timestamp: date, total_trades_df: pl.DataFrame, buy_metrics_label: str, sell_metrics_label: str, total_metrics_label: str) -> pl.DataFrame:
-        buy_trades_df, sell_trades_df = self.split_buy_sell_trades(total_trades_df)
-        buy_metrics_dict = self.calculate_independent_metrics(initial_account, start_timestamp, stop_timestamp, buy_trades_df)
-        sell_metrics_dict = self.calculate_independent_metrics(initial_account, start_timestamp, stop_timestamp, sell_trades_df)
-        total_metrics_dict = self.calculate_independent_metrics(initial_account, start_timestamp, stop_timestamp, total_trades_df)
-
-        current_winning_streak = current_losing_streak = 0
-        total_winning_streak = total_losing_streak = 0
-        max_winning_streak_index = max_losing_streak_index = 0
-
-        for idx, trade in enumerate(total_trades_df.iter_rows(named=True)):
-            if trade[str(Trade.NetPnL)] > 0:
-                current_winning_streak += 1
-                current_losing_streak = 0
-            else:
-                current_losing_streak += 1
-                current_winning_streak = 0
-
-            if current_winning_streak > total_winning_streak:
-                max_winning_streak_index = idx
-                total_winning_streak = current_winning_streak
-            if current_losing_streak > total_losing_streak:
-                max_losing_streak_index = idx
-                total_losing_streak = current_losing_streak
-
-        winning_streak_df = total_trades_df.slice(offset=max_winning_streak_index - total_winning_streak + 1, length=total_winning_streak)
-        buy_winning_streak_df, sell_winning_streak_df = self.split_buy_sell_trades(winning_streak_df)
-        buy_metrics_dict[self.MAXWINNINGSTREAK] = self.calculate_total_trades(buy_winning_streak_df)
-        sell_metrics_dict[self.MAXWINNINGSTREAK] = self.calculate_total_trades(sell_winning_streak_df)
-        total_metrics_dict[self.MAXWINNINGSTREAK] = self.calculate_total_trades(winning_streak_df)
-
-        losing_streak_df = total_trades_df.slice(offset=max_losing_streak_index - total_losing_streak + 1, length=total_losing_streak)
-        buy_losing_streak_df, sell_losing_streak_df = self.split_buy_sell_trades(losing_streak_df)
-        buy_metrics_dict[self.MAXLOSINGSTREAK] = self.calculate_total_trades(buy_losing_streak_df)
-        sell_metrics_dict[self.MAXLOSINGSTREAK] = self.calculate_total_trades(sell_losing_streak_df)
-        total_metrics_dict[self.MAXLOSINGSTREAK] = self.calculate_total_trades(losing_streak_df)
-
-        buy_metrics_list = [buy_metrics_dict[key] for key in self.Metrics]
-        sell_metrics_list = [sell_metrics_dict[key] for key in self.Metrics]
-        total_metrics_list = [total_metrics_dict[key] for key in self.Metrics]
-
-        return pl.DataFrame(data={buy_metrics_label: buy_metrics_list,
-                                  sell_metrics_label: sell_metrics_list,
-                                  total_metrics_label: total_metrics_list},
-                            strict=False)
+    @classmethod
+    def batch(cls, trades_df: pl.DataFrame, runs_df: pl.DataFrame) -> pl.DataFrame:
+        backtest = cls.BACKTEST_ID_LABEL
+        labels = {("Individual", "Buy"): cls.BUY_METRICS_INDIVIDUAL, ("Individual", "Sell"): cls.SELL_METRICS_INDIVIDUAL, ("Individual", "Total"): cls.TOTAL_METRICS_INDIVIDUAL,
+                  ("Aggregated", "Buy"): cls.BUY_METRICS_AGGREGATED, ("Aggregated", "Sell"): cls.SELL_METRICS_AGGREGATED, ("Aggregated", "Total"): cls.TOTAL_METRICS_AGGREGATED}
+        labels_df = pl.DataFrame({"View": [view for view, _ in labels], "Side": [side for _, side in labels], "Label": list(labels.values())})
+
+        individual_df = trades_df.sort(by=[backtest, "ExitTimestamp"], maintain_order=True)
+        aggregated_df = cls.aggregate_trades(trades_df, backtest).sort(by=[backtest, "ExitTimestamp"], maintain_order=True)
+        stacked_df = pl.concat([cls._streaks(individual_df, "Individual"), cls._streaks(aggregated_df, "Aggregated")], how="vertical_relaxed")
+        sums_df = cls._sums(stacked_df.join(runs_df.select(backtest, cls.INITIAL_BALANCE_LABEL), on=backtest, how="left"))
+
+        counts = ["Trades", "Points", "Pips", "GrossPnL", "CommissionPnL", "SwapPnL", "NetPnL", "Winning Streak", "Losing Streak", *[f"{label} {name}" for label in ("Winning", "Losing") for name in ("Trades", "Points", "Pips", "PnL")]]
+        metrics_df = runs_df.select(backtest, cls.START_TIMESTAMP_LABEL, cls.STOP_TIMESTAMP_LABEL).join(labels_df, how="cross").join(sums_df, on=[backtest, "View", "Side"], how="left").with_columns(
+            pl.col(counts).fill_null(0),
+            (pl.col(cls.STOP_TIMESTAMP_LABEL) - pl.col(cls.START_TIMESTAMP_LABEL)).dt.total_days().alias("Days")
+        ).with_columns(
+            *[expression for label in ("Winning", "Losing") for column in ("NetPnL", "Points", "Pips") for expression in cls._extremes(label, column)],
+            *[expression for label in ("Winning", "Losing", "Net") for expression in cls._returns(label)],
+            *[(cls._ratio(pl.col(f"{label} Trades"), pl.col("Trades")) * 100).alias(f"{label} Rate") for label in ("Winning", "Losing")],
+            *cls._drawdowns(),
+            *[cls._holding_time(f"{statistic} Holding") for statistic in ("Max", "Mean", "Min")]
+        ).with_columns(
+            *[expression for label in ("Winning", "Losing", "Net") for expression in cls._annualized(label)]
+        ).select(backtest, "Label", *[expression.cast(pl.Float64()).alias(name) for name, expression in cls._metrics().items()])
+
+        metrics_df = metrics_df.unpivot(index=[backtest, "Label"], variable_name=cls.STATISTICS_METRICS_LABEL).pivot(on="Label", index=[backtest, cls.STATISTICS_METRICS_LABEL], values="value")
+        order_df = pl.DataFrame({cls.STATISTICS_METRICS_LABEL: cls.Metrics, "Order": list(range(len(cls.Metrics)))})
+        return metrics_df.join(order_df, on=cls.STATISTICS_METRICS_LABEL).sort(backtest, "Order").select(backtest, cls.STATISTICS_METRICS_LABEL, *labels.values())
+
+    @classmethod
+    def split(cls, statistics_df: pl.DataFrame) -> dict[int, pl.DataFrame]:
+        return {backtest: df for (backtest,), df in statistics_df.partition_by(cls.BACKTEST_ID_LABEL, as_dict=True, include_key=False, maintain_order=True).items()}
+
+    @classmethod
+    def summary(cls, trades_df: pl.DataFrame, balance: float, start_timestamp: date, stop_timestamp: date) -> tuple[pl.DataFrame, pl.DataFrame, pl.DataFrame]:
+        runs_df = pl.DataFrame({cls.BACKTEST_ID_LABEL: [0], cls.INITIAL_BALANCE_LABEL: [balance], cls.START_TIMESTAMP_LABEL: [start_timestamp], cls.STOP_TIMESTAMP_LABEL: [stop_timestamp]}, schema_overrides={cls.BACKTEST_ID_LABEL: pl.Int64, cls.INITIAL_BALANCE_LABEL: pl.Float64})
+        metrics_df = cls.batch(trades_df.with_columns(pl.lit(0, dtype=pl.Int64).alias(cls.BACKTEST_ID_LABEL)), runs_df).drop(cls.BACKTEST_ID_LABEL)
+        return cls.sort_trades(trades_df), cls.sort_trades(cls.aggregate_trades(trades_df)), metrics_df
 
     def data(self, initial_account: Account, start_timestamp: date, stop_timestamp: date) -> tuple[pl.DataFrame, pl.DataFrame, pl.DataFrame]:
-        statistical_metrics_df = pl.DataFrame(data=self.Metrics, schema={self.STATISTICS_METRICS_LABEL: pl.String()})
-        individual_df = self.sort_trades(self._data)
-        individual_metrics_df = self.calculate_dependent_metrics(initial_account, start_timestamp, stop_timestamp, individual_df, self.BUY_METRICS_INDIVIDUAL, self.SELL_METRICS_INDIVIDUAL, self.TOTAL_METRICS_INDIVIDUAL)
-        aggregated_df = self.sort_trades(self.aggregate_trades(self._data))
-        aggregated_metrics_df = self.calculate_dependent_metrics(initial_account, start_timestamp, stop_timestamp, aggregated_df, self.BUY_METRICS_AGGREGATED, self.SELL_METRICS_AGGREGATED, self.TOTAL_METRICS_AGGREGATED)
-        return individual_df, aggregated_df, pl.concat([statistical_metrics_df, individual_metrics_df, aggregated_metrics_df], how="horizontal")
+        return self.summary(self._data, initial_account.Balance, start_timestamp, stop_timestamp)
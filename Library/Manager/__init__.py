@@ -1,8 +1,17 @@
 EPSILON = 1e-2
 
-from Library.Manager.Position import PositionAPI
-from Library.Manager.Statistics import StatisticsAPI
-from Library.Manager.Manager import ManagerAPI
+from importlib import import_module
+
+_modules = {
+    "PositionAPI": "Library.Manager.Position",
+    "StatisticsAPI": "Library.Manager.Statistics",
+    "ManagerAPI": "Library.Manager.Manager"
+}
+
+def __getattr__(name: str):
+    if name not in _modules:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    return getattr(import_module(_modules[name]), name)
 
 __all__ = [
     "EPSILON",
@@ -1,23 +1,29 @@
 import copy
 
-from time import localtime
+import numpy as np
+
 from datetime import date, datetime, timedelta
 from itertools import count
-from queue import Queue
-from typing import Type, Iterator, Callable
+from typing import Type, Callable
 
 from Library.Database.Dataframe import pl
 from Library.Classes import *
-from Library.Database import DatabaseAPI
+from Library.Database import DatabaseAPI, CacheAPI
 from Library.Parameters import ParametersAPI, Parameters
 from Library.Utils import timer, equals, datetime_to_string, string_to_datetime
 
 from Library.Utility import *
-from Library.Analyst import AnalystAPI
+from Library.Analyst import AnalystAPI, MarketAPI
 from Library.Manager import ManagerAPI
 from Library.Engine import MachineAPI
 from Library.Strategy import StrategyAPI
 from Library.System import SystemAPI
+from Library.System.Replay import ReplayAPI, FidelityType
+from Library.System.Rate import RateAPI, StreamRateAPI, TapRateAPI, ConversionAPI
+from Library.System.Stream import StreamAPI
+from Library.System.Rollover import RolloverAPI
+from Library.System.Book import BookAPI, TriggerType
+from Library.System.Bus import DequeBusAPI
 
 class BacktestingSystemAPI(SystemAPI):
 
@@ -33,16 +39,22 @@ class BacktestingSystemAPI(SystemAPI):
 
     bar_db: DatabaseAPI | None = None
     bar_df: pl.DataFrame | None = None
+    bar_market: MarketAPI | None = None
+    bar_begin: int = 0
+
+    fidelity: tuple[FidelityType, int | None] | None = None
+    replay_df: dict[tuple[FidelityType, int | None], pl.DataFrame] | None = None
 
     symbol_data: Symbol | None = None
+    symbol_rate: RateAPI | None = None
 
     base_conversion_db: DatabaseAPI | None = None
     base_conversion_df: pl.DataFrame | None = None
-    base_conversion_rate: Callable[[datetime, float], float] | None = None
+    base_conversion_rate: ConversionAPI | None = None
 
     quote_conversion_db: DatabaseAPI | None = None
     quote_conversion_df: pl.DataFrame | None = None
-    quote_conversion_rate: Callable[[datetime, float], float] | None = None
+    quote_conversion_rate: ConversionAPI | None = None
 
     spread: tuple[SpreadType, float] | None = None
     spread_fee: Callable[[datetime, float], float] | None = None
@@ -53,6 +65,7 @@ class BacktestingSystemAPI(SystemAPI):
     swap: tuple[SwapType, float, float] | None = None
     swap_buy_fee: Callable[[datetime, datetime, datetime, float, float], float] | None = None
     swap_sell_fee: Callable[[datetime, datetime, datetime, float, float], float] | None = None
+    rollover: RolloverAPI | None = None
 
     window: int | None = None
     offset: int | None = None
@@ -69,7 +82,10 @@ class BacktestingSystemAPI(SystemAPI):
                  account: tuple[AssetType, float, float],
                  spread: tuple[SpreadType, float],
                  commission: tuple[CommissionType, float],
-                 swap: tuple[SwapType, float, float]) -> None:
+                 swap: tuple[SwapType, float, float],
+                 fidelity: tuple[FidelityType, int | None] = (FidelityType.Tick, None),
+                 chunk: int | None = None,
+                 cache: str | None = None) -> None:
 
         super().__init__(
             broker=broker,
@@ -99,24 +115,22 @@ class BacktestingSystemAPI(SystemAPI):
         self._commission_type, self._commission_value = commission
         self.swap = swap
         self._swap_type, self._swap_buy, self._swap_sell  = swap
+        self.fidelity = fidelity
+        self._fidelity_type, self._fidelity_value = fidelity
+        self.chunk = chunk
+        self.cache = cache
+        self.deferred: bool = False
 
-        self._tick_df_iterator: Iterator | None = None
-        self._tick_data_next: Bar | None = None
-        self._tick_open_next: Tick | None = None
-
-        self._bar_df_iterator: Iterator | None = None
-        self._bar_data_at: Bar | None = None
-        self._bar_data_at_last: Bar | None = None
-        self._bar_data_next: Bar | None = None
+        self._replay: ReplayAPI | None = None
+        self._streams: list[StreamAPI] = []
 
         self._offset: int | None = None
 
-        self._update_id_queue: Queue[UpdateID] | None = None
-        self._update_args_queue: Queue[Account | Symbol | Position | Trade | Bar | Tick] | None = None
+        self._bus: DequeBusAPI | None = None
 
         self._pids: count = count(start=1)
         self._tids: count = count(start=1)
-        self._positions: dict[int, Position] = {}
+        self._book: BookAPI = BookAPI(TradeType.Buy)
         self._ask_above_target: float | None = None
         self._ask_below_target: float | None = None
         self._bid_above_target: float | None = None
@@ -127,7 +141,7 @@ class BacktestingSystemAPI(SystemAPI):
             self.strategy = self._strategy(money_management=self.parameters.MoneyManagement, risk_management=self.parameters.RiskManagement, signal_management=self.parameters.SignalManagement)
 
         if self.analyst is None:
-            self.analyst = AnalystAPI(analyst_management=self.parameters.AnalystManagement)
+            self.analyst = AnalystAPI(analyst_management=self.parameters.AnalystManagement, vectorized=True)
 
         if self.manager is None:
             self.manager = ManagerAPI(manager_management=self.parameters.ManagerManagement)
@@ -151,86 +165,69 @@ class BacktestingSystemAPI(SystemAPI):
             )
         self._account_data: Account = copy.deepcopy(self.account_data)
 
-        if self.tick_df is None:
+        if self.tick_df is None and any(fidelity_type != FidelityType.Bars for fidelity_type, _ in self.fidelities()):
             self.tick_db = DatabaseAPI(broker=self._broker, group=self._group, symbol=self._symbol, timeframe=self.TICK)
             self.tick_db.__enter__()
-            self.tick_df = self.tick_db.pull_market_data(start=self._start_str, stop=self._stop_str, window=None)
-        self._tick_df_iterator = self.tick_df.iter_rows()
-        tick_data_next_row = next(self._tick_df_iterator)
-        self._tick_data_next = Bar(*tick_data_next_row)
-        self._tick_open_next = None
+            if self.chunk is None:
+                self.tick_df = self._market_data(self.tick_db, self._symbol, self.TICK, self._start_date, self._stop_date, None)
 
         if self.bar_df is None:
             self.bar_db = DatabaseAPI(broker=self._broker, group=self._group, symbol=self._symbol, timeframe=self._timeframe)
             self.bar_db.__enter__()
-            self.bar_df = self.bar_db.pull_market_data(start=self._start_str, stop=self._stop_str, window=self.window)
+            self.bar_df = self._market_data(self.bar_db, self._symbol, self._timeframe, self._start_date, self._stop_date, self.window)
             self.offset = self.bar_df.height - self.window + 1
         self._offset = self.offset
-        self._bar_df_iterator = self.bar_df.filter((pl.col(str(Bar.Timestamp)) >= self._start_date) & (pl.col(str(Bar.Timestamp)) <= self._stop_date)).iter_rows()
-        start_bar_data_row = self.bar_df.row(self.window)
-        start_bar_data_index = Bar(*start_bar_data_row)
-        bar_data_at_row = next(self._bar_df_iterator)
-        self._bar_data_at = Bar(*bar_data_at_row)
-        bar_data_next_row = next(self._bar_df_iterator)
-        self._bar_data_next = Bar(*bar_data_next_row)
-        while self._bar_data_at.Timestamp.Timestamp < start_bar_data_index.Timestamp.Timestamp:
-            self._bar_data_at = self._bar_data_next
-            bar_data_next_row = next(self._bar_df_iterator)
-            self._bar_data_next = Bar(*bar_data_next_row)
-        self._bar_data_at_last = Bar(
-            Timestamp=self._bar_data_at.Timestamp,
-            GapPrice=self._bar_data_at.GapPrice,
-            OpenPrice=self._bar_data_at.OpenPrice,
-            HighPrice=self._bar_data_at.OpenPrice,
-            LowPrice=self._bar_data_at.OpenPrice,
-            ClosePrice=self._bar_data_at.OpenPrice,
-            TickVolume=0.0
-        )
+
+        replay_df = self.replay(self.fidelity)
 
         if self.symbol_data is None:
             self.symbol_data: Symbol = self.bar_db.pull_symbol_data()
 
-        if self.base_conversion_df is None or self.base_conversion_rate is None or self.quote_conversion_df is None or self.quote_conversion_rate is None:
-            symbol_rate = lambda timestamp: self.tick_df.filter(pl.col(str(Bar.Timestamp)) <= timestamp.Timestamp).tail(1).select(str(Bar.OpenPrice)).item()
-            base_rate = lambda timestamp: self.base_conversion_df.filter(pl.col(str(Bar.Timestamp)) <= timestamp.Timestamp).tail(1).select(str(Bar.OpenPrice)).item()
-            quote_rate = lambda timestamp: self.quote_conversion_df.filter(pl.col(str(Bar.Timestamp)) <= timestamp.Timestamp).tail(1).select(str(Bar.OpenPrice)).item()
+        if self.symbol_rate is None:
+            if self.tick_df is not None:
+                self.symbol_rate = RateAPI(self.tick_df)
+            elif replay_df is None:
+                self.symbol_rate = TapRateAPI()
+            else:
+                self.symbol_rate = RateAPI(self.bar_df)
 
+        if self.base_conversion_rate is None or self.quote_conversion_rate is None:
             self.base_conversion_db = self.tick_db
             self.base_conversion_df = self.tick_df
-            self.base_conversion_rate = lambda timestamp, spread: 1.0
+            self.base_conversion_rate = ConversionAPI()
 
             self.quote_conversion_db = self.tick_db
             self.quote_conversion_df = self.tick_df
-            self.quote_conversion_rate = lambda timestamp, spread: 1.0
+            self.quote_conversion_rate = ConversionAPI()
 
             if self.account_data.AssetType == self.symbol_data.BaseAssetType:
-                self.quote_conversion_rate = lambda timestamp, spread: 1.0 / (symbol_rate(timestamp) + spread)
+                self.quote_conversion_rate = ConversionAPI(self.symbol_rate, inverse=True)
             elif self.account_data.AssetType == self.symbol_data.QuoteAssetType:
-                self.base_conversion_rate = lambda timestamp, spread: symbol_rate(timestamp)
+                self.base_conversion_rate = ConversionAPI(self.symbol_rate)
             else:
                 if (symbol := f"{self.account_data.AssetType.name}{self.symbol_data.BaseAssetType.name}") in self.SYMBOLS:
                     self.base_conversion_db = DatabaseAPI(broker=self._broker, group=self._group, symbol=symbol, timeframe=self.TICK)
                     self.base_conversion_db.__enter__()
-                    self.base_conversion_df = self.base_conversion_db.pull_market_data(start=self._start_str, stop=self._stop_str, window=None)
-                    self.base_conversion_rate = lambda timestamp, spread: 1.0 / (base_rate(timestamp) + spread)
+                    self.base_conversion_df, base_rate = self._pull_rate(self.base_conversion_db, symbol)
+                    self.base_conversion_rate = ConversionAPI(base_rate, inverse=True)
                 elif (symbol := f"{self.symbol_data.BaseAssetType.name}{self.account_data.AssetType.name}") in self.SYMBOLS:
                     self.base_conversion_db = DatabaseAPI(broker=self._broker, group=self._group, symbol=symbol, timeframe=self.TICK)
                     self.base_conversion_db.__enter__()
-                    self.base_conversion_df = self.base_conversion_db.pull_market_data(start=self._start_str, stop=self._stop_str, window=None)
-                    self.base_conversion_rate = lambda timestamp, spread: base_rate(timestamp)
+                    self.base_conversion_df, base_rate = self._pull_rate(self.base_conversion_db, symbol)
+                    self.base_conversion_rate = ConversionAPI(base_rate)
                 else:
                     self._log.error(lambda: f"Base Asset to Account Asset convertion formula not found")
 
                 if (symbol := f"{self.account_data.AssetType.name}{self.symbol_data.QuoteAssetType.name}") in self.SYMBOLS:
                     self.quote_conversion_db = DatabaseAPI(broker=self._broker, group=self._group, symbol=symbol, timeframe=self.TICK)
                     self.quote_conversion_db.__enter__()
-                    self.quote_conversion_df = self.quote_conversion_db.pull_market_data(start=self._start_str, stop=self._stop_str, window=None)
-                    self.quote_conversion_rate = lambda timestamp, spread: 1.0 / (quote_rate(timestamp) + spread)
+                    self.quote_conversion_df, quote_rate = self._pull_rate(self.quote_conversion_db, symbol)
+                    self.quote_conversion_rate = ConversionAPI(quote_rate, inverse=True)
                 elif (symbol := f"{self.symbol_data.QuoteAssetType.name}{self.account_data.AssetType.name}") in self.SYMBOLS:
                     self.quote_conversion_db = DatabaseAPI(broker=self._broker, group=self._group, symbol=symbol, timeframe=self.TICK)
                     self.quote_conversion_db.__enter__()
-                    self.quote_conversion_df = self.quote_conversion_db.pull_market_data(start=self._start_str, stop=self._stop_str, window=None)
-                    self.quote_conversion_rate = lambda timestamp, spread: quote_rate(timestamp)
+                    self.quote_conversion_df, quote_rate = self._pull_rate(self.quote_conversion_db, symbol)
+                    self.quote_conversion_rate = ConversionAPI(quote_rate)
                 else:
                     self._log.error(lambda: f"Quote Asset to Account Asset convertion formula not found")
 
@@ -271,7 +268,7 @@ class BacktestingSystemAPI(SystemAPI):
 
             def build_commission_fee_percent(percent: float):
                 def fn(timestamp, volume, spread):
-                    notional_quote = volume * symbol_rate(timestamp)
+                    notional_quote = volume * self.symbol_rate.at(timestamp.Timestamp)
                     total_quote = (-percent / 100.0) * notional_quote
                     return total_quote * self.quote_conversion_rate(timestamp=timestamp, spread=spread)
                 return fn
@@ -305,73 +302,36 @@ class BacktestingSystemAPI(SystemAPI):
                         case CommissionMode.QuoteAssetPerOneLot:
                             self.commission_fee = build_commission_fee_ratio(ratio=self.symbol_data.Commission, size=self.symbol_data.LotSize, conversion_rate=self.quote_conversion_rate)
 
-        if self.swap_buy_fee is None or self.swap_sell_fee is None:
-
-            def calculate_overnights(entry_timestamp, exit_timestamp) -> int:
-
-                entry_timestamp = entry_timestamp.Timestamp
-                exit_timestamp = exit_timestamp.Timestamp
-
-                def isdst(timestamp):
-                    return bool(localtime(timestamp.timestamp()).tm_isdst)
-
-                def rollover(at_timestamp: datetime, at_isdst, period=timedelta(hours=self.symbol_data.SwapPeriod)):
-                    to_timestamp = at_timestamp + period
-                    to_isdst = isdst(to_timestamp)
-                    if at_isdst and not to_isdst:
-                        to_timestamp = to_timestamp.replace(hour=self.symbol_data.SwapWinterTime)
-                        return to_timestamp, to_isdst
-                    if not at_isdst and to_isdst:
-                        to_timestamp = to_timestamp.replace(hour=self.symbol_data.SwapSummerTime)
-                        return to_timestamp, to_isdst
-                    return to_timestamp, to_isdst
-
-                if exit_timestamp <= entry_timestamp:
-                    return 0
-
-                rollover_isdst = isdst(entry_timestamp)
-                rollover_timestamp = datetime(
-                    year=entry_timestamp.year,
-                    month=entry_timestamp.month,
-                    day=entry_timestamp.day,
-                    hour=self.symbol_data.SwapSummerTime if rollover_isdst else self.symbol_data.SwapWinterTime,
-                )
+        if self.rollover is None:
+            self.rollover = RolloverAPI(
+                start=(self.tick_df[str(Bar.Timestamp)][0] if self.tick_df is not None else datetime.combine(self._start_date, datetime.min.time())) - timedelta(days=1),
+                stop=(self.tick_df[str(Bar.Timestamp)][-1] if self.tick_df is not None else datetime.combine(self._stop_date, datetime.max.time())) + timedelta(days=1),
+                period=self.symbol_data.SwapPeriod,
+                summer=self.symbol_data.SwapSummerTime,
+                winter=self.symbol_data.SwapWinterTime,
+                extra=self.symbol_data.SwapExtraDay.value
+            )
 
-                while rollover_timestamp < entry_timestamp:
-                    rollover_timestamp, rollover_isdst = rollover(rollover_timestamp, rollover_isdst)
-
-                overnights = 0
-                while rollover_timestamp < exit_timestamp:
-                    mul = 0
-                    match rollover_timestamp.weekday():
-                        case self.symbol_data.SwapExtraDay.value:
-                            mul = 3
-                        case Day.Saturday.value | Day.Sunday.value:
-                            mul = 0
-                        case _:
-                            mul = 1
-                    overnights += mul
-                    rollover_timestamp, rollover_isdst = rollover(rollover_timestamp, rollover_isdst)
-                return overnights
+        if self.swap_buy_fee is None or self.swap_sell_fee is None:
 
             def build_swap_fee_points(points: float):
                 def fn(timestamp, entry_timestamp, exit_timestamp, volume, spread):
-                    overnights = calculate_overnights(entry_timestamp, exit_timestamp)
+                    overnights = self.rollover.overnights(entry_timestamp.Timestamp, exit_timestamp.Timestamp)
                     total_quote = volume * points * self.symbol_data.PointSize * overnights
                     return total_quote * self.quote_conversion_rate(timestamp=timestamp, spread=spread)
                 return fn
 
             def build_swap_fee_pips(pips: float):
                 def fn(timestamp, entry_timestamp, exit_timestamp, volume, spread):
-                    overnights = calculate_overnights(entry_timestamp, exit_timestamp)
+                    overnights = self.rollover.overnights(entry_timestamp.Timestamp, exit_timestamp.Timestamp)
                     total_quote = volume * pips * self.symbol_data.PipSize * overnights
                     return total_quote * self.quote_conversion_rate(timestamp=timestamp, spread=spread)
                 return fn
 
             def build_swap_fee_percent(percent: float, day_count: int = 365):
                 def fn(timestamp, entry_timestamp, exit_timestamp, volume, spread):
-                    overnights = calculate_overnights(entry_timestamp, exit_timestamp)
-                    notional_quote = volume * symbol_rate(timestamp)
+                    overnights = self.rollover.overnights(entry_timestamp.Timestamp, exit_timestamp.Timestamp)
+                    notional_quote = volume * self.symbol_rate.at(timestamp.Timestamp)
                     total_quote = notional_quote * (percent / 100.0) * (overnights / day_count)
                     return total_quote * self.quote_conversion_rate(timestamp=timestamp, spread=spread)
                 return fn
@@ -401,12 +361,32 @@ class BacktestingSystemAPI(SystemAPI):
                             self.swap_buy_fee = build_swap_fee_percent(percent=self.symbol_data.SwapLong)
                             self.swap_sell_fee = build_swap_fee_percent(percent=self.symbol_data.SwapShort)
 
-        self._update_id_queue = Queue()
-        self._update_args_queue = Queue()
+        if replay_df is not None:
+            ticks = [replay_df]
+        else:
+            ticks = self._stream(self.tick_db, self._symbol)
+            if isinstance(self.symbol_rate, TapRateAPI):
+                ticks = self.symbol_rate.tap(ticks)
+            if self._fidelity_type == FidelityType.Seconds:
+                ticks = map(lambda tick_df: ReplayAPI.resample(tick_df, self._fidelity_value), ticks)
+
+        self._replay = ReplayAPI(
+            ticks=ticks,
+            bar_df=self.bar_df.filter((pl.col(str(Bar.Timestamp)) >= self._start_date) & (pl.col(str(Bar.Timestamp)) <= self._stop_date)),
+            bar_start=self.bar_df[str(Bar.Timestamp)][self.window],
+            spread_fee=self.spread_fee,
+            bar_type=Bar,
+            tick_type=Tick
+        )
+
+        self._bus = DequeBusAPI()
 
         return super().__enter__()
 
     def __exit__(self, exc_type, exc_value, exc_traceback):
+        for stream in self._streams:
+            stream.close()
+        self._streams.clear()
         if self.tick_db:
             self.tick_db.__exit__(None, None, None)
         if self.bar_db:
@@ -417,17 +397,67 @@ class BacktestingSystemAPI(SystemAPI):
             self.quote_conversion_db.__exit__(None, None, None)
         return super().__exit__(exc_type, exc_value, exc_traceback)
 
-    def _calculate_ask_bid(self, timestamp: Timestamp, price: Price) -> tuple[float, float]:
-        return price.Price + self.spread_fee(timestamp=timestamp, price=price), price.Price
+    def fidelities(self) -> list[tuple[FidelityType, int | None]]:
+        return [self.fidelity]
+
+    def replay(self, fidelity: tuple[FidelityType, int | None]) -> pl.DataFrame | None:
+        fidelity_type, fidelity_value = fidelity
+        if self.replay_df is None:
+            self.replay_df = {}
+        if self.tick_df is None and fidelity_type != FidelityType.Bars:
+            return None
+        if (replay_df := self.replay_df.get(fidelity)) is None:
+            match fidelity_type:
+                case FidelityType.Tick:
+                    replay_df = self.tick_df
+                case FidelityType.Seconds:
+                    replay_df = ReplayAPI.resample(self.tick_df, fidelity_value)
+                case FidelityType.Bars:
+                    replay_df = ReplayAPI.synthesize(self.bar_df.filter(pl.col(str(Bar.Timestamp)) >= self._start_date))
+            self.replay_df[fidelity] = replay_df
+        return replay_df
+
+    @staticmethod
+    def _watermark(db: DatabaseAPI, start: date, stop: date) -> datetime | None:
+        df = db.select(columns='MAX("UpdatedAt") AS "UpdatedAt"', condition=f'"{Bar.Timestamp}" >= :start: AND "{Bar.Timestamp}" < :stop:', parameters=dict(start=start, stop=stop))
+        return df["UpdatedAt"].item() if df.height else None
+
+    def _market_data(self, db: DatabaseAPI, symbol: str, timeframe: str, start: date, stop: date, window: int | None) -> pl.DataFrame:
+        if self.cache is None:
+            return db.pull_market_data(start=datetime_to_string(start, "%d-%m-%Y"), stop=datetime_to_string(stop, "%d-%m-%Y"), window=window)
+        cache = CacheAPI(
+            path=self.cache,
+            key=(self._broker, self._group, symbol, timeframe),
+            pull=lambda partition_start, partition_stop: db.pull_market_data(start=datetime_to_string(partition_start, "%d-%m-%Y"), stop=datetime_to_string(partition_stop - timedelta(days=1), "%d-%m-%Y"), window=None),
+            watermark=lambda partition_start, partition_stop: self._watermark(db, partition_start, partition_stop),
+            column=str(Bar.Timestamp)
+        )
+        return cache.load(start, stop + timedelta(days=1), window)
+
+    def _stream(self, db: DatabaseAPI, symbol: str) -> StreamAPI:
+        stream = StreamAPI(
+            pull=lambda start, stop: self._market_data(db, symbol, self.TICK, start, stop - timedelta(days=1), None),
+            start=self._start_date,
+            stop=self._stop_date,
+            days=self.chunk
+        )
+        self._streams.append(stream)
+        return stream
+
+    def _pull_rate(self, db: DatabaseAPI, symbol: str) -> tuple[pl.DataFrame | None, RateAPI]:
+        if self.chunk is None:
+            df = self._market_data(db, symbol, self.TICK, self._start_date, self._stop_date, None)
+            return df, RateAPI(df)
+        return None, StreamRateAPI(self._stream(db, symbol))
 
     def _update_position(self, pid: int, position: Position) -> None:
-        self._positions[pid] = position
+        self._book.update(position)
 
     def _delete_position(self, pid: int) -> None:
-        del self._positions[pid]
+        self._book.delete(pid)
 
     def _find_position(self, pid: int) -> Position | None:
-        return self._positions[pid] if pid in self._positions else None
+        return self._book.find(pid)
 
     def _next_pid(self):
         next(self._tids)
@@ -580,17 +610,14 @@ class BacktestingSystemAPI(SystemAPI):
         match action.ActionID:
             case ActionID.OpenBuy:
                 update_id = UpdateID.OpenedBuy
-                position = self._open_buy_position(action.PositionType, action.Volume, action.StopLoss, action.TakeProfit, self._tick_open_next)
+                position = self._open_buy_position(action.PositionType, action.Volume, action.StopLoss, action.TakeProfit, self._replay.next_open())
             case ActionID.OpenSell:
                 update_id = UpdateID.OpenedSell
-                position = self._open_sell_position(action.PositionType, action.Volume, action.StopLoss, action.TakeProfit, self._tick_open_next)
+                position = self._open_sell_position(action.PositionType, action.Volume, action.StopLoss, action.TakeProfit, self._replay.next_open())
 
         self._update_position(position.PositionID, position)
-        self._update_id_queue.put(update_id)
-        self._update_args_queue.put(self._bar_data_at_last)
-        self._update_args_queue.put(self._account_data)
-        self._update_args_queue.put(position)
-        return self._update_id_queue.put(UpdateID.Complete)
+        self._bus.put(update_id, self._replay.running(), self._account_data, position)
+        return self._bus.put(UpdateID.Complete)
 
     def send_action_modify_volume(self, action: ModifyBuyVolumeAction | ModifySellVolumeAction) -> None:
         position: Position = self._find_position(action.PositionID)
@@ -622,13 +649,13 @@ class BacktestingSystemAPI(SystemAPI):
                     self._log.warning(lambda: f"Action Modify Volume: Closing Buy position as Volume is zero")
                     return self.send_action_close(CloseBuyAction(action.PositionID))
                 update_id = UpdateID.ModifiedBuyVolume
-                trade = self._close_buy_position(position, self._tick_open_next)
+                trade = self._close_buy_position(position, self._replay.next_open())
             case ActionID.ModifySellVolume:
                 if equals(action.Volume, 0.0):
                     self._log.warning(lambda: f"Action Modify Volume: Closing Sell position as Volume is zero")
                     return self.send_action_close(CloseSellAction(action.PositionID))
                 update_id = UpdateID.ModifiedSellVolume
-                trade = self._close_sell_position(position, self._tick_open_next)
+                trade = self._close_sell_position(position, self._replay.next_open())
 
         position.Volume = action.Volume
         position.CommissionPnL = initial_commission * remaining_volume_ratio
@@ -636,12 +663,8 @@ class BacktestingSystemAPI(SystemAPI):
         self._account_data.Balance += trade.NetPnL
         self._account_data.Equity += trade.NetPnL
         self._update_position(position.PositionID, position)
-        self._update_id_queue.put(update_id)
-        self._update_args_queue.put(self._bar_data_at_last)
-        self._update_args_queue.put(self._account_data)
-        self._update_args_queue.put(position)
-        self._update_args_queue.put(trade)
-        return self._update_id_queue.put(UpdateID.Complete)
+        self._bus.put(update_id, self._replay.running(), self._account_data, position, trade)
+        return self._bus.put(UpdateID.Complete)
 
     def send_action_modify_stop_loss(self, action: ModifyBuyStopLossAction | ModifySellStopLossAction) -> None:
         position: Position = self._find_position(action.PositionID)
@@ -653,21 +676,18 @@ class BacktestingSystemAPI(SystemAPI):
         update_id: UpdateID | None = None
         match action.ActionID:
             case ActionID.ModifyBuyStopLoss:
-                if action.StopLoss > self._tick_open_next.Bid.Price:
+                if action.StopLoss > self._replay.next_open().Bid.Price:
                     return self._log.error(lambda: f"Action Modify Stop Loss: Invalid Buy Stop Loss above to the Bid Price ({action.StopLoss})")
                 update_id = UpdateID.ModifiedBuyStopLoss
             case ActionID.ModifySellStopLoss:
-                if action.StopLoss < self._tick_open_next.Ask.Price:
+                if action.StopLoss < self._replay.next_open().Ask.Price:
                     return self._log.error(lambda: f"Action Modify Stop Loss: Invalid Sell Stop Loss below the Ask Price ({action.StopLoss})")
                 update_id = UpdateID.ModifiedSellStopLoss
 
         position.StopLoss = action.StopLoss
         self._update_position(position.PositionID, position)
-        self._update_id_queue.put(update_id)
-        self._update_args_queue.put(self._bar_data_at_last)
-        self._update_args_queue.put(self._account_data)
-        self._update_args_queue.put(position)
-        return self._update_id_queue.put(UpdateID.Complete)
+        self._bus.put(update_id, self._replay.running(), self._account_data, position)
+        return self._bus.put(UpdateID.Complete)
 
     def send_action_modify_take_profit(self, action: ModifyBuyTakeProfitAction | ModifySellTakeProfitAction) -> None:
         position: Position = self._find_position(action.PositionID)
@@ -679,21 +699,18 @@ class BacktestingSystemAPI(SystemAPI):
         update_id: UpdateID | None = None
         match action.ActionID:
             case ActionID.ModifyBuyTakeProfit:
-                if action.TakeProfit < self._tick_open_next.Bid.Price:
+                if action.TakeProfit < self._replay.next_open().Bid.Price:
                     return self._log.error(lambda: f"Action Modify Take Profit: Invalid Buy Take Profit below the Bid Price ({action.TakeProfit})")
                 update_id = UpdateID.ModifiedBuyTakeProfit
             case ActionID.ModifySellTakeProfit:
-                if action.TakeProfit > self._tick_open_next.Ask.Price:
+                if action.TakeProfit > self._replay.next_open().Ask.Price:
                     return self._log.error(lambda: f"Action Modify Take Profit: Invalid Sell Take Profit above the Entry Price ({action.TakeProfit})")
                 update_id = UpdateID.ModifiedSellTakeProfit
 
         position.TakeProfit = action.TakeProfit
         self._update_position(position.PositionID, position)
-        self._update_id_queue.put(update_id)
-        self._update_args_queue.put(self._bar_data_at_last)
-        self._update_args_queue.put(self._account_data)
-        self._update_args_queue.put(position)
-        return self._update_id_queue.put(UpdateID.Complete)
+        self._bus.put(update_id, self._replay.running(), self._account_data, position)
+        return self._bus.put(UpdateID.Complete)
 
     def send_action_close(self, action: CloseBuyAction | CloseSellAction, tick: Tick = None) -> None:
         position: Position = self._find_position(action.PositionID)
@@ -705,19 +722,16 @@ class BacktestingSystemAPI(SystemAPI):
         match action.ActionID:
             case ActionID.CloseBuy:
                 update_id = UpdateID.ClosedBuy
-                trade = self._close_buy_position(position, self._tick_open_next if not tick else tick)
+                trade = self._close_buy_position(position, self._replay.next_open() if not tick else tick)
             case ActionID.CloseSell:
                 update_id = UpdateID.ClosedSell
-                trade = self._close_sell_position(position, self._tick_open_next if not tick else tick)
+                trade = self._close_sell_position(position, self._replay.next_open() if not tick else tick)
 
         self._account_data.Balance += trade.NetPnL
         self._account_data.Equity += trade.NetPnL
         self._delete_position(position.PositionID)
-        self._update_id_queue.put(update_id)
-        self._update_args_queue.put(self._bar_data_at_last)
-        self._update_args_queue.put(self._account_data)
-        self._update_args_queue.put(trade)
-        return self._update_id_queue.put(UpdateID.Complete)
+        self._bus.put(update_id, self._replay.running(), self._account_data, trade)
+        return self._bus.put(UpdateID.Complete)
 
     def send_action_ask_above_target(self, action: AskAboveTargetAction) -> None:
         self._ask_above_target = action.Ask
@@ -731,125 +745,73 @@ class BacktestingSystemAPI(SystemAPI):
     def send_action_bid_below_target(self, action: BidBelowTargetAction) -> None:
         self._bid_below_target = action.Bid
 
-    def receive_update_id(self) -> UpdateID:
+    def receive_update(self) -> tuple[UpdateID, tuple]:
+        if self._bus.empty() and not self.fill():
+            return UpdateID.Shutdown, ()
+        return self._bus.get()
 
-        while self._bar_data_next or self._tick_data_next or not self._update_id_queue.empty():
+    def clock(self) -> np.datetime64 | None:
+        return self._replay.peek()
 
-            if not self._update_id_queue.empty():
-                return self._update_id_queue.get()
+    def fill(self, horizon: np.datetime64 | None = None) -> bool:
 
-            if self._bar_data_next and (not self._tick_data_next or self._tick_data_next.Timestamp.Timestamp >= self._bar_data_next.Timestamp.Timestamp):
+        replay = self._replay
+        while self._bus.empty():
 
-                self._update_id_queue.put(UpdateID.BarClosed)
-                self._update_args_queue.put(self._bar_data_at)
-                self._update_id_queue.put(UpdateID.Complete)
+            if not replay.has_bar() and not replay.has_tick():
+                return False
 
-                self._bar_data_at_last = Bar(
-                    Timestamp=self._bar_data_next.Timestamp,
-                    GapPrice=self._bar_data_at.ClosePrice,
-                    OpenPrice=self._bar_data_next.OpenPrice,
-                    HighPrice=self._bar_data_next.OpenPrice,
-                    LowPrice=self._bar_data_next.OpenPrice,
-                    ClosePrice=self._bar_data_next.OpenPrice,
-                    TickVolume=0.0,
-                )
-                self._bar_data_at = self._bar_data_next
-                try:
-                    bar_data_next_row = next(self._bar_df_iterator)
-                    self._bar_data_next = Bar(*bar_data_next_row)
-                except StopIteration:
-                    self._bar_data_next = None
+            if horizon is not None and replay.peek() > horizon:
+                return False
+
+            if replay.is_bar_closed():
+
+                self._bus.put(UpdateID.BarClosed, replay.bar())
+                self._bus.put(UpdateID.Complete)
+
+                replay.close_bar()
                 continue
 
-            if self._tick_data_next:
-
-                high_ask_at, high_bid_at = self._calculate_ask_bid(timestamp=self._tick_data_next.Timestamp, price=self._tick_data_next.HighPrice)
-                low_ask_at, low_bid_at = self._calculate_ask_bid(timestamp=self._tick_data_next.Timestamp, price=self._tick_data_next.LowPrice)
-
-                self._bar_data_at_last.HighPrice = max(self._bar_data_at_last.HighPrice.Price, self._tick_data_next.HighPrice.Price)
-                self._bar_data_at_last.LowPrice = min(self._bar_data_at_last.LowPrice.Price, self._tick_data_next.LowPrice.Price)
-                self._bar_data_at_last.ClosePrice = self._tick_data_next.ClosePrice
-                self._bar_data_at_last.TickVolume += self._tick_data_next.TickVolume
-
-                try:
-                    tick_data_next_row = next(self._tick_df_iterator)
-                    self._tick_data_next = Bar(*tick_data_next_row)
-                    self._tick_open_next = Tick(self._tick_data_next.Timestamp, *self._calculate_ask_bid(timestamp=self._tick_data_next.Timestamp, price=self._tick_data_next.OpenPrice))
-                except StopIteration:
-                    self._tick_data_next = None
-
-                for position_id, position in list(self._positions.items()):
-                    match position.TradeType:
-                        case TradeType.Buy:
-                            if position.StopLoss.Price is not None:
-                                if low_bid_at <= position.StopLoss.Price:
-                                    self.send_action_close(CloseBuyAction(position_id), Tick(self._tick_open_next.Timestamp, low_ask_at, low_bid_at))
-                                    continue
-                                if self._tick_open_next.Bid.Price <= position.StopLoss.Price:
-                                    self.send_action_close(CloseBuyAction(position_id))
-                                    continue
-                            if position.TakeProfit.Price is not None:
-                                if high_bid_at >= position.TakeProfit.Price:
-                                    self.send_action_close(CloseBuyAction(position_id), Tick(self._tick_open_next.Timestamp, high_ask_at, high_bid_at))
-                                    continue
-                                if self._tick_open_next.Bid.Price >= position.TakeProfit.Price:
-                                    self.send_action_close(CloseBuyAction(position_id))
-                                    continue
-                        case TradeType.Sell:
-                            if position.StopLoss.Price is not None:
-                                if high_ask_at >= position.StopLoss.Price:
-                                    self.send_action_close(CloseSellAction(position_id), Tick(self._tick_open_next.Timestamp, high_ask_at, high_bid_at))
-                                    continue
-                                if self._tick_open_next.Ask.Price >= position.StopLoss.Price:
-                                    self.send_action_close(CloseSellAction(position_id))
-                                    continue
-                            if position.TakeProfit.Price is not None:
-                                if low_ask_at <= position.TakeProfit.Price:
-                                    self.send_action_close(CloseSellAction(position_id), Tick(self._tick_open_next.Timestamp, low_ask_at, low_bid_at))
-                                    continue
-                                if self._tick_open_next.Ask.Price <= position.TakeProfit.Price:
-                                    self.send_action_close(CloseSellAction(position_id))
-                                    continue
-
-                if self._ask_above_target is not None and self._tick_open_next.Ask.Price >= self._ask_above_target:
-                    self._update_id_queue.put(UpdateID.AskAboveTarget)
-                    self._update_args_queue.put(self._tick_open_next)
-                    self._update_id_queue.put(UpdateID.Complete)
-
-                if self._ask_below_target is not None and self._tick_open_next.Ask.Price <= self._ask_below_target:
-                    self._update_id_queue.put(UpdateID.AskBelowTarget)
-                    self._update_args_queue.put(self._tick_open_next)
-                    self._update_id_queue.put(UpdateID.Complete)
-
-                if self._bid_above_target is not None and self._tick_open_next.Bid.Price >= self._bid_above_target:
-                    self._update_id_queue.put(UpdateID.BidAboveTarget)
-                    self._update_args_queue.put(self._tick_open_next)
-                    self._update_id_queue.put(UpdateID.Complete)
-
-                if self._bid_below_target is not None and self._tick_open_next.Bid.Price <= self._bid_below_target:
-                    self._update_id_queue.put(UpdateID.BidBelowTarget)
-                    self._update_args_queue.put(self._tick_open_next)
-                    self._update_id_queue.put(UpdateID.Complete)
-
-        return UpdateID.Shutdown
-
-    def receive_update_account(self) -> Account:
-        return self._update_args_queue.get()
-
-    def receive_update_symbol(self) -> Symbol:
-        return self._update_args_queue.get()
-
-    def receive_update_position(self) -> Position:
-        return self._update_args_queue.get()
-
-    def receive_update_trade(self) -> Trade:
-        return self._update_args_queue.get()
-
-    def receive_update_bar(self) -> Bar:
-        return self._update_args_queue.get()
-
-    def receive_update_target(self) -> Tick:
-        return self._update_args_queue.get()
+            if replay.has_tick():
+
+                targets = (self._ask_above_target, self._ask_below_target, self._bid_above_target, self._bid_below_target)
+                armed = self._book or any(target is not None for target in targets)
+                if (index := replay.forward(horizon, (*self._book.levels(), *targets) if armed else None)) is None:
+                    continue
+
+                high_ask_at, high_bid_at = replay.TickHighAsk[index], replay.TickHigh[index]
+                low_ask_at, low_bid_at = replay.TickLowAsk[index], replay.TickLow[index]
+
+                next_index = replay.next_open_index()
+                open_ask_next, open_bid_next = replay.TickOpenAsk[next_index], replay.TickOpen[next_index]
+
+                for position, trigger in self._book.triggered(low_ask_at, low_bid_at, high_ask_at, high_bid_at, open_ask_next, open_bid_next):
+                    action = CloseBuyAction(position.PositionID) if position.TradeType == TradeType.Buy else CloseSellAction(position.PositionID)
+                    match trigger:
+                        case TriggerType.Low:
+                            self.send_action_close(action, replay.tick(next_index, low_ask_at, low_bid_at))
+                        case TriggerType.High:
+                            self.send_action_close(action, replay.tick(next_index, high_ask_at, high_bid_at))
+                        case TriggerType.Open:
+                            self.send_action_close(action)
+
+                if self._ask_above_target is not None and open_ask_next >= self._ask_above_target:
+                    self._bus.put(UpdateID.AskAboveTarget, replay.next_open())
+                    self._bus.put(UpdateID.Complete)
+
+                if self._ask_below_target is not None and open_ask_next <= self._ask_below_target:
+                    self._bus.put(UpdateID.AskBelowTarget, replay.next_open())
+                    self._bus.put(UpdateID.Complete)
+
+                if self._bid_above_target is not None and open_bid_next >= self._bid_above_target:
+                    self._bus.put(UpdateID.BidAboveTarget, replay.next_open())
+                    self._bus.put(UpdateID.Complete)
+
+                if self._bid_below_target is not None and open_bid_next <= self._bid_below_target:
+                    self._bus.put(UpdateID.BidBelowTarget, replay.next_open())
+                    self._bus.put(UpdateID.Complete)
+
+        return True
 
     def system_management(self) -> MachineAPI:
 
@@ -860,7 +822,10 @@ class BacktestingSystemAPI(SystemAPI):
         termination = system_engine.create_state(name="Termination", end=True)
 
         def init_market(update: CompleteUpdate):
-            update.Analyst.init_market_data(self.bar_df)
+            if self.bar_market is not None:
+                update.Analyst.init_market_slice(self.bar_market, self.bar_begin, self.bar_df.height)
+            else:
+                update.Analyst.init_market_data(self.bar_df)
             update.Analyst.update_market_offset(self.offset)
 
         def update_market(update: BarUpdate):
@@ -868,6 +833,9 @@ class BacktestingSystemAPI(SystemAPI):
             update.Analyst.update_market_offset(self._offset)
 
         def update_results(update: CompleteUpdate):
+            if self.deferred:
+                self.individual_trades = update.Manager.Statistics.trades()
+                return
             self.individual_trades, self.aggregated_trades, self.statistics = update.Manager.Statistics.data(self.account_data, self._start_date, self._stop_date)
             self._log.warning(lambda: str(self.individual_trades))
             self._log.warning(lambda: str(self.aggregated_trades))
@@ -881,14 +849,15 @@ class BacktestingSystemAPI(SystemAPI):
 
         return system_engine
 
-    @timer
-    def run(self) -> None:
-        self._update_id_queue.put(UpdateID.Account)
-        self._update_args_queue.put(self.account_data)
+    def prime(self) -> None:
+        self._bus.put(UpdateID.Account, self.account_data)
+
+        self._bus.put(UpdateID.Symbol, self.symbol_data)
 
-        self._update_id_queue.put(UpdateID.Symbol)
-        self._update_args_queue.put(self.symbol_data)
+        self._bus.put(UpdateID.Complete)
 
-        self._update_id_queue.put(UpdateID.Complete)
+    @timer
+    def run(self) -> None:
+        self.prime()
 
         self.deploy(strategy=self.strategy, analyst=self.analyst, manager=self.manager)
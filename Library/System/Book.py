@@ -0,0 +1,91 @@
+from __future__ import annotations
+
+import numpy as np
+
+from enum import Enum
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING: from Library.Classes import Position, TradeType
+
+class TriggerType(Enum):
+    Idle = 0
+    Low = 1
+    High = 2
+    Open = 3
+
+class BookAPI:
+
+    def __init__(self, buy: TradeType, capacity: int = 16) -> None:
+        self._buy: TradeType = buy
+        self.TradeType: np.ndarray = np.zeros(capacity, dtype=np.int8)
+        self.PositionID: np.ndarray = np.zeros(capacity, dtype=np.int64)
+        self.StopLoss: np.ndarray = np.full(capacity, np.nan, dtype=np.float64)
+        self.TakeProfit: np.ndarray = np.full(capacity, np.nan, dtype=np.float64)
+        self.Volume: np.ndarray = np.zeros(capacity, dtype=np.float64)
+        self._positions: list[Position | None] = [None] * capacity
+        self._slots: dict[int, int] = {}
+        self._free: list[int] = list(range(capacity - 1, -1, -1))
+
+    def __len__(self) -> int:
+        return len(self._slots)
+
+    def _grow(self) -> None:
+        capacity = len(self._positions)
+        self.TradeType = np.concatenate((self.TradeType, np.zeros(capacity, dtype=np.int8)))
+        self.PositionID = np.concatenate((self.PositionID, np.zeros(capacity, dtype=np.int64)))
+        self.StopLoss = np.concatenate((self.StopLoss, np.full(capacity, np.nan, dtype=np.float64)))
+        self.TakeProfit = np.concatenate((self.TakeProfit, np.full(capacity, np.nan, dtype=np.float64)))
+        self.Volume = np.concatenate((self.Volume, np.zeros(capacity, dtype=np.float64)))
+        self._positions.extend([None] * capacity)
+        self._free.extend(range(2 * capacity - 1, capacity - 1, -1))
+
+    def update(self, position: Position) -> None:
+        if (slot := self._slots.get(position.PositionID)) is None:
+            if not self._free:
+                self._grow()
+            slot = self._free.pop()
+            self._slots[position.PositionID] = slot
+        self.TradeType[slot] = 1 if position.TradeType == self._buy else -1
+        self.PositionID[slot] = position.PositionID
+        self.StopLoss[slot] = np.nan if position.StopLoss.Price is None else position.StopLoss.Price
+        self.TakeProfit[slot] = np.nan if position.TakeProfit.Price is None else position.TakeProfit.Price
+        self.Volume[slot] = position.Volume
+        self._positions[slot] = position
+
+    def delete(self, pid: int) -> None:
+        slot = self._slots.pop(pid)
+        self.TradeType[slot] = 0
+        self.StopLoss[slot] = np.nan
+        self.TakeProfit[slot] = np.nan
+        self.Volume[slot] = 0.0
+        self._positions[slot] = None
+        self._free.append(slot)
+
+    def find(self, pid: int) -> Position | None:
+        return self._positions[slot] if (slot := self._slots.get(pid)) is not None else None
+
+    def levels(self) -> tuple[float, float, float, float]:
+        buy = self.TradeType == 1
+        sell = self.TradeType == -1
+        return (np.fmax.reduce(np.where(buy, self.StopLoss, np.nan), initial=-np.inf),
+                np.fmin.reduce(np.where(buy, self.TakeProfit, np.nan), initial=np.inf),
+                np.fmin.reduce(np.where(sell, self.StopLoss, np.nan), initial=np.inf),
+                np.fmax.reduce(np.where(sell, self.TakeProfit, np.nan), initial=-np.inf))
+
+    def triggered(self, low_ask: float, low_bid: float, high_ask: float, high_bid: float, open_ask: float, open_bid: float) -> list[tuple[Position, TriggerType]]:
+        if not self._slots:
+            return []
+        buy = self.TradeType == 1
+        sell = self.TradeType == -1
+        triggers = np.select(
+            [buy & (low_bid <= self.StopLoss), buy & (open_bid <= self.StopLoss), buy & (high_bid >= self.TakeProfit), buy & (open_bid >= self.TakeProfit),
+             sell & (high_ask >= self.StopLoss), sell & (open_ask >= self.StopLoss), sell & (low_ask <= self.TakeProfit), sell & (open_ask <= self.TakeProfit)],
+            [TriggerType.Low.value, TriggerType.Open.value, TriggerType.High.value, TriggerType.Open.value,
+             TriggerType.High.value, TriggerType.Open.value, TriggerType.Low.value, TriggerType.Open.value],
+            TriggerType.Idle.value
+        )
+        slots = np.flatnonzero(triggers)
+        if slots.size == 0:
+            return []
+        slots = slots[np.argsort(self.PositionID[slots], kind="stable")]
+        return [(self._positions[slot], TriggerType(triggers[slot])) for slot in slots.tolist()]
@@ -0,0 +1,48 @@
+from abc import ABC, abstractmethod
+from collections import deque
+from queue import SimpleQueue
+from typing import Any
+
+from Library.Utility import *
+
+class BusAPI(ABC):
+
+    @abstractmethod
+    def put(self, update_id: UpdateID, *payload: Any) -> None:
+        raise NotImplementedError
+
+    @abstractmethod
+    def get(self) -> tuple[UpdateID, tuple]:
+        raise NotImplementedError
+
+    @abstractmethod
+    def empty(self) -> bool:
+        raise NotImplementedError
+
+class DequeBusAPI(BusAPI):
+
+    def __init__(self) -> None:
+        self._records: deque[tuple[UpdateID, tuple]] = deque()
+
+    def put(self, update_id: UpdateID, *payload: Any) -> None:
+        self._records.append((update_id, payload))
+
+    def get(self) -> tuple[UpdateID, tuple]:
+        return self._records.popleft()
+
+    def empty(self) -> bool:
+        return not self._records
+
+class QueueBusAPI(BusAPI):
+
+    def __init__(self) -> None:
+        self._records: SimpleQueue[tuple[UpdateID, tuple]] = SimpleQueue()
+
+    def put(self, update_id: UpdateID, *payload: Any) -> None:
+        self._records.put((update_id, payload))
+
+    def get(self) -> tuple[UpdateID, tuple]:
+        return self._records.get()
+
+    def empty(self) -> bool:
+        return self._records.empty()
@@ -0,0 +1,108 @@
+import time
+import threading
+
+from typing import Any, Callable
+from concurrent.futures import Executor, Future
+
+from Library.Database.Queue import QueueAPI
+from Library.Logging.Handler import HandlerLoggingAPI
+
+class CoordinatorAPI(Executor):
+
+    def __init__(self, queue: QueueAPI, poll: float = 0.5, retries: int = 5) -> None:
+        self.Queue: QueueAPI = queue
+        self.Poll: float = poll
+        self.Retries: int = retries
+
+        self._log = HandlerLoggingAPI(self.__class__.__name__)
+        self._lock = threading.Lock()
+        self._pending: dict[str, list[tuple[Future, Callable[[Any], Any]]]] = {}
+        self._error: Exception | None = None
+        self._closed = threading.Event()
+        self._collector = threading.Thread(target=self.collect, daemon=True)
+        self._collector.start()
+
+    def publish(self, task: str, payload: Any, resolve: Callable[[Any], Any]) -> Future:
+        future = Future()
+        with self._lock:
+            if task not in self._pending:
+                self.Queue.publish(task, payload)
+            self._pending.setdefault(task, []).append((future, resolve))
+        return future
+
+    def resolve(self, task: str, result: Any) -> None:
+        with self._lock:
+            waiters = self._pending.pop(task, [])
+        for future, resolve in waiters:
+            if isinstance(result, BaseException):
+                future.set_exception(result)
+            else:
+                future.set_result(resolve(result))
+
+    def fail(self, exception: Exception) -> None:
+        with self._lock:
+            tasks = list(self._pending)
+        for task in tasks:
+            self.resolve(task, exception)
+
+    def collect(self) -> None:
+        failures = 0
+        while not self._closed.wait(self.Poll):
+            with self._lock:
+                tasks = list(self._pending)
+            if not tasks:
+                continue
+            try:
+                results = self.Queue.collect(tasks)
+            except Exception as exception:
+                failures += 1
+                self._error = exception
+                self._log.warning(lambda: f"Collect: Attempt {failures} of {self.Retries} failed ({type(exception).__name__}: {exception})")
+                if failures >= self.Retries:
+                    self.fail(exception)
+                    failures = 0
+                continue
+            failures = 0
+            self._error = None
+            for task, result in results.items():
+                self.resolve(task, result)
+
+    def shutdown(self, wait: bool = True, *, cancel_futures: bool = False) -> None:
+        self._closed.set()
+        if wait:
+            self._collector.join()
+        if cancel_futures:
+            with self._lock:
+                pending, self._pending = self._pending, {}
+            for waiters in pending.values():
+                for future, _ in waiters:
+                    future.cancel()
+        elif self._error is not None:
+            self.fail(self._error)
+        self.Queue.close()
+
+    @staticmethod
+    def serve(queue: QueueAPI, worker: str, run: Callable[[Any], Any], idle: float | None = None, poll: float = 0.5) -> None:
+        last = time.monotonic()
+        while idle is None or time.monotonic() - last < idle:
+            if (task := queue.lease(worker)) is None:
+                time.sleep(poll)
+                continue
+            task_id, payload = task
+            done = threading.Event()
+
+            def renew() -> None:
+                while not done.wait(queue.lease_timeout / 3):
+                    queue.renew(task_id, worker)
+
+            heartbeat = threading.Thread(target=renew, daemon=True)
+            heartbeat.start()
+            try:
+                result = run(payload)
+            except Exception as exception:
+                result = RuntimeError(f"{type(exception).__name__}: {exception}")
+            finally:
+                done.set()
+                heartbeat.join()
+            queue.complete(task_id, worker, result)
+            last = time.monotonic()
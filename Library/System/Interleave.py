@@ -0,0 +1,57 @@
+from __future__ import annotations
+
+import heapq
+import numpy as np
+
+from abc import ABC, abstractmethod
+
+class LegAPI(ABC):
+
+    @abstractmethod
+    def prime(self) -> None:
+        raise NotImplementedError
+
+    @abstractmethod
+    def clock(self) -> np.datetime64 | None:
+        raise NotImplementedError
+
+    @abstractmethod
+    def fill(self, horizon: np.datetime64 | None) -> bool:
+        raise NotImplementedError
+
+    @abstractmethod
+    def step(self) -> None:
+        raise NotImplementedError
+
+    @abstractmethod
+    def is_terminated(self) -> bool:
+        raise NotImplementedError
+
+class InterleaveAPI:
+
+    @staticmethod
+    def drain(leg: LegAPI) -> None:
+        while not leg.is_terminated():
+            leg.step()
+
+    @classmethod
+    def merge(cls, legs: list[LegAPI]) -> None:
+        heap = []
+        for index, leg in enumerate(legs):
+            leg.prime()
+            if (timestamp := leg.clock()) is not None:
+                heap.append((timestamp, index))
+            else:
+                cls.drain(leg)
+        heapq.heapify(heap)
+
+        while heap:
+            _, index = heapq.heappop(heap)
+            leg = legs[index]
+            horizon = heap[0][0] if heap else None
+            while not leg.is_terminated() and leg.fill(horizon):
+                leg.step()
+            if not leg.is_terminated() and (timestamp := leg.clock()) is not None:
+                heapq.heappush(heap, (timestamp, index))
+            else:
+                cls.drain(leg)
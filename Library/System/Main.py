@@ -9,6 +9,7 @@ from Library.Classes import VerboseType, AssetType, SpreadType, CommissionType,
 from Library.Parameters import ParametersAPI, Parameters
 from Library.Utils import timer
 
+from Library.Analyst import IndicatorAPI, IndicatorCacheAPI
 from Library.Manager import StatisticsAPI
 from Library.Strategy import *
 from Library.System import *
@@ -51,17 +52,37 @@ fee_parser.add_argument("--swap-type", type=str, required=True, choices=[_.name
 fee_parser.add_argument("--swap-buy", type=float, required=False, default=None)
 fee_parser.add_argument("--swap-sell", type=float, required=False, default=None)
 
+fidelity_parser = ArgumentParser(add_help=False)
+fidelity_parser.add_argument("--fidelity-type", type=str, required=False, default=FidelityType.Tick.name, choices=[_.name for _ in FidelityType])
+fidelity_parser.add_argument("--fidelity-value", type=int, required=False, default=None)
+fidelity_parser.add_argument("--chunk", type=int, required=False, default=None)
+fidelity_parser.add_argument("--cache", type=str, required=False, default=None)
+
 parser = ArgumentParser()
 system_parser = parser.add_subparsers(dest="system", required=True)
 
-backtesting_parser = system_parser.add_parser(SystemType.Backtesting.name, parents=[base_parser, period_parser, account_parser, fee_parser])
+backtesting_parser = system_parser.add_parser(SystemType.Backtesting.name, parents=[base_parser, period_parser, account_parser, fee_parser, fidelity_parser])
+backtesting_parser.add_argument("--portfolio", type=str, nargs="+", required=False, default=None)
 
-optimization_parser = system_parser.add_parser(SystemType.Optimization.name, parents=[base_parser, period_parser, account_parser, fee_parser])
+optimization_parser = system_parser.add_parser(SystemType.Optimization.name, parents=[base_parser, period_parser, account_parser, fee_parser, fidelity_parser])
 optimization_parser.add_argument("--training", type=int, required=True)
 optimization_parser.add_argument("--validation", type=int, required=True)
 optimization_parser.add_argument("--testing", type=int, required=True)
 optimization_parser.add_argument("--fitness", type=str, required=True, choices=StatisticsAPI.Metrics)
 optimization_parser.add_argument("--threads", type=int, required=False, default=os.cpu_count())
+optimization_parser.add_argument("--fidelity-ladder", type=str, nargs="+", required=False, default=None)
+optimization_parser.add_argument("--executor", type=str, required=False, default=ExecutorType.Thread.name, choices=[_.name for _ in ExecutorType])
+optimization_parser.add_argument("--indicator-cache", type=str, required=False, default=None)
+optimization_parser.add_argument("--sampler", type=str, required=False, default=SamplerType.Grid.name, choices=[_.name for _ in SamplerType])
+optimization_parser.add_argument("--budget", type=int, required=False, default=None)
+optimization_parser.add_argument("--halving", type=float, nargs="+", required=False, default=None)
+optimization_parser.add_argument("--reduction", type=int, required=False, default=3)
+optimization_parser.add_argument("--store", type=str, required=False, default=None)
+optimization_parser.add_argument("--windows", type=int, required=False, default=1)
+optimization_parser.add_argument("--queue", type=str, required=False, default=None)
+optimization_parser.add_argument("--lease", type=float, required=False, default=300.0)
+optimization_parser.add_argument("--worker", action="store_true")
+optimization_parser.add_argument("--idle", type=float, required=False, default=None)
 
 learning_parser = system_parser.add_parser(SystemType.Learning.name, parents=[base_parser, period_parser, account_parser, fee_parser])
 learning_parser.add_argument("--reward", type=str, required=True, choices=StatisticsAPI.Metrics)
@@ -115,9 +136,31 @@ def main():
                 account=(AssetType(AssetType[args.account_asset]), args.account_balance, args.account_leverage),
                 spread=(SpreadType(SpreadType[args.spread_type]), args.spread_value),
                 commission=(CommissionType(CommissionType[args.commission_type]), args.commission_value),
-                swap=(SwapType(SwapType[args.swap_type]), args.swap_buy, args.swap_sell)
+                swap=(SwapType(SwapType[args.swap_type]), args.swap_buy, args.swap_sell),
+                fidelity=(FidelityType(FidelityType[args.fidelity_type]), args.fidelity_value),
+                chunk=args.chunk,
+                cache=args.cache
+            ) if not args.portfolio else PortfolioSystemAPI(
+                broker=args.broker,
+                group=args.group,
+                symbol=args.symbol,
+                timeframe=args.timeframe,
+                strategy=strategy,
+                parameters=params,
+                securities=[(group, symbol, timeframe, parameterise[args.broker][group][symbol][timeframe].Backtesting[args.strategy]) for group, symbol, timeframe in (security.split(":") for security in args.portfolio)],
+                start=args.start,
+                stop=args.stop,
+                account=(AssetType(AssetType[args.account_asset]), args.account_balance, args.account_leverage),
+                spread=(SpreadType(SpreadType[args.spread_type]), args.spread_value),
+                commission=(CommissionType(CommissionType[args.commission_type]), args.commission_value),
+                swap=(SwapType(SwapType[args.swap_type]), args.swap_buy, args.swap_sell),
+                fidelity=(FidelityType(FidelityType[args.fidelity_type]), args.fidelity_value),
+                chunk=args.chunk,
+                cache=args.cache
             )
         case SystemType.Optimization.name:
+            if args.indicator_cache:
+                IndicatorAPI.Cache = IndicatorCacheAPI(path=args.indicator_cache)
             params: Parameters = parameters.Backtesting[args.strategy]
             config: Parameters = parameters.Optimization[args.strategy]
             system = OptimizationSystemAPI(
@@ -138,7 +181,22 @@ def main():
                 validation=args.validation,
                 testing=args.testing,
                 fitness=args.fitness,
-                threads=args.threads
+                threads=args.threads,
+                fidelity=(FidelityType(FidelityType[args.fidelity_type]), args.fidelity_value),
+                ladder=[(FidelityType(FidelityType[fidelity.split("=")[0]]), int(fidelity.split("=")[1]) if "=" in fidelity else None) for fidelity in args.fidelity_ladder] if args.fidelity_ladder else None,
+                chunk=args.chunk,
+                cache=args.cache,
+                executor=ExecutorType(ExecutorType[args.executor]),
+                sampler=SamplerType(SamplerType[args.sampler]),
+                budget=args.budget,
+                halving=args.halving,
+                reduction=args.reduction,
+                store=args.store,
+                windows=args.windows,
+                queue=args.queue,
+                lease=args.lease,
+                worker=args.worker,
+                idle=args.idle
             )
         case SystemType.Learning.name:
             params: Parameters = parameters.Learning[args.strategy]
@@ -1,14 +1,21 @@
+import os
 import copy
+import math
+import socket
 import itertools
 import threading
 
 import numpy as np
 
 from tqdm import tqdm
-from typing import Type, Callable
-from concurrent.futures import as_completed, ThreadPoolExecutor
-
-from datetime import date
+from enum import Enum
+from pathlib import Path
+from urllib.parse import urlsplit
+from typing import Type, Callable, Iterable, Iterator
+from multiprocessing import get_context
+from concurrent.futures import as_completed, wait, FIRST_COMPLETED, Executor, Future, ThreadPoolExecutor, ProcessPoolExecutor
+
+from datetime import date, timedelta
 from dateutil.relativedelta import relativedelta
 
 from Library.Database.Dataframe import pl
@@ -16,10 +23,22 @@ from Library.Classes import *
 from Library.Parameters import Parameters
 from Library.Utils import timer, image, gantt
 
-from Library.Analyst import AnalystAPI, TechnicalsAPI
+from Library.Database import DatabaseAPI, PostgresDatabaseAPI, QueueAPI, SpoolQueueAPI, PostgresQueueAPI
+from Library.Analyst import AnalystAPI, MarketAPI, IndicatorAPI, IndicatorCacheAPI, TechnicalsAPI
 from Library.Manager import ManagerAPI, StatisticsAPI
 from Library.Strategy import StrategyAPI
 from Library.System import BacktestingSystemAPI
+from Library.System.Replay import FidelityType
+from Library.System.Rate import RateAPI, ConversionAPI
+from Library.System.Shared import SharedFrameAPI
+from Library.System.Store import StoreAPI
+from Library.System.Coordinator import CoordinatorAPI
+from Library.System.Sampler import SamplerType, SamplerAPI, GridSamplerAPI, TPESamplerAPI, EvolutionarySamplerAPI
+
+class ExecutorType(Enum):
+    Thread = 0
+    Process = 1
+    Queue = 2
 
 class OptimizationSystemAPI(BacktestingSystemAPI):
 
@@ -34,6 +53,10 @@ class OptimizationSystemAPI(BacktestingSystemAPI):
     DOFSTAGEID = "Degrees-of-Freedom ID"
     CTFSTAGEID = "Coarse-to-Fine ID"
     BACKTESTSTAGEID = "Backtest ID"
+    RUNGSTAGEID = "Successive-Halving ID"
+    PRUNED = "Pruned"
+
+    POLL = 0.5
 
     def __init__(self,
                  broker: str,
@@ -53,7 +76,22 @@ class OptimizationSystemAPI(BacktestingSystemAPI):
                  validation: int,
                  testing: int,
                  fitness: str,
-                 threads: int | None) -> None:
+                 threads: int | None,
+                 fidelity: tuple[FidelityType, int | None] = (FidelityType.Tick, None),
+                 ladder: list[tuple[FidelityType, int | None]] | None = None,
+                 chunk: int | None = None,
+                 cache: str | None = None,
+                 executor: ExecutorType = ExecutorType.Thread,
+                 sampler: SamplerType = SamplerType.Grid,
+                 budget: int | None = None,
+                 halving: list[float] | None = None,
+                 reduction: int = 3,
+                 store: str | None = None,
+                 windows: int = 1,
+                 queue: str | None = None,
+                 lease: float = 300.0,
+                 worker: bool = False,
+                 idle: float | None = None) -> None:
 
         super().__init__(
             broker=broker,
@@ -67,7 +105,10 @@ class OptimizationSystemAPI(BacktestingSystemAPI):
             account=account,
             spread=spread,
             commission=commission,
-            swap=swap
+            swap=swap,
+            fidelity=fidelity,
+            chunk=chunk,
+            cache=cache
         )
 
         self._configuration: Parameters = configuration
@@ -75,6 +116,7 @@ class OptimizationSystemAPI(BacktestingSystemAPI):
         self._validation: int = validation
         self._testing: int = testing
         self._fitness: str = fitness
+        self._ladder: list[tuple[FidelityType, int | None]] = ladder or [fidelity]
 
         self._wf_stages = self.unpack_walk_forward_stages(self._start_date, self._stop_date, self._training, self._validation, self._testing)
 
@@ -92,6 +134,39 @@ class OptimizationSystemAPI(BacktestingSystemAPI):
         self.threads = threads
         self._log.debug(lambda: f"Working with {threads} threads")
 
+        self._executor: ExecutorType = executor
+        self._pool: Executor | None = None
+        self._shared: list[SharedFrameAPI] = []
+
+        self._sampler: SamplerType = sampler
+        self._budget: int | None = budget
+        self._halving: list[float] = sorted(rung for rung in halving or [] if 0.0 < rung < 1.0)
+        self._reduction: int = max(reduction, 2)
+
+        self._store: StoreAPI | None = StoreAPI(store) if store else None
+        self._fingerprint: str | None = None
+
+        self._windows: int = max(windows, 1)
+        self._window = threading.local()
+        self._mute_lock = threading.Lock()
+        self._muted: int = 0
+
+        if (executor == ExecutorType.Queue or worker) and queue is None:
+            raise ValueError("A queue location is required to coordinate or serve optimization workers")
+        self._queue: str | None = queue
+        self._lease: float = lease
+        self._worker: bool = worker
+        self._idle: float | None = idle
+
+    def __exit__(self, exc_type, exc_value, exc_traceback):
+        self.close_pool()
+        if self._store is not None:
+            self._store.flush()
+        return super().__exit__(exc_type, exc_value, exc_traceback)
+
+    def fidelities(self) -> list[tuple[FidelityType, int | None]]:
+        return [self.fidelity, *self._ladder]
+
     @staticmethod
     def unpack_walk_forward_stages(start: date, stop: date, training: int, validation: int, testing: int) -> list[tuple[tuple[date, date] | None, tuple[date, date] | None]]:
         walk_forward = []
@@ -194,6 +269,15 @@ class OptimizationSystemAPI(BacktestingSystemAPI):
                     dof_stage[engine_name][parameter_name] = dof_params[dof_id - 1][engine_name][parameter_name]
         return dof_stage
 
+    @staticmethod
+    def filter_constraints(constraints: Callable, sets: list[np.ndarray]) -> Iterator[tuple]:
+        columns = [column.ravel() for column in np.meshgrid(*sets, indexing="ij")]
+        try:
+            mask = np.broadcast_to(np.asarray(constraints(*columns), dtype=bool), columns[0].shape)
+        except (ValueError, TypeError):
+            mask = np.fromiter((bool(constraints(*combo)) for combo in zip(*columns)), dtype=bool, count=columns[0].size)
+        return zip(*(column[mask].tolist() for column in columns))
+
     @staticmethod
     def unpack_coarse_to_fine_parameters(dof_stage: dict, ctf_params: list[Parameters]) -> dict | None:
         ctf_runs = len(ctf_params)
@@ -220,8 +304,7 @@ class OptimizationSystemAPI(BacktestingSystemAPI):
                         start, stop, step = trange[ctf_runs]
                         sets.append(np.arange(plast + start, plast + stop + step, step))
                 
-                valid_combos = filter(lambda combo: tconstraints(*combo), itertools.product(*sets))
-                return True, [[tid, *combo] for combo in valid_combos]        
+                return True, [[tid, *combo] for combo in OptimizationSystemAPI.filter_constraints(tconstraints, sets)]
 
             tune = False
             parameters = {}
@@ -273,78 +356,374 @@ class OptimizationSystemAPI(BacktestingSystemAPI):
         return dof_stage        
 
     @staticmethod
-    def unpack_coarse_to_fine_backtests(ctf_stage: dict) -> list[dict]:
-        def unpack_selected(engine_name: str, engine_parameters: dict):
-            selected_parameters = {}
-            for parameter_name, parameter_value in (engine_parameters or {}).items():
+    def unpack_coarse_to_fine_space(ctf_stage: dict) -> tuple[dict, list[tuple[str, str]], list[list]]:
+        template = copy.deepcopy(ctf_stage)
+        selected = []
+        space = []
+        for engine_name in ["MoneyManagement", "RiskManagement", "SignalManagement", "AnalystManagement", "ManagerManagement"]:
+            for parameter_name, parameter_value in (ctf_stage[engine_name] or {}).items():
                 if isinstance(parameter_value, list) and isinstance(parameter_value[0], list):
-                    selected_parameters[(engine_name, parameter_name)] = parameter_value
+                    selected.append((engine_name, parameter_name))
+                    space.append(parameter_value)
                     template[engine_name][parameter_name] = None
-            return selected_parameters
-        def unpack_parameters(selected_parameters: dict):
-            backtests = []
-            for combo in itertools.product(*selected_parameters.values()):
-                backtest = copy.deepcopy(template)
-                for (engine_name, parameter_name), parameter_value in itertools.chain(zip(selected_parameters, combo)):
-                    backtest[engine_name][parameter_name] = parameter_value
-                backtests.append(backtest)
-            return backtests
-
-        template = copy.deepcopy(ctf_stage)
-        return unpack_parameters({**unpack_selected("MoneyManagement", ctf_stage["MoneyManagement"]),
-                                  **unpack_selected("RiskManagement", ctf_stage["RiskManagement"]),
-                                  **unpack_selected("SignalManagement", ctf_stage["SignalManagement"]),
-                                  **unpack_selected("AnalystManagement", ctf_stage["AnalystManagement"]),
-                                  **unpack_selected("ManagerManagement", ctf_stage["ManagerManagement"])})
+        return template, selected, space
 
-    def run_backtest_stage(self, parameters: Parameters, start: date, stop: date) -> tuple[int, BacktestingSystemAPI]:
+    @staticmethod
+    def pack_coarse_to_fine_backtest(template: dict, selected: list[tuple[str, str]], combo: list) -> dict:
+        backtest = {engine_name: dict(engine_parameters) if engine_parameters else engine_parameters for engine_name, engine_parameters in template.items()}
+        for (engine_name, parameter_name), parameter_value in zip(selected, combo):
+            backtest[engine_name][parameter_name] = parameter_value
+        return backtest
 
+    @staticmethod
+    def unpack_coarse_to_fine_backtests(ctf_stage: dict) -> Iterator[dict]:
+        template, selected, space = OptimizationSystemAPI.unpack_coarse_to_fine_space(ctf_stage)
+        return (OptimizationSystemAPI.pack_coarse_to_fine_backtest(template, selected, combo) for combo in itertools.product(*space))
+
+    def open_sampler(self, space: list[list]) -> SamplerAPI:
+        match self._sampler:
+            case SamplerType.TPE:
+                return TPESamplerAPI(space, budget=self._budget, batch=self.threads or os.cpu_count())
+            case SamplerType.Evolutionary:
+                return EvolutionarySamplerAPI(space, budget=self._budget, batch=self.threads or os.cpu_count())
+            case _:
+                return GridSamplerAPI(space, budget=self._budget)
+
+    def next_btid(self) -> int:
         with self._btid_lock:
             self._btid += 1
-            btid = self._btid
+            return self._btid
 
-        thread = BacktestingSystemAPI(
+    def backtest_arguments(self, start: date, stop: date, fidelity: tuple[FidelityType, int | None]) -> dict:
+        return dict(
             broker=self._broker,
             group=self._group,
             symbol=self._symbol,
             timeframe=self._timeframe,
             strategy=self._strategy,
-            parameters=parameters,
             start=start,
             stop=stop,
             account=self.account,
             spread=self.spread,
             commission=self.commission,
-            swap=self.swap
+            swap=self.swap,
+            fidelity=fidelity,
+            chunk=self.chunk,
+            cache=self.cache
+        )
+
+    def backtest_environment(self) -> dict:
+        if self._fingerprint is None:
+            self._fingerprint = IndicatorCacheAPI.fingerprint(self.bar_df)
+        return dict(
+            strategy=self._strategy.__name__,
+            broker=self._broker,
+            group=self._group,
+            symbol=self._symbol,
+            timeframe=self._timeframe,
+            account=self.account,
+            spread=self.spread,
+            commission=self.commission,
+            swap=self.swap,
+            data=self._fingerprint
+        )
+
+    def backtest_key(self, parameters: Parameters, start: date, stop: date, fidelity: tuple[FidelityType, int | None]) -> str:
+        return StoreAPI.key(parameters=parameters.data, start=start, stop=stop, fidelity=fidelity, **self.backtest_environment())
+
+    @staticmethod
+    def open_market(bar_df: pl.DataFrame) -> MarketAPI:
+        market = MarketAPI()
+        market.init_data(DatabaseAPI.format_market_data(bar_df))
+        market.fingerprint()
+        return market
+
+    @staticmethod
+    def slice_market_data(bar_df: pl.DataFrame, window: int, start: date, stop: date) -> tuple[int, pl.DataFrame, int]:
+        first = bar_df.select((pl.col(str(Bar.Timestamp)) < start).sum()).item()
+        last = bar_df.select((pl.col(str(Bar.Timestamp)) <= stop).sum()).item()
+        begin = max(first - window, 0)
+        df = bar_df.slice(begin, last - begin)
+        return begin, df, df.height - window + 1
+
+    def store_backtest(self, key: str, statistics: pl.DataFrame | None, parameters: Parameters, start: date, stop: date) -> None:
+        if self._store is not None and statistics is not None:
+            self._store.put(key, statistics, self._strategy.__name__, start, stop, parameters.data)
+
+    def open_queue(self) -> QueueAPI:
+        namespace = StoreAPI.key(**self.backtest_environment())
+        if self._queue.startswith(("postgres://", "postgresql://")):
+            location = urlsplit(self._queue)
+            database = PostgresDatabaseAPI(host=location.hostname or "localhost", port=location.port or 5432, user=location.username or "postgres", password=location.password or "postgres", database=location.path.lstrip("/") or None)
+            database.connect()
+            return PostgresQueueAPI(database=database, namespace=namespace, lease=self._lease)
+        return SpoolQueueAPI(path=self._queue, namespace=namespace, lease=self._lease)
+
+    def open_pool(self) -> Executor:
+        if self.bar_market is None:
+            self.bar_market = self.open_market(self.bar_df)
+
+        if self._executor == ExecutorType.Thread:
+            return ThreadPoolExecutor(max_workers=self.threads)
+
+        if self._executor == ExecutorType.Queue:
+            return CoordinatorAPI(self.open_queue(), self.POLL)
+
+        def publish(df: pl.DataFrame | None, published: dict[int, SharedFrameAPI]) -> SharedFrameAPI | None:
+            if df is None:
+                return None
+            if id(df) not in published:
+                published[id(df)] = SharedFrameAPI.publish(df)
+                self._shared.append(published[id(df)])
+            return published[id(df)]
+
+        published: dict[int, SharedFrameAPI] = {}
+        frames = {}
+        replay = {}
+        state = dict(symbol_data=self.symbol_data, rollover=self.rollover, window=self.window, offset=self.offset, base_conversion=None, quote_conversion=None, indicator_cache=None)
+        if IndicatorAPI.Cache is not None:
+            state["indicator_cache"] = (IndicatorAPI.Cache.Capacity, IndicatorAPI.Cache.Path)
+        frames["bar_df"] = publish(self.bar_df, published)
+        if self.chunk is None:
+            frames["tick_df"] = publish(self.tick_df, published)
+            frames["base_conversion_df"] = publish(self.base_conversion_df, published)
+            frames["quote_conversion_df"] = publish(self.quote_conversion_df, published)
+            for fidelity in set(self.fidelities()):
+                replay[fidelity] = publish(self.replay(fidelity), published)
+            state["base_conversion"] = (self.base_conversion_rate.Rate is not None, self.base_conversion_rate.Inverse)
+            state["quote_conversion"] = (self.quote_conversion_rate.Rate is not None, self.quote_conversion_rate.Inverse)
+
+        return ProcessPoolExecutor(
+            max_workers=self.threads,
+            mp_context=get_context("spawn"),
+            initializer=self.attach_backtest_worker,
+            initargs=({name: frame for name, frame in frames.items() if frame is not None}, {fidelity: frame for fidelity, frame in replay.items() if frame is not None}, state)
         )
 
+    def close_pool(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+        for shared in self._shared:
+            shared.unlink()
+        self._shared = []
+
+    @staticmethod
+    def attach_backtest_worker(frames: dict[str, SharedFrameAPI], replay: dict[tuple[FidelityType, int | None], SharedFrameAPI], state: dict) -> None:
+        for name, frame in frames.items():
+            setattr(BacktestingSystemAPI, name, frame.attach())
+        BacktestingSystemAPI.replay_df = {fidelity: frame.attach() for fidelity, frame in replay.items()}
+        BacktestingSystemAPI.symbol_data = state["symbol_data"]
+        BacktestingSystemAPI.rollover = state["rollover"]
+        BacktestingSystemAPI.window = state["window"]
+        BacktestingSystemAPI.offset = state["offset"]
+        BacktestingSystemAPI.bar_market = OptimizationSystemAPI.open_market(BacktestingSystemAPI.bar_df)
+        IndicatorAPI.Cache = IndicatorCacheAPI(*state["indicator_cache"]) if state["indicator_cache"] is not None else None
+        if BacktestingSystemAPI.tick_df is not None:
+            BacktestingSystemAPI.symbol_rate = RateAPI(BacktestingSystemAPI.tick_df)
+        if state["base_conversion"] is not None:
+            base_rate, base_inverse = state["base_conversion"]
+            BacktestingSystemAPI.base_conversion_rate = ConversionAPI(RateAPI(BacktestingSystemAPI.base_conversion_df) if base_rate else None, base_inverse)
+        if state["quote_conversion"] is not None:
+            quote_rate, quote_inverse = state["quote_conversion"]
+            BacktestingSystemAPI.quote_conversion_rate = ConversionAPI(RateAPI(BacktestingSystemAPI.quote_conversion_df) if quote_rate else None, quote_inverse)
+
+    @staticmethod
+    def run_backtest_worker(btid: int, arguments: dict, data: dict, path: Path, deferred: bool = False) -> tuple[int, pl.DataFrame | None, pl.DataFrame | None]:
+        process = BacktestingSystemAPI(parameters=Parameters(data=data, path=path), **arguments)
+        process.deferred = deferred
+        process.bar_begin, process.bar_df, process.offset = OptimizationSystemAPI.slice_market_data(process.bar_df, process.window, arguments["start"], arguments["stop"])
+        process._log.level(VerboseType.Exception)
+
+        with process:
+            process.start()
+            process.join()
+
+        return btid, process.statistics, process.individual_trades if deferred else None
+
+    def submit_backtest_stage(self, parameters: Parameters, start: date, stop: date, fidelity: tuple[FidelityType, int | None], deferred: bool = False) -> Future:
+        if self._executor == ExecutorType.Thread:
+            return self._pool.submit(self.run_backtest_stage, parameters, start, stop, fidelity, deferred)
+        key = self.backtest_key(parameters, start, stop, fidelity) if self._store is not None or self._executor == ExecutorType.Queue else None
+        if self._store is not None and (statistics := self._store.get(key)) is not None:
+            future = Future()
+            future.set_result((self.next_btid(), statistics, None))
+            return future
+        if self._executor == ExecutorType.Queue:
+            future = self.publish_backtest_stage(key, parameters, start, stop, fidelity, deferred)
+        else:
+            future = self._pool.submit(self.run_backtest_worker, self.next_btid(), self.backtest_arguments(start, stop, fidelity), parameters.data, parameters.path, deferred)
+        if self._store is not None and not deferred:
+            def store(done: Future) -> None:
+                if done.exception() is None:
+                    self.store_backtest(key, done.result()[1], parameters, start, stop)
+            future.add_done_callback(store)
+        return future
+
+    def publish_backtest_stage(self, key: str, parameters: Parameters, start: date, stop: date, fidelity: tuple[FidelityType, int | None], deferred: bool = False) -> Future:
+        btid = self.next_btid()
+        payload = dict(parameters=parameters.data, path=parameters.path, start=start, stop=stop, fidelity=fidelity, deferred=deferred)
+        return self._pool.publish(f"{key}-{int(deferred)}", payload, lambda result: (btid, *result))
+
+    def serve_backtest_stages(self, queue: QueueAPI, worker: str) -> None:
+        def run(payload: dict) -> tuple[pl.DataFrame | None, pl.DataFrame | None]:
+            _, statistics, trades = self.run_backtest_stage(Parameters(data=payload["parameters"], path=payload["path"]), payload["start"], payload["stop"], payload["fidelity"], payload["deferred"])
+            return statistics, trades
+        CoordinatorAPI.serve(queue, worker, run, self._idle, self.POLL)
+
+    def serve(self) -> None:
+        if self.bar_market is None:
+            self.bar_market = self.open_market(self.bar_df)
+
+        queue = self.open_queue()
+        self._log.console.info(lambda: f"Serving {queue.namespace} on {self._queue} with {self.threads} threads")
+
+        self.mute()
+        with ThreadPoolExecutor(max_workers=self.threads) as pool:
+            futures = [pool.submit(self.serve_backtest_stages, queue, f"{socket.gethostname()}-{os.getpid()}-{index}") for index in range(self.threads)]
+            for future in futures:
+                future.result()
+        self.unmute()
+
+        queue.close()
+
+    def run_backtest_stage(self, parameters: Parameters, start: date, stop: date, fidelity: tuple[FidelityType, int | None], deferred: bool = False) -> tuple[int, pl.DataFrame | None, pl.DataFrame | None]:
+
+        btid = self.next_btid()
+
+        key = self.backtest_key(parameters, start, stop, fidelity) if self._store is not None else None
+        if key is not None and (statistics := self._store.get(key)) is not None:
+            return btid, statistics, None
+
+        thread = BacktestingSystemAPI(parameters=parameters, **self.backtest_arguments(start, stop, fidelity))
+        thread.deferred = deferred
+
         thread.strategy = self._strategy(money_management=parameters.MoneyManagement, risk_management=parameters.RiskManagement, signal_management=parameters.SignalManagement)
-        thread.analyst = AnalystAPI(analyst_management=parameters.AnalystManagement)
+        thread.analyst = AnalystAPI(analyst_management=parameters.AnalystManagement, vectorized=True)
         thread.manager = ManagerAPI(manager_management=parameters.ManagerManagement)
 
-        thread.tick_df = self.tick_df
-        thread.bar_df = self.bar_df
+        if self.chunk is None:
+            thread.tick_df = self.tick_df
+            thread.replay_df = self.replay_df
+            thread.symbol_rate = self.symbol_rate
+            thread.base_conversion_df = self.base_conversion_df
+            thread.base_conversion_rate = self.base_conversion_rate
+            thread.quote_conversion_df = self.quote_conversion_df
+            thread.quote_conversion_rate = self.quote_conversion_rate
+            thread.commission_fee = self.commission_fee
+            thread.swap_buy_fee = self.swap_buy_fee
+            thread.swap_sell_fee = self.swap_sell_fee
+        thread.bar_market = self.bar_market
+        thread.bar_begin, thread.bar_df, thread.offset = self.slice_market_data(self.bar_df, self.window, start, stop)
         thread.symbol_data = self.symbol_data
-        thread.base_conversion_df = self.base_conversion_df
-        thread.base_conversion_rate = self.base_conversion_rate
-        thread.quote_conversion_df = self.quote_conversion_df
-        thread.quote_conversion_rate = self.quote_conversion_rate
         thread.spread_fee = self.spread_fee
-        thread.commission_fee = self.commission_fee
-        thread.swap_buy_fee = self.swap_buy_fee
-        thread.swap_sell_fee = self.swap_sell_fee
+        thread.rollover = self.rollover
         thread.window = self.window
-        thread.offset = self.offset
 
         with thread:
             thread.start()
             thread.join()
 
-        return btid, thread
+        if key is not None:
+            self.store_backtest(key, thread.statistics, parameters, start, stop)
+
+        return btid, thread.statistics, thread.individual_trades if deferred else None
+
+    def mute(self) -> None:
+        with self._mute_lock:
+            self._muted += 1
+            if self._muted == 1:
+                self._log.level(VerboseType.Exception)
+
+    def unmute(self) -> None:
+        with self._mute_lock:
+            self._muted -= 1
+            if self._muted == 0:
+                self._log.reset()
+
+    def defer(self, log: Callable, content: Callable) -> None:
+        logs = getattr(self._window, "logs", None)
+        if logs is None:
+            log(content)
+        else:
+            logs.append((log, content))
+
+    def log_stage(self, stage: str, stage_id: int, df: pl.DataFrame, head: int | None = None) -> None:
+        self.defer(self._log.console.info, lambda: f"Completed {stage} ID={stage_id} with {df}")
+        self.defer(self._log.telegram.info, lambda: f"Completed {stage} ID={stage_id}")
+        self.defer(self._log.telegram.info, lambda: image(df.head(head) if head else df))
+        self.defer(self._log.file.info, lambda: f"Completed {stage} ID={stage_id} with {df}")
+
+    def evaluate_fitness(self, statistics: pl.DataFrame) -> float | None:
+        return statistics.filter(pl.col(StatisticsAPI.STATISTICS_METRICS_LABEL) == self._fitness)[StatisticsAPI.TOTAL_METRICS_AGGREGATED].item()
+
+    def stream_backtest_stage(self, combos: Iterable[tuple[int, ...]], build: Callable[[tuple[int, ...]], Parameters], start: date, stop: date, fidelity: tuple[FidelityType, int | None]) -> Iterator[tuple[tuple[int, ...], Parameters, int, pl.DataFrame]]:
+        combos = iter(combos)
+        pending: dict[Future, tuple[tuple[int, ...], Parameters]] = {}
+
+        deferred: list[tuple[tuple[int, ...], Parameters, int, pl.DataFrame]] = []
+        workers = self.threads or os.cpu_count()
+
+        def submit(count: int) -> None:
+            for combo in itertools.islice(combos, count):
+                candidate = build(combo)
+                pending[self.submit_backtest_stage(candidate, start, stop, fidelity, deferred=True)] = (combo, candidate)
+
+        def evaluate() -> Iterator[tuple[tuple[int, ...], Parameters, int, pl.DataFrame]]:
+            trades_df = pl.concat([trades.with_columns(pl.lit(btid).alias(StatisticsAPI.BACKTEST_ID_LABEL)) for _, _, btid, trades in deferred], how="vertical_relaxed")
+            runs_df = pl.DataFrame({
+                StatisticsAPI.BACKTEST_ID_LABEL: [btid for _, _, btid, _ in deferred],
+                StatisticsAPI.INITIAL_BALANCE_LABEL: [self.account_data.Balance] * len(deferred),
+                StatisticsAPI.START_TIMESTAMP_LABEL: [start] * len(deferred),
+                StatisticsAPI.STOP_TIMESTAMP_LABEL: [stop] * len(deferred)
+            }, schema_overrides={StatisticsAPI.BACKTEST_ID_LABEL: trades_df.schema[StatisticsAPI.BACKTEST_ID_LABEL]})
+            statistics = StatisticsAPI.split(StatisticsAPI.batch(trades_df, runs_df))
+            for combo, candidate, btid, _ in deferred:
+                if self._store is not None:
+                    self.store_backtest(self.backtest_key(candidate, start, stop, fidelity), statistics[btid], candidate, start, stop)
+                yield combo, candidate, btid, statistics[btid]
+            deferred.clear()
+
+        submit(2 * workers)
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                combo, candidate = pending.pop(future)
+                btid, statistics, trades = future.result()
+                if trades is None:
+                    yield combo, candidate, btid, statistics
+                else:
+                    deferred.append((combo, candidate, btid, trades))
+            submit(len(done))
+            if deferred and (len(deferred) >= workers or not pending):
+                yield from evaluate()
+
+    def run_successive_halving_stage(self, batch: list[tuple[int, ...]], build: Callable[[tuple[int, ...]], Parameters], start: date, stop: date, fidelity: tuple[FidelityType, int | None]) -> Iterator[tuple[tuple[int, ...], Parameters, int, float | None, int, bool]]:
+        survivors = batch
+        for rung_id, rung in enumerate([*self._halving, 1.0], start=1):
+            rung_stop = stop if rung >= 1.0 else start + timedelta(days=max(1, round((stop - start).days * rung)))
+
+            if rung >= 1.0:
+                for combo, candidate, btid, statistics in self.stream_backtest_stage(survivors, build, start, rung_stop, fidelity):
+                    yield combo, candidate, btid, self.evaluate_fitness(statistics), rung_id, False
+                return
+
+            scored = {}
+            for combo, _, btid, statistics in self.stream_backtest_stage(survivors, build, start, rung_stop, fidelity):
+                scored[combo] = (btid, self.evaluate_fitness(statistics))
+
+            ranked = sorted(survivors, key=lambda combo: scored[combo][1] if scored[combo][1] is not None else float("-inf"), reverse=True)
+            survivors = ranked[:math.ceil(len(ranked) / self._reduction)]
+            for combo in ranked[len(survivors):]:
+                yield combo, build(combo), *scored[combo], rung_id, True
 
-    def run_coarse_to_fine_stage(self, stage: dict, start: date, stop: date) -> tuple[int, float, Parameters, pl.DataFrame]:
+    def run_coarse_to_fine_stage(self, stage: dict, start: date, stop: date, fidelity: tuple[FidelityType, int | None]) -> tuple[int, float, Parameters, pl.DataFrame]:
 
-        parameters = self.unpack_coarse_to_fine_backtests(stage)
+        template, selected, space = self.unpack_coarse_to_fine_space(stage)
+        sampler = self.open_sampler(space)
+
+        def build(combo: tuple[int, ...]) -> Parameters:
+            return Parameters(data=self.pack_coarse_to_fine_backtest(template, selected, sampler.choices(combo)), path=self.parameters.path)
 
         results: list[dict] = []
 
@@ -352,39 +731,50 @@ class OptimizationSystemAPI(BacktestingSystemAPI):
         best_fitness: float = float("-inf")
         best_parameters: Parameters | None = None
 
-        self._log.level(VerboseType.Exception)
+        self.mute()
 
-        with ThreadPoolExecutor(max_workers=self.threads) as executor:
+        if self._pool is None:
+            self._pool = self.open_pool()
 
-            futures = [executor.submit(self.run_backtest_stage, Parameters(data=params, path=self.parameters.path), start, stop) for params in parameters]
+        if IndicatorAPI.Cache is not None:
+            IndicatorAPI.Cache.reset()
 
-            with tqdm(total=len(futures), desc="Progress", unit=" Backtest") as progress:
-                for future in as_completed(futures):
-                    btid, backtest = future.result()
-                    fitness = backtest.statistics.filter(pl.col(StatisticsAPI.STATISTICS_METRICS_LABEL) == self._fitness)[StatisticsAPI.TOTAL_METRICS_AGGREGATED].item()
+        with tqdm(total=sampler.Budget, desc="Progress", unit=" Backtest", position=getattr(self._window, "position", None), leave=self._windows == 1) as progress:
+            while batch := sampler.suggest():
+                for combo, candidate, btid, fitness, rung_id, pruned in self.run_successive_halving_stage(batch, build, start, stop, fidelity):
+                    sampler.observe(combo, None if pruned else fitness)
 
                     results.append({
                         self.BACKTESTSTAGEID: btid,
+                        self.RUNGSTAGEID: rung_id,
+                        self.PRUNED: pruned,
                         self._fitness: fitness,
-                        **backtest.parameters.MoneyManagement,
-                        **backtest.parameters.RiskManagement,
-                        **backtest.parameters.SignalManagement,
-                        **backtest.parameters.AnalystManagement,
-                        **backtest.parameters.ManagerManagement
+                        **candidate.MoneyManagement,
+                        **candidate.RiskManagement,
+                        **candidate.SignalManagement,
+                        **candidate.AnalystManagement,
+                        **candidate.ManagerManagement
                     })
-    
-                    if fitness is not None and fitness > best_fitness:
+
+                    if not pruned and fitness is not None and fitness > best_fitness:
                         best_id = btid
                         best_fitness = fitness
-                        best_parameters = backtest.parameters
-                        progress.set_postfix({"Best Fitness": f"{best_fitness:.6f}", "Best Parameters": list(backtest.parameters.AnalystManagement.values())})
+                        best_parameters = candidate
+                        progress.set_postfix({"Best Fitness": f"{best_fitness:.6f}", "Best Parameters": list(candidate.AnalystManagement.values())})
 
                     progress.update(1)
 
-        self._log.reset()
+        self.unmute()
+
+        if self._store is not None:
+            self._store.flush()
+
+        if IndicatorAPI.Cache is not None and self._executor == ExecutorType.Thread:
+            cache = IndicatorAPI.Cache.statistics()
+            self.defer(self._log.console.info, lambda: f"Indicator Cache: {cache['Hits']} hits, {cache['Misses']} misses, {cache['Entries']} entries, {cache['Size']} bytes")
 
         df = pl.DataFrame(results, strict=False)
-        df = df.sort(by=self._fitness, descending=True, nulls_last=True)
+        df = df.sort(by=[self.PRUNED, self._fitness], descending=[False, True], nulls_last=True)
 
         return best_id, best_fitness, best_parameters, df
 
@@ -401,7 +791,8 @@ class OptimizationSystemAPI(BacktestingSystemAPI):
         ctf_id = 0
         while ctf_stage := self.unpack_coarse_to_fine_parameters(ctf_stage, parameters):
             ctf_id += 1
-            last_btid, last_fitness, last_parameters, last_df = self.run_coarse_to_fine_stage(ctf_stage, start, stop)
+            fidelity = self._ladder[min(ctf_id, len(self._ladder)) - 1]
+            last_btid, last_fitness, last_parameters, last_df = self.run_coarse_to_fine_stage(ctf_stage, start, stop, fidelity)
 
             results.append({
                 self.CTFSTAGEID: ctf_id,
@@ -417,10 +808,7 @@ class OptimizationSystemAPI(BacktestingSystemAPI):
 
             ctf_stage = self.pack_coarse_to_fine_parameters(ctf_stage, last_parameters)
 
-            self._log.console.info(lambda: f"Completed Coarse-to-Fine ID={ctf_id} with {last_df}")
-            self._log.telegram.info(lambda: f"Completed Coarse-to-Fine ID={ctf_id}")
-            self._log.telegram.info(lambda: image(last_df.head(50)))
-            self._log.file.info(lambda: f"Completed Coarse-to-Fine ID={ctf_id} with {last_df}")
+            self.log_stage("Coarse-to-Fine", ctf_id, last_df, head=50)
 
         ctf_df = pl.DataFrame(results, strict=False)
         ctf_df = ctf_df.sort(by=self.CTFSTAGEID, descending=True)
@@ -438,7 +826,7 @@ class OptimizationSystemAPI(BacktestingSystemAPI):
         last_df: pl.DataFrame | None = None
 
         for dof_id, dof_stage in enumerate(self._dof_stages, start=1):
-            dof_stage = self.pack_degrees_of_freedom_parameters(dof_stage, parameters)
+            dof_stage = self.pack_degrees_of_freedom_parameters(copy.deepcopy(dof_stage), parameters)
             last_btid, last_fitness, last_parameters, last_df = self.run_degrees_of_freedom_stage(dof_stage, start, stop)
 
             results.append({
@@ -453,50 +841,70 @@ class OptimizationSystemAPI(BacktestingSystemAPI):
             })
             parameters.append(last_parameters)
 
-            self._log.console.info(lambda: f"Completed Degrees-of-Freedom ID={dof_id} with {last_df}")
-            self._log.telegram.info(lambda: f"Completed Degrees-of-Freedom ID={dof_id}")
-            self._log.telegram.info(lambda: image(last_df))
-            self._log.file.info(lambda: f"Completed Degrees-of-Freedom ID={dof_id} with {last_df}")
+            self.log_stage("Degrees-of-Freedom", dof_id, last_df)
 
         dof_df = pl.DataFrame(results, strict=False)
         dof_df = dof_df.sort(by=self.DOFSTAGEID, descending=True)
 
         return last_btid, last_fitness, last_parameters, dof_df
 
+    def run_walk_forward_stage(self, wf_id: int, opt_start: date, opt_stop: date, val_start: date, val_stop: date) -> tuple[dict, Parameters, list[tuple[Callable, Callable]]]:
+
+        if self._windows > 1:
+            self._window.logs = []
+            self._window.position = wf_id - 1
+
+        opt_id, opt_fitness, opt_parameters, opt_df = self.run_optimization_stage(opt_start, opt_stop)
+        self.mute()
+        val_id, val_statistics, _ = self.submit_backtest_stage(opt_parameters, val_start, val_stop, self.fidelity).result()
+        self.unmute()
+        val_bt_fitness = self.evaluate_fitness(val_statistics)
+
+        result = {
+            self.WFSTAGEID: wf_id,
+            self.WFOPTSTART: opt_start,
+            self.WFOPTSTOP: opt_stop,
+            self.WFVALSTART: val_start,
+            self.WFVALSTOP: val_stop,
+            self.WFOPTFITNESS.format(self._fitness): opt_fitness,
+            self.WFVALFITNESS.format(self._fitness): val_bt_fitness,
+            **opt_parameters.MoneyManagement,
+            **opt_parameters.RiskManagement,
+            **opt_parameters.SignalManagement,
+            **opt_parameters.AnalystManagement,
+            **opt_parameters.ManagerManagement
+        }
+
+        self.log_stage("Walk-Forward", wf_id, opt_df)
+
+        logs = getattr(self._window, "logs", None) or []
+        self._window.__dict__.clear()
+
+        return result, opt_parameters, logs
+
     @timer
     def run(self) -> None:
 
+        if self._worker:
+            self.serve()
+            return
+
         self._log.telegram.info(lambda: gantt(self._wf_stages))
 
         results: list[dict] = []
 
-        opt_parameters = self.parameters
-        for wf_id, ((opt_start, opt_stop), (val_start, val_stop)) in enumerate(self._wf_stages, start=1):
-            opt_id, opt_fitness, opt_parameters, opt_df = self.run_optimization_stage(opt_start, opt_stop)
-            self._log.level(VerboseType.Exception)
-            val_id, val_bt = self.run_backtest_stage(opt_parameters, val_start, val_stop)
-            self._log.reset()
-            val_bt_fitness = val_bt.statistics.filter(pl.col(StatisticsAPI.STATISTICS_METRICS_LABEL) == self._fitness)[StatisticsAPI.TOTAL_METRICS_AGGREGATED].item()
+        if self._pool is None:
+            self._pool = self.open_pool()
 
-            results.append({
-                self.WFSTAGEID: wf_id,
-                self.WFOPTSTART: opt_start,
-                self.WFOPTSTOP: opt_stop,
-                self.WFVALSTART: val_start,
-                self.WFVALSTOP: val_stop,
-                self.WFOPTFITNESS.format(self._fitness): opt_fitness,
-                self.WFVALFITNESS.format(self._fitness): val_bt_fitness,
-                **opt_parameters.MoneyManagement,
-                **opt_parameters.RiskManagement,
-                **opt_parameters.SignalManagement,
-                **opt_parameters.AnalystManagement,
-                **opt_parameters.ManagerManagement
-            })
-
-            self._log.console.info(lambda: f"Completed Walk-Forward ID={wf_id} with {opt_df}")
-            self._log.telegram.info(lambda: f"Completed Walk-Forward ID={wf_id}")
-            self._log.telegram.info(lambda: image(opt_df))
-            self._log.file.info(lambda: f"Completed Walk-Forward ID={wf_id} with {opt_df}")
+        opt_parameters = self.parameters
+        with ThreadPoolExecutor(max_workers=self._windows) as windows:
+            futures = [windows.submit(self.run_walk_forward_stage, wf_id, opt_start, opt_stop, val_start, val_stop)
+                       for wf_id, ((opt_start, opt_stop), (val_start, val_stop)) in enumerate(self._wf_stages, start=1)]
+            for future in futures:
+                result, opt_parameters, logs = future.result()
+                for log, content in logs:
+                    log(content)
+                results.append(result)
 
         wf_df = pl.DataFrame(results, strict=False)
         wf_df = wf_df.sort(by=self.WFSTAGEID, descending=True)
@@ -506,12 +914,14 @@ class OptimizationSystemAPI(BacktestingSystemAPI):
         self._log.telegram.info(lambda: image(wf_df))
         self._log.file.info(lambda: f"Completed Optimization {wf_df}")
 
+        self.close_pool()
+
         self.strategy = self._strategy(
             money_management=opt_parameters.MoneyManagement,
             risk_management=opt_parameters.RiskManagement,
             signal_management=opt_parameters.SignalManagement
         )
-        self.analyst = AnalystAPI(analyst_management=opt_parameters.AnalystManagement)
+        self.analyst = AnalystAPI(analyst_management=opt_parameters.AnalystManagement, vectorized=True)
         self.manager = ManagerAPI(manager_management=opt_parameters.ManagerManagement)
 
         self._log.telegram.level(VerboseType.Exception)
@@ -0,0 +1,131 @@
+import numpy as np
+
+from typing import Type
+from datetime import date
+from itertools import count
+
+from Library.Database.Dataframe import pl
+from Library.Classes import *
+from Library.Parameters import Parameters
+from Library.Utils import timer
+
+from Library.Engine import EngineAPI
+from Library.Strategy import StrategyAPI
+from Library.System import BacktestingSystemAPI
+from Library.System.Replay import FidelityType
+from Library.System.Interleave import LegAPI, InterleaveAPI
+from Library.Manager.Statistics import StatisticsAPI
+
+class PortfolioLegAPI(LegAPI):
+
+    def __init__(self, system: BacktestingSystemAPI) -> None:
+        self._system: BacktestingSystemAPI = system
+        self._engine: EngineAPI = system.engine(system.strategy)
+
+    def prime(self) -> None:
+        self._system.prime()
+
+    def clock(self) -> np.datetime64 | None:
+        return self._system.clock()
+
+    def fill(self, horizon: np.datetime64 | None) -> bool:
+        return self._system.fill(horizon)
+
+    def step(self) -> None:
+        self._system.dispatch(self._system.collect(self._engine, self._system.analyst, self._system.manager))
+
+    def is_terminated(self) -> bool:
+        return self._engine.is_terminated()
+
+class PortfolioSystemAPI(BacktestingSystemAPI):
+
+    SYMBOL = "Symbol"
+
+    def __init__(self,
+                 broker: str,
+                 group: str,
+                 symbol: str,
+                 timeframe: str,
+                 strategy: Type[StrategyAPI],
+                 parameters: Parameters,
+                 securities: list[tuple[str, str, str, Parameters]],
+                 start: str | date,
+                 stop: str | date,
+                 account: tuple[AssetType, float, float],
+                 spread: tuple[SpreadType, float],
+                 commission: tuple[CommissionType, float],
+                 swap: tuple[SwapType, float, float],
+                 fidelity: tuple[FidelityType, int | None] = (FidelityType.Tick, None),
+                 chunk: int | None = None,
+                 cache: str | None = None) -> None:
+
+        super().__init__(
+            broker=broker,
+            group=group,
+            symbol=symbol,
+            timeframe=timeframe,
+            strategy=strategy,
+            parameters=parameters,
+            start=start,
+            stop=stop,
+            account=account,
+            spread=spread,
+            commission=commission,
+            swap=swap,
+            fidelity=fidelity,
+            chunk=chunk,
+            cache=cache
+        )
+
+        self._legs: list[BacktestingSystemAPI] = [self, *[BacktestingSystemAPI(
+            broker=broker,
+            group=security_group,
+            symbol=security_symbol,
+            timeframe=security_timeframe,
+            strategy=strategy,
+            parameters=security_parameters,
+            start=start,
+            stop=stop,
+            account=account,
+            spread=spread,
+            commission=commission,
+            swap=swap,
+            fidelity=fidelity,
+            chunk=chunk,
+            cache=cache
+        ) for security_group, security_symbol, security_timeframe, security_parameters in securities]]
+
+        self.symbol_statistics: pl.DataFrame | None = None
+
+    def __enter__(self):
+        super().__enter__()
+        pids, tids = count(start=1), count(start=1)
+        for leg in self._legs:
+            if leg is not self:
+                leg.__enter__()
+            leg._account_data = self._account_data
+            leg._pids = pids
+            leg._tids = tids
+            leg.deferred = self.deferred
+        return self
+
+    def __exit__(self, exc_type, exc_value, exc_traceback):
+        for leg in self._legs:
+            if leg is not self:
+                leg.__exit__(exc_type, exc_value, exc_traceback)
+        return super().__exit__(exc_type, exc_value, exc_traceback)
+
+    def merge(self) -> None:
+        InterleaveAPI.merge([PortfolioLegAPI(leg) for leg in self._legs])
+
+    @timer
+    def run(self) -> None:
+        self.merge()
+
+        legs = [(leg._symbol, leg) for leg in self._legs if leg.individual_trades is not None]
+        self.individual_trades = StatisticsAPI.sort_trades(pl.concat([leg.individual_trades.with_columns(pl.lit(symbol).alias(self.SYMBOL)) for symbol, leg in legs], how="diagonal_relaxed"))
+        if self.deferred:
+            return
+        self.aggregated_trades = StatisticsAPI.sort_trades(pl.concat([leg.aggregated_trades.with_columns(pl.lit(symbol).alias(self.SYMBOL)) for symbol, leg in legs], how="diagonal_relaxed"))
+        self.symbol_statistics = pl.concat([leg.statistics.with_columns(pl.lit(symbol).alias(self.SYMBOL)) for symbol, leg in legs], how="diagonal_relaxed")
+        _, _, self.statistics = StatisticsAPI.summary(self.individual_trades, self.account_data.Balance, self._start_date, self._stop_date)
@@ -0,0 +1,68 @@
+import numpy as np
+
+from datetime import datetime
+from typing import Iterable, Iterator
+
+from Library.Database.Dataframe import pl
+
+class RateAPI:
+
+    def __init__(self, df: pl.DataFrame, column: str = "OpenPrice") -> None:
+        self._column: str = column
+        self.Timestamp, self.Price = self.arrays(df, column)
+
+    @staticmethod
+    def arrays(df: pl.DataFrame, column: str) -> tuple[np.ndarray, np.ndarray]:
+        return df["Timestamp"].cast(pl.Datetime("us")).to_numpy(), np.ascontiguousarray(df[column].cast(pl.Float64).to_numpy())
+
+    def index(self, timestamp: datetime) -> int:
+        index = int(np.searchsorted(self.Timestamp, np.datetime64(timestamp, "us"), side="right")) - 1
+        if index < 0:
+            raise ValueError(f"No rate available at or before {timestamp}")
+        return index
+
+    def at(self, timestamp: datetime) -> float:
+        return float(self.Price[self.index(timestamp)])
+
+class StreamRateAPI(RateAPI):
+
+    def __init__(self, chunks: Iterable[pl.DataFrame], column: str = "OpenPrice") -> None:
+        self._chunks: Iterator[pl.DataFrame] = iter(chunks)
+        super().__init__(next(self._chunks), column)
+        self._pending: pl.DataFrame | None = next(self._chunks, None)
+
+    def at(self, timestamp: datetime) -> float:
+        while self._pending is not None and self._pending["Timestamp"][0] <= timestamp:
+            timestamps, prices = self.arrays(self._pending, self._column)
+            self.Timestamp = np.concatenate((self.Timestamp[-1:], timestamps))
+            self.Price = np.concatenate((self.Price[-1:], prices))
+            self._pending = next(self._chunks, None)
+        return super().at(timestamp)
+
+class TapRateAPI(RateAPI):
+
+    def __init__(self, column: str = "OpenPrice") -> None:
+        self._column: str = column
+        self.Timestamp: np.ndarray = np.empty(0, dtype="datetime64[us]")
+        self.Price: np.ndarray = np.empty(0, dtype=np.float64)
+        self._length: int = 0
+
+    def tap(self, chunks: Iterable[pl.DataFrame]) -> Iterator[pl.DataFrame]:
+        for chunk in chunks:
+            timestamps, prices = self.arrays(chunk, self._column)
+            self.Timestamp = np.concatenate((self.Timestamp[self.Timestamp.shape[0] - self._length:], timestamps))
+            self.Price = np.concatenate((self.Price[self.Price.shape[0] - self._length:], prices))
+            self._length = chunk.height
+            yield chunk
+
+class ConversionAPI:
+
+    def __init__(self, rate: RateAPI | None = None, inverse: bool = False) -> None:
+        self.Rate: RateAPI | None = rate
+        self.Inverse: bool = inverse
+
+    def __call__(self, timestamp, spread: float) -> float:
+        if self.Rate is None:
+            return 1.0
+        price = self.Rate.at(timestamp.Timestamp)
+        return 1.0 / (price + spread) if self.Inverse else price
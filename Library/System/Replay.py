@@ -0,0 +1,230 @@
+from __future__ import annotations
+
+import numpy as np
+
+from enum import Enum
+from datetime import datetime
+from typing import Callable, Iterable, Iterator, Type, TYPE_CHECKING
+
+from Library.Database.Dataframe import pl
+if TYPE_CHECKING: from Library.Classes import Bar, Tick
+
+class FidelityType(Enum):
+    Tick = 0
+    Seconds = 1
+    Bars = 2
+
+class ReplayAPI:
+
+    def __init__(self, ticks: Iterable[pl.DataFrame], bar_df: pl.DataFrame, bar_start: datetime, spread_fee: Callable[[datetime, float], float], bar_type: Type[Bar], tick_type: Type[Tick]) -> None:
+        self._ticks: Iterator[pl.DataFrame] = (tick_df for tick_df in ticks if not tick_df.is_empty())
+        self._bar_type: Type[Bar] = bar_type
+        self._tick_type: Type[Tick] = tick_type
+        self._spread_fee: Callable[[datetime, float], float] = spread_fee
+        self._bar_df: pl.DataFrame = bar_df
+
+        self.BarTimestamp: np.ndarray = self.timestamps(bar_df)
+        self.BarGap: np.ndarray = self.prices(bar_df, "GapPrice")
+        self.BarOpen: np.ndarray = self.prices(bar_df, "OpenPrice")
+        self.BarClose: np.ndarray = self.prices(bar_df, "ClosePrice")
+        self.BarLength: int = bar_df.height
+        self.BarCursor: int = int(np.searchsorted(self.BarTimestamp, np.datetime64(bar_start, "us"), side="left"))
+
+        self._pending: pl.DataFrame | None = next(self._ticks, None)
+        self.load()
+
+        self._gap: float = self.BarGap[self.BarCursor]
+        self._open: float = self.BarOpen[self.BarCursor]
+        self._high: float = self._open
+        self._low: float = self._open
+        self._close: float = self._open
+        self._volume: float = 0.0
+        self._running: Bar | None = None
+        self._next_open: Tick | None = None
+
+    def load(self) -> None:
+        tick_df = self._pending
+        self._pending = next(self._ticks, None)
+        length = tick_df.height
+        if self._pending is not None:
+            tick_df = pl.concat([tick_df, self._pending.head(1)], how="vertical_relaxed")
+
+        self.TickTimestamp: np.ndarray = self.timestamps(tick_df)
+        self.TickOpen: np.ndarray = self.prices(tick_df, "OpenPrice")
+        self.TickHigh: np.ndarray = self.prices(tick_df, "HighPrice")[:length]
+        self.TickLow: np.ndarray = self.prices(tick_df, "LowPrice")[:length]
+        self.TickClose: np.ndarray = self.prices(tick_df, "ClosePrice")[:length]
+        self.TickVolume: np.ndarray = self.prices(tick_df, "TickVolume")[:length]
+        self.TickOpenAsk: np.ndarray = self.TickOpen + self._spread_fee(timestamp=self.TickTimestamp, price=self.TickOpen)
+        self.TickHighAsk: np.ndarray = self.TickHigh + self._spread_fee(timestamp=self.TickTimestamp[:length], price=self.TickHigh)
+        self.TickLowAsk: np.ndarray = self.TickLow + self._spread_fee(timestamp=self.TickTimestamp[:length], price=self.TickLow)
+        self.TickLength: int = length
+        self.TickCursor: int = 0
+        self._next_open = None
+
+        self.TickNextOpen: np.ndarray = np.append(self.TickOpen[1:], self.TickOpen[-1:])[:length]
+        self.TickNextOpenAsk: np.ndarray = np.append(self.TickOpenAsk[1:], self.TickOpenAsk[-1:])[:length]
+        self.TickFloorBid: np.ndarray = np.minimum(self.TickLow, self.TickNextOpen)
+        self.TickCeilBid: np.ndarray = np.maximum(self.TickHigh, self.TickNextOpen)
+        self.TickFloorAsk: np.ndarray = np.minimum(self.TickLowAsk, self.TickNextOpenAsk)
+        self.TickCeilAsk: np.ndarray = np.maximum(self.TickHighAsk, self.TickNextOpenAsk)
+
+        self.BarBound: np.ndarray = np.searchsorted(self.TickTimestamp[:length], self.BarTimestamp, side="left")
+        self.BarTickHigh: np.ndarray = np.maximum.reduceat(np.append(self.TickHigh, -np.inf), self.BarBound)
+        self.BarTickLow: np.ndarray = np.minimum.reduceat(np.append(self.TickLow, np.inf), self.BarBound)
+        self.BarTickVolume: np.ndarray = np.add.reduceat(np.append(self.TickVolume, 0.0), self.BarBound)
+
+    @staticmethod
+    def timestamps(df: pl.DataFrame) -> np.ndarray:
+        return df["Timestamp"].cast(pl.Datetime("us")).to_numpy()
+
+    @staticmethod
+    def prices(df: pl.DataFrame, column: str) -> np.ndarray:
+        return np.ascontiguousarray(df[column].cast(pl.Float64).to_numpy())
+
+    @staticmethod
+    def resample(tick_df: pl.DataFrame, seconds: int) -> pl.DataFrame:
+        return tick_df.group_by_dynamic("Timestamp", every=f"{seconds}s", closed="left", label="left").agg(
+            pl.col("GapPrice").first(),
+            pl.col("OpenPrice").first(),
+            pl.col("HighPrice").max(),
+            pl.col("LowPrice").min(),
+            pl.col("ClosePrice").last(),
+            pl.col("TickVolume").sum()
+        )
+
+    @staticmethod
+    def synthesize(bar_df: pl.DataFrame) -> pl.DataFrame:
+        duration = pl.col("Timestamp").diff().shift(-1).forward_fill()
+        bullish = pl.col("ClosePrice") >= pl.col("OpenPrice")
+        path = [
+            pl.col("OpenPrice"),
+            pl.when(bullish).then(pl.col("LowPrice")).otherwise(pl.col("HighPrice")),
+            pl.when(bullish).then(pl.col("HighPrice")).otherwise(pl.col("LowPrice")),
+            pl.col("ClosePrice")
+        ]
+        return pl.concat([bar_df.select(
+            (pl.col("Timestamp") + duration * step / len(path)).alias("Timestamp"),
+            *[price.alias(column) for column in ("GapPrice", "OpenPrice", "HighPrice", "LowPrice", "ClosePrice")],
+            (pl.col("TickVolume") / len(path)).alias("TickVolume")
+        ) for step, price in enumerate(path)]).sort("Timestamp", maintain_order=True)
+
+    def has_tick(self) -> bool:
+        if self.TickCursor < self.TickLength:
+            return True
+        if self._pending is None:
+            return False
+        self.load()
+        return True
+
+    def has_bar(self) -> bool:
+        return self.BarCursor + 1 < self.BarLength
+
+    def is_bar_closed(self) -> bool:
+        return self.has_bar() and (not self.has_tick() or self.TickTimestamp[self.TickCursor] >= self.BarTimestamp[self.BarCursor + 1])
+
+    def next_open_index(self) -> int:
+        return min(self.TickCursor, len(self.TickOpen) - 1)
+
+    def timestamp(self, index: int) -> datetime:
+        return self.TickTimestamp[index].item()
+
+    def tick(self, index: int, ask: float, bid: float) -> Tick:
+        return self._tick_type(self.timestamp(index), float(ask), float(bid))
+
+    def next_open(self) -> Tick:
+        if self._next_open is None:
+            index = self.next_open_index()
+            self._next_open = self.tick(index, self.TickOpenAsk[index], self.TickOpen[index])
+        return self._next_open
+
+    def bar(self) -> Bar:
+        return self._bar_type(*self._bar_df.row(self.BarCursor))
+
+    def running(self) -> Bar:
+        if self._running is None:
+            self._running = self._bar_type(
+                Timestamp=self.BarTimestamp[self.BarCursor].item(),
+                GapPrice=float(self._gap),
+                OpenPrice=float(self._open),
+                HighPrice=float(self._high),
+                LowPrice=float(self._low),
+                ClosePrice=float(self._close),
+                TickVolume=float(self._volume)
+            )
+        return self._running
+
+    def close_bar(self) -> None:
+        self._gap = self.BarClose[self.BarCursor]
+        self.BarCursor += 1
+        self._open = self.BarOpen[self.BarCursor]
+        self._high = self._open
+        self._low = self._open
+        self._close = self._open
+        self._volume = 0.0
+        self._running = None
+
+    def peek(self) -> np.datetime64 | None:
+        if self.is_bar_closed():
+            return self.BarTimestamp[self.BarCursor + 1]
+        if self.has_tick():
+            return self.TickTimestamp[self.TickCursor]
+        return None
+
+    def segment_end(self, horizon: np.datetime64 | None = None) -> int:
+        end = int(self.BarBound[self.BarCursor + 1]) if self.has_bar() else self.TickLength
+        if horizon is not None:
+            end = min(end, int(np.searchsorted(self.TickTimestamp[:self.TickLength], horizon, side="right")))
+        return end
+
+    def search(self, stop: int, buy_stop_loss: float, buy_take_profit: float, sell_stop_loss: float, sell_take_profit: float, ask_above: float | None, ask_below: float | None, bid_above: float | None, bid_below: float | None) -> int:
+        start = self.TickCursor
+        armed = (self.TickFloorBid[start:stop] <= buy_stop_loss) | (self.TickCeilBid[start:stop] >= buy_take_profit) | (self.TickCeilAsk[start:stop] >= sell_stop_loss) | (self.TickFloorAsk[start:stop] <= sell_take_profit)
+        if ask_above is not None:
+            armed |= self.TickNextOpenAsk[start:stop] >= ask_above
+        if ask_below is not None:
+            armed |= self.TickNextOpenAsk[start:stop] <= ask_below
+        if bid_above is not None:
+            armed |= self.TickNextOpen[start:stop] >= bid_above
+        if bid_below is not None:
+            armed |= self.TickNextOpen[start:stop] <= bid_below
+        return start + int(armed.argmax()) if armed.any() else stop
+
+    def skip(self, stop: int) -> None:
+        start = self.TickCursor
+        if stop <= start:
+            return
+        if start == self.BarBound[self.BarCursor] and stop == self.segment_end():
+            high, low, volume = self.BarTickHigh[self.BarCursor], self.BarTickLow[self.BarCursor], self.BarTickVolume[self.BarCursor]
+        else:
+            high, low, volume = self.TickHigh[start:stop].max(), self.TickLow[start:stop].min(), self.TickVolume[start:stop].sum()
+        if high > self._high:
+            self._high = high
+        if low < self._low:
+            self._low = low
+        self._close = self.TickClose[stop - 1]
+        self._volume += volume
+        self.TickCursor = stop
+        self._running = None
+        self._next_open = None
+
+    def advance(self) -> int:
+        index = self.TickCursor
+        high = self.TickHigh[index]
+        low = self.TickLow[index]
+        if high > self._high:
+            self._high = high
+        if low < self._low:
+            self._low = low
+        self._close = self.TickClose[index]
+        self._volume += self.TickVolume[index]
+        self.TickCursor = index + 1
+        self._running = None
+        self._next_open = None
+        return index
+
+    def forward(self, horizon: np.datetime64 | None, levels: tuple | None) -> int | None:
+        end = self.segment_end(horizon)
+        stop = self.search(end, *levels) if levels is not None else end
+        self.skip(stop)
+        return self.advance() if stop < end else None
@@ -0,0 +1,53 @@
+import calendar
+import numpy as np
+
+from time import localtime
+from datetime import datetime, timedelta
+
+class RolloverAPI:
+
+    def __init__(self, start: datetime, stop: datetime, period: int, summer: int, winter: int, extra: int) -> None:
+        self._period: timedelta = timedelta(hours=period)
+        self._summer: int = summer
+        self._winter: int = winter
+        self._extra: int = extra
+
+        timestamps: list[datetime] = []
+        multipliers: list[int] = []
+        rollover_isdst = self.isdst(start)
+        rollover_timestamp = datetime(year=start.year, month=start.month, day=start.day, hour=summer if rollover_isdst else winter)
+        while rollover_timestamp < stop:
+            timestamps.append(rollover_timestamp)
+            multipliers.append(self.multiplier(rollover_timestamp))
+            rollover_timestamp, rollover_isdst = self.rollover(rollover_timestamp, rollover_isdst)
+
+        self.Timestamp: np.ndarray = np.array(timestamps, dtype="datetime64[us]")
+        self.Overnights: np.ndarray = np.concatenate(([0], np.cumsum(multipliers, dtype=np.int64)))
+
+    @staticmethod
+    def isdst(timestamp: datetime) -> bool:
+        return bool(localtime(timestamp.timestamp()).tm_isdst)
+
+    def rollover(self, at_timestamp: datetime, at_isdst: bool) -> tuple[datetime, bool]:
+        to_timestamp = at_timestamp + self._period
+        to_isdst = self.isdst(to_timestamp)
+        if at_isdst and not to_isdst:
+            return to_timestamp.replace(hour=self._winter), to_isdst
+        if not at_isdst and to_isdst:
+            return to_timestamp.replace(hour=self._summer), to_isdst
+        return to_timestamp, to_isdst
+
+    def multiplier(self, timestamp: datetime) -> int:
+        match timestamp.weekday():
+            case self._extra:
+                return 3
+            case calendar.SATURDAY | calendar.SUNDAY:
+                return 0
+            case _:
+                return 1
+
+    def overnights(self, entry_timestamp: datetime, exit_timestamp: datetime) -> int:
+        if exit_timestamp <= entry_timestamp:
+            return 0
+        entry_index, exit_index = np.searchsorted(self.Timestamp, np.array([entry_timestamp, exit_timestamp], dtype="datetime64[us]"), side="left")
+        return int(self.Overnights[exit_index] - self.Overnights[entry_index])
@@ -0,0 +1,158 @@
+import math
+import itertools
+
+import numpy as np
+
+from enum import Enum
+from numbers import Number
+from abc import ABC, abstractmethod
+from typing import Iterable, Iterator
+
+class SamplerType(Enum):
+    Grid = 0
+    TPE = 1
+    Evolutionary = 2
+
+class SamplerAPI(ABC):
+
+    def __init__(self, space: list[list], budget: int | None = None, batch: int | None = None, seed: int | None = None) -> None:
+        self.Space: list[list] = space
+        self.Size: int = math.prod(len(dimension) for dimension in space)
+        self.Budget: int = min(budget, self.Size) if budget is not None else self.Size
+        self.Batch: int | None = batch
+        self.Observed: list[tuple[tuple[int, ...], float]] = []
+
+        self._seen: set[tuple[int, ...]] = set()
+        self._rng = np.random.default_rng(seed)
+        self._features: list[tuple[np.ndarray, np.ndarray]] = [self.features(dimension) for dimension in space]
+
+    @staticmethod
+    def features(dimension: list) -> tuple[np.ndarray, np.ndarray]:
+        labels: dict[tuple, int] = {}
+        codes, numbers = [], []
+        for choice in dimension:
+            values = choice if isinstance(choice, (list, tuple)) else [choice]
+            codes.append(labels.setdefault(tuple(str(value) for value in values if not isinstance(value, Number) or isinstance(value, bool)), len(labels)))
+            numbers.append([float(value) for value in values if isinstance(value, Number) and not isinstance(value, bool)])
+        width = max((len(number) for number in numbers), default=0)
+        matrix = np.array([number + [0.0] * (width - len(number)) for number in numbers], dtype=np.float64).reshape(len(dimension), width)
+        span = matrix.max(axis=0, initial=0.0) - matrix.min(axis=0, initial=0.0) if len(dimension) else np.zeros(width)
+        matrix = np.divide(matrix - matrix.min(axis=0, initial=0.0), span, out=np.zeros_like(matrix), where=span > 0)
+        return np.array(codes, dtype=np.int64), matrix
+
+    def distance(self, dimension: int, choices: np.ndarray) -> np.ndarray:
+        codes, numbers = self._features[dimension]
+        categorical = (codes[:, None] != codes[None, choices]).astype(np.float64)
+        numerical = ((numbers[:, None, :] - numbers[None, choices, :]) ** 2).sum(axis=2)
+        return categorical + numerical
+
+    def remaining(self) -> int:
+        return self.Budget - len(self._seen)
+
+    def explore(self) -> Iterator[tuple[int, ...]]:
+        sizes = [len(dimension) for dimension in self.Space]
+        for _ in range(4 * self.remaining()):
+            yield tuple(int(self._rng.integers(size)) for size in sizes)
+        yield from itertools.product(*map(range, sizes))
+
+    @abstractmethod
+    def propose(self, count: int) -> Iterable[tuple[int, ...]]:
+        raise NotImplementedError
+
+    def suggest(self) -> list[tuple[int, ...]]:
+        count = min(self.Batch or self.remaining(), self.remaining())
+        batch = []
+        if count <= 0:
+            return batch
+        for candidate in itertools.chain(self.propose(count), self.explore()):
+            if candidate in self._seen:
+                continue
+            self._seen.add(candidate)
+            batch.append(candidate)
+            if len(batch) == count:
+                break
+        return batch
+
+    def observe(self, candidate: tuple[int, ...], fitness: float | None) -> None:
+        self.Observed.append((candidate, float(fitness) if fitness is not None and not math.isnan(fitness) else float("-inf")))
+
+    def choices(self, candidate: tuple[int, ...]) -> list:
+        return [dimension[index] for dimension, index in zip(self.Space, candidate)]
+
+class GridSamplerAPI(SamplerAPI):
+
+    def __init__(self, space: list[list], budget: int | None = None, batch: int | None = None, seed: int | None = None) -> None:
+        super().__init__(space, budget, batch, seed)
+        self._grid: Iterator[tuple[int, ...]] = itertools.product(*(range(len(dimension)) for dimension in space)) if self.Budget == self.Size else self.explore()
+
+    def propose(self, count: int) -> Iterable[tuple[int, ...]]:
+        return self._grid
+
+class TPESamplerAPI(SamplerAPI):
+
+    def __init__(self, space: list[list], budget: int | None = None, batch: int | None = None, seed: int | None = None, startup: int = 10, gamma: float = 0.25, candidates: int = 24, bandwidth: float = 0.05) -> None:
+        super().__init__(space, budget, batch, seed)
+        self.Startup: int = startup
+        self.Gamma: float = gamma
+        self.Candidates: int = candidates
+        self.Bandwidth: float = bandwidth
+
+    def density(self, dimension: int, observed: list[tuple[int, ...]]) -> np.ndarray:
+        size = len(self.Space[dimension])
+        if not observed:
+            return np.full(size, 1.0 / size)
+        choices = np.array([candidate[dimension] for candidate in observed], dtype=np.int64)
+        weights = np.exp(-self.distance(dimension, choices) / (2.0 * self.Bandwidth ** 2)).sum(axis=1)
+        weights = weights / weights.sum()
+        prior = 1.0 / (len(observed) + 1)
+        return (1.0 - prior) * weights + prior / size
+
+    def propose(self, count: int) -> Iterable[tuple[int, ...]]:
+        if len(self.Observed) < self.Startup:
+            return []
+        ranked = [candidate for candidate, _ in sorted(self.Observed, key=lambda observation: observation[1], reverse=True)]
+        split = max(1, math.ceil(self.Gamma * len(ranked)))
+        good, bad = ranked[:split], ranked[split:]
+        draws = np.empty((count * self.Candidates, len(self.Space)), dtype=np.int64)
+        scores = np.zeros(count * self.Candidates)
+        for dimension in range(len(self.Space)):
+            l, g = self.density(dimension, good), self.density(dimension, bad)
+            draws[:, dimension] = self._rng.choice(len(l), size=count * self.Candidates, p=l)
+            scores += np.log(l / g)[draws[:, dimension]]
+        return [tuple(int(index) for index in draws[row]) for row in np.argsort(-scores, kind="stable")]
+
+class EvolutionarySamplerAPI(SamplerAPI):
+
+    def __init__(self, space: list[list], budget: int | None = None, batch: int | None = None, seed: int | None = None, population: int = 20, tournament: int = 3, mutation: float | None = None, neighbors: int = 5) -> None:
+        super().__init__(space, budget, batch, seed)
+        self.Population: int = population
+        self.Tournament: int = tournament
+        self.Mutation: float = mutation if mutation is not None else 1.0 / max(len(space), 1)
+        self.Neighbors: int = neighbors
+
+    def select(self, parents: list[tuple[tuple[int, ...], float]]) -> tuple[int, ...]:
+        contenders = self._rng.choice(len(parents), size=min(self.Tournament, len(parents)), replace=False)
+        return max((parents[contender] for contender in contenders), key=lambda observation: observation[1])[0]
+
+    def mutate(self, dimension: int, choice: int) -> int:
+        size = len(self.Space[dimension])
+        if size <= 1:
+            return choice
+        distances = self.distance(dimension, np.array([choice], dtype=np.int64))[:, 0]
+        distances[choice] = np.inf
+        nearest = np.argpartition(distances, min(self.Neighbors, size - 1) - 1)[:min(self.Neighbors, size - 1)]
+        return int(self._rng.choice(nearest))
+
+    def propose(self, count: int) -> Iterable[tuple[int, ...]]:
+        if len(self.Observed) < self.Population:
+            return []
+        parents = sorted(self.Observed, key=lambda observation: observation[1], reverse=True)[:self.Population]
+        children = []
+        for _ in range(count):
+            mother, father = self.select(parents), self.select(parents)
+            child = [mother[dimension] if self._rng.random() < 0.5 else father[dimension] for dimension in range(len(self.Space))]
+            for dimension in range(len(self.Space)):
+                if self._rng.random() < self.Mutation:
+                    child[dimension] = self.mutate(dimension, child[dimension])
+            children.append(tuple(child))
+        return children
@@ -0,0 +1,49 @@
+import pyarrow as pa
+
+from multiprocessing.shared_memory import SharedMemory
+
+from Library.Database.Dataframe import pl
+
+class SharedFrameAPI:
+
+    def __init__(self, name: str, size: int) -> None:
+        self.Name: str = name
+        self.Size: int = size
+        self._memory: SharedMemory | None = None
+
+    def __getstate__(self) -> dict:
+        return {"Name": self.Name, "Size": self.Size}
+
+    def __setstate__(self, state: dict) -> None:
+        self.__init__(state["Name"], state["Size"])
+
+    @classmethod
+    def publish(cls, df: pl.DataFrame) -> "SharedFrameAPI":
+        table = df.to_arrow()
+        sink = pa.BufferOutputStream()
+        with pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+        buffer = sink.getvalue()
+        memory = SharedMemory(create=True, size=max(buffer.size, 1))
+        memory.buf[:buffer.size] = memoryview(buffer).cast("B")
+        shared = cls(memory.name, buffer.size)
+        shared._memory = memory
+        return shared
+
+    def attach(self) -> pl.DataFrame:
+        if self._memory is None:
+            self._memory = SharedMemory(name=self.Name)
+        table = pa.ipc.open_file(pa.py_buffer(self._memory.buf[:self.Size])).read_all()
+        return pl.from_arrow(table, rechunk=False)
+
+    def close(self) -> None:
+        if self._memory is not None:
+            self._memory.close()
+            self._memory = None
+
+    def unlink(self) -> None:
+        if self._memory is None:
+            self._memory = SharedMemory(name=self.Name)
+        self._memory.close()
+        self._memory.unlink()
+        self._memory = None
@@ -0,0 +1,88 @@
+import os
+import json
+import time
+import hashlib
+import itertools
+import threading
+
+from pathlib import Path
+from datetime import date
+
+from Library.Database.Dataframe import pl
+
+class StoreAPI:
+
+    KEY = "Key"
+    STRATEGY = "Strategy"
+    START = "Start"
+    STOP = "Stop"
+    PARAMETERS = "Parameters"
+
+    def __init__(self, path: str | Path, flush: int = 16) -> None:
+        self.Path: Path = Path(path)
+        self.Flush: int = flush
+
+        self._lock = threading.Lock()
+        self._parts = itertools.count()
+        self._pending: list[pl.DataFrame] = []
+        self._index: dict[str, pl.DataFrame] = {}
+
+        self.Path.mkdir(parents=True, exist_ok=True)
+        for file in sorted(self.Path.glob("*.parquet")):
+            for (key,), df in pl.read_parquet(file).group_by(self.KEY, maintain_order=True):
+                self._index[key] = df.drop(self.KEY, self.STRATEGY, self.START, self.STOP, self.PARAMETERS)
+
+    @staticmethod
+    def encode(value):
+        if hasattr(value, "item"):
+            return value.item()
+        return str(value)
+
+    @staticmethod
+    def key(**components) -> str:
+        return hashlib.blake2b(json.dumps(components, sort_keys=True, default=StoreAPI.encode).encode(), digest_size=16).hexdigest()
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._index
+
+    def get(self, key: str) -> pl.DataFrame | None:
+        with self._lock:
+            return self._index.get(key)
+
+    def put(self, key: str, statistics: pl.DataFrame, strategy: str, start: date, stop: date, parameters: dict) -> None:
+        with self._lock:
+            if key in self._index:
+                return
+            self._index[key] = statistics
+            self._pending.append(statistics.with_columns(
+                pl.lit(key).alias(self.KEY),
+                pl.lit(strategy).alias(self.STRATEGY),
+                pl.lit(start, dtype=pl.Date()).alias(self.START),
+                pl.lit(stop, dtype=pl.Date()).alias(self.STOP),
+                pl.lit(json.dumps(parameters, sort_keys=True, default=self.encode)).alias(self.PARAMETERS)
+            ))
+            if len(self._pending) >= self.Flush:
+                self._flush()
+
+    def _flush(self) -> None:
+        schemas: dict[tuple, list[pl.DataFrame]] = {}
+        for df in self._pending:
+            schemas.setdefault(tuple(df.schema.items()), []).append(df)
+        for frames in schemas.values():
+            file = self.Path / f"{time.time_ns()}-{os.getpid()}-{next(self._parts)}.parquet"
+            temporary = file.with_suffix(".tmp")
+            pl.concat(frames, how="vertical").write_parquet(temporary)
+            os.replace(temporary, file)
+        self._pending = []
+
+    def flush(self) -> None:
+        with self._lock:
+            self._flush()
+
+    def read(self) -> pl.DataFrame:
+        self.flush()
+        files = sorted(self.Path.glob("*.parquet"))
+        return pl.concat([pl.read_parquet(file) for file in files], how="diagonal_relaxed") if files else pl.DataFrame()
@@ -0,0 +1,67 @@
+from datetime import date, timedelta
+from queue import Queue, Full
+from threading import Thread, Event
+from typing import Callable, Iterator
+
+from Library.Database.Dataframe import pl
+
+class StreamAPI:
+
+    TIMEOUT = 0.1
+
+    def __init__(self, pull: Callable[[date, date], pl.DataFrame], start: date, stop: date, days: int) -> None:
+        self._pull: Callable[[date, date], pl.DataFrame] = pull
+        self._start: date = start
+        self._stop: date = stop
+        self._days: int = days
+        self._producers: list[tuple[Thread, Event]] = []
+
+    def partitions(self) -> list[tuple[date, date]]:
+        partitions = []
+        partition_start = self._start
+        while partition_start <= self._stop:
+            partition_stop = min(partition_start + timedelta(days=self._days), self._stop + timedelta(days=1))
+            partitions.append((partition_start, partition_stop))
+            partition_start = partition_stop
+        return partitions
+
+    def _put(self, queue: Queue, item: pl.DataFrame | Exception | None, stop: Event) -> bool:
+        while not stop.is_set():
+            try:
+                queue.put(item, timeout=self.TIMEOUT)
+                return True
+            except Full:
+                continue
+        return False
+
+    def _produce(self, queue: Queue, stop: Event) -> None:
+        try:
+            for partition_start, partition_stop in self.partitions():
+                if stop.is_set():
+                    return
+                df = self._pull(partition_start, partition_stop)
+                if not self._put(queue, df.filter((pl.col("Timestamp") >= partition_start) & (pl.col("Timestamp") < partition_stop)), stop):
+                    return
+            self._put(queue, None, stop)
+        except Exception as exception:
+            self._put(queue, exception, stop)
+
+    def __iter__(self) -> Iterator[pl.DataFrame]:
+        queue: Queue[pl.DataFrame | Exception | None] = Queue(maxsize=1)
+        producer = Thread(target=self._produce, args=(queue, stop := Event()), daemon=True)
+        self._producers.append((producer, stop))
+        producer.start()
+        try:
+            while (chunk := queue.get()) is not None:
+                if isinstance(chunk, Exception):
+                    raise chunk
+                if not chunk.is_empty():
+                    yield chunk
+        finally:
+            stop.set()
+
+    def close(self) -> None:
+        for producer, stop in self._producers:
+            stop.set()
+            producer.join()
+        self._producers.clear()
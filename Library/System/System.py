@@ -4,7 +4,6 @@ from threading import Thread
 
 from Library.Database.Dataframe import pl
 from Library.Logging import HandlerAPI
-from Library.Classes import Account, Symbol, Position, Trade, Bar, Tick
 from Library.Parameters import Parameters
 
 from Library.Utility import *
@@ -97,117 +96,102 @@ class SystemAPI(Thread, ABC):
         raise NotImplementedError
 
     @abstractmethod
-    def receive_update_id(self) -> UpdateID:
-        raise NotImplementedError
-
-    @abstractmethod
-    def receive_update_account(self) -> Account:
-        raise NotImplementedError
-
-    @abstractmethod
-    def receive_update_symbol(self) -> Symbol:
-        raise NotImplementedError
-
-    @abstractmethod
-    def receive_update_position(self) -> Position:
-        raise NotImplementedError
-
-    @abstractmethod
-    def receive_update_trade(self) -> Trade:
-        raise NotImplementedError
-
-    @abstractmethod
-    def receive_update_bar(self) -> Bar:
-        raise NotImplementedError
-
-    @abstractmethod
-    def receive_update_target(self) -> Tick:
+    def receive_update(self) -> tuple[UpdateID, tuple]:
         raise NotImplementedError
 
     @abstractmethod
     def system_management(self) -> MachineAPI:
         raise NotImplementedError
 
+    def engine(self, strategy: StrategyAPI) -> EngineAPI:
+        return EngineAPI(system_engine=self.system_management(),
+                         strategy_engine=strategy.strategy_management(),
+                         signal_engine=strategy.signal_management(),
+                         risk_engine=strategy.risk_management())
+
+    def collect(self, system: EngineAPI, analyst: AnalystAPI, manager: ManagerAPI) -> list:
+        actions = []
+        while True:
+            update_id, payload = self.receive_update()
+            match update_id:
+                case UpdateID.Complete:
+                    actions += system.perform_update_complete(CompleteUpdate(analyst, manager))
+                    break
+                case UpdateID.Account:
+                    actions += system.perform_update_account(AccountUpdate(analyst, manager, *payload))
+                case UpdateID.Symbol:
+                    actions += system.perform_update_symbol(SymbolUpdate(analyst, manager, *payload))
+                case UpdateID.OpenedBuy:
+                    actions += system.perform_update_opened_buy(PositionUpdate(analyst, manager, *payload))
+                case UpdateID.OpenedSell:
+                    actions += system.perform_update_opened_sell(PositionUpdate(analyst, manager, *payload))
+                case UpdateID.ModifiedBuyVolume:
+                    actions += system.perform_update_modified_volume_buy(PositionTradeUpdate(analyst, manager, *payload))
+                case UpdateID.ModifiedBuyStopLoss:
+                    actions += system.perform_update_modified_stop_loss_buy(PositionUpdate(analyst, manager, *payload))
+                case UpdateID.ModifiedBuyTakeProfit:
+                    actions += system.perform_update_modified_take_profit_buy(PositionUpdate(analyst, manager, *payload))
+                case UpdateID.ModifiedSellVolume:
+                    actions += system.perform_update_modified_volume_sell(PositionTradeUpdate(analyst, manager, *payload))
+                case UpdateID.ModifiedSellStopLoss:
+                    actions += system.perform_update_modified_stop_loss_sell(PositionUpdate(analyst, manager, *payload))
+                case UpdateID.ModifiedSellTakeProfit:
+                    actions += system.perform_update_modified_take_profit_sell(PositionUpdate(analyst, manager, *payload))
+                case UpdateID.ClosedBuy:
+                    actions += system.perform_update_closed_buy(TradeUpdate(analyst, manager, *payload))
+                case UpdateID.ClosedSell:
+                    actions += system.perform_update_closed_sell(TradeUpdate(analyst, manager, *payload))
+                case UpdateID.BarClosed:
+                    actions += system.perform_update_bar_closed(BarUpdate(analyst, manager, *payload))
+                case UpdateID.AskAboveTarget:
+                    actions += system.perform_update_ask_above_target(TickUpdate(analyst, manager, *payload))
+                case UpdateID.AskBelowTarget:
+                    actions += system.perform_update_ask_below_target(TickUpdate(analyst, manager, *payload))
+                case UpdateID.BidAboveTarget:
+                    actions += system.perform_update_bid_above_target(TickUpdate(analyst, manager, *payload))
+                case UpdateID.BidBelowTarget:
+                    actions += system.perform_update_bid_below_target(TickUpdate(analyst, manager, *payload))
+                case UpdateID.Shutdown:
+                    self._log.debug(lambda: "Shutdown")
+                    actions += system.perform_update_shutdown(CompleteUpdate(analyst, manager))
+                    break
+                case _:
+                    self._log.error(lambda: f"Received invalid update ID: {update_id}")
+                    raise
+        return actions
+
+    def dispatch(self, actions: list) -> None:
+        for action in actions:
+            match action.ActionID:
+                case ActionID.Complete:
+                    self.send_action_complete(action)
+                case ActionID.OpenBuy | ActionID.OpenSell:
+                    self.send_action_open(action)
+                case ActionID.ModifyBuyVolume | ActionID.ModifySellVolume:
+                    self.send_action_modify_volume(action)
+                case ActionID.ModifyBuyStopLoss | ActionID.ModifySellStopLoss:
+                    self.send_action_modify_stop_loss(action)
+                case ActionID.ModifyBuyTakeProfit | ActionID.ModifySellTakeProfit:
+                    self.send_action_modify_take_profit(action)
+                case ActionID.CloseBuy | ActionID.CloseSell:
+                    self.send_action_close(action)
+                case ActionID.AskAboveTarget:
+                    self.send_action_ask_above_target(action)
+                case ActionID.AskBelowTarget:
+                    self.send_action_ask_below_target(action)
+                case ActionID.BidAboveTarget:
+                    self.send_action_bid_above_target(action)
+                case ActionID.BidBelowTarget:
+                    self.send_action_bid_below_target(action)
+                case _:
+                    self._log.error(lambda: f"Sent invalid action ID: {action.ActionID}")
+                    raise
+        self.send_action_complete(CompleteAction())
+
     def deploy(self, strategy: StrategyAPI, analyst: AnalystAPI, manager: ManagerAPI) -> None:
-        system = EngineAPI(system_engine=self.system_management(),
-                           strategy_engine=strategy.strategy_management(),
-                           signal_engine=strategy.signal_management(),
-                           risk_engine=strategy.risk_management())
+        system = self.engine(strategy)
         while not system.is_terminated():
-            actions = []
-            while True:
-                update_id = self.receive_update_id()
-                match update_id:
-                    case UpdateID.Complete:
-                        actions += system.perform_update_complete(CompleteUpdate(analyst, manager))
-                        break
-                    case UpdateID.Account:
-                        actions += system.perform_update_account(AccountUpdate(analyst, manager, self.receive_update_account()))
-                    case UpdateID.Symbol:
-                        actions += system.perform_update_symbol(SymbolUpdate(analyst, manager, self.receive_update_symbol()))
-                    case UpdateID.OpenedBuy:
-                        actions += system.perform_update_opened_buy(PositionUpdate(analyst, manager, self.receive_update_bar(), self.receive_update_account(), self.receive_update_position()))
-                    case UpdateID.OpenedSell:
-                        actions += system.perform_update_opened_sell(PositionUpdate(analyst, manager, self.receive_update_bar(), self.receive_update_account(), self.receive_update_position()))
-                    case UpdateID.ModifiedBuyVolume:
-                        actions += system.perform_update_modified_volume_buy(PositionTradeUpdate(analyst, manager, self.receive_update_bar(), self.receive_update_account(), self.receive_update_position(), self.receive_update_trade()))
-                    case UpdateID.ModifiedBuyStopLoss:
-                        actions += system.perform_update_modified_stop_loss_buy(PositionUpdate(analyst, manager, self.receive_update_bar(), self.receive_update_account(), self.receive_update_position()))
-                    case UpdateID.ModifiedBuyTakeProfit:
-                        actions += system.perform_update_modified_take_profit_buy(PositionUpdate(analyst, manager, self.receive_update_bar(), self.receive_update_account(), self.receive_update_position()))
-                    case UpdateID.ModifiedSellVolume:
-                        actions += system.perform_update_modified_volume_sell(PositionTradeUpdate(analyst, manager, self.receive_update_bar(), self.receive_update_account(), self.receive_update_position(), self.receive_update_trade()))
-                    case UpdateID.ModifiedSellStopLoss:
-                        actions += system.perform_update_modified_stop_loss_sell(PositionUpdate(analyst, manager, self.receive_update_bar(), self.receive_update_account(), self.receive_update_position()))
-                    case UpdateID.ModifiedSellTakeProfit:
-                        actions += system.perform_update_modified_take_profit_sell(PositionUpdate(analyst, manager, self.receive_update_bar(), self.receive_update_account(), self.receive_update_position()))
-                    case UpdateID.ClosedBuy:
-                        actions += system.perform_update_closed_buy(TradeUpdate(analyst, manager, self.receive_update_bar(), self.receive_update_account(), self.receive_update_trade()))
-                    case UpdateID.ClosedSell:
-                        actions += system.perform_update_closed_sell(TradeUpdate(analyst, manager, self.receive_update_bar(), self.receive_update_account(), self.receive_update_trade()))
-                    case UpdateID.BarClosed:
-                        actions += system.perform_update_bar_closed(BarUpdate(analyst, manager, self.receive_update_bar()))
-                    case UpdateID.AskAboveTarget:
-                        actions += system.perform_update_ask_above_target(TickUpdate(analyst, manager, self.receive_update_target()))
-                    case UpdateID.AskBelowTarget:
-                        actions += system.perform_update_ask_below_target(TickUpdate(analyst, manager, self.receive_update_target()))
-                    case UpdateID.BidAboveTarget:
-                        actions += system.perform_update_bid_above_target(TickUpdate(analyst, manager, self.receive_update_target()))
-                    case UpdateID.BidBelowTarget:
-                        actions += system.perform_update_bid_below_target(TickUpdate(analyst, manager, self.receive_update_target()))
-                    case UpdateID.Shutdown:
-                        self._log.debug(lambda: "Shutdown")
-                        actions += system.perform_update_shutdown(CompleteUpdate(analyst, manager))
-                        break
-                    case _:
-                        self._log.error(lambda: f"Received invalid update ID: {update_id}")
-                        raise
-            for action in actions:
-                match action.ActionID:
-                    case ActionID.Complete:
-                        self.send_action_complete(action)
-                    case ActionID.OpenBuy | ActionID.OpenSell:
-                        self.send_action_open(action)
-                    case ActionID.ModifyBuyVolume | ActionID.ModifySellVolume:
-                        self.send_action_modify_volume(action)
-                    case ActionID.ModifyBuyStopLoss | ActionID.ModifySellStopLoss:
-                        self.send_action_modify_stop_loss(action)
-                    case ActionID.ModifyBuyTakeProfit | ActionID.ModifySellTakeProfit:
-                        self.send_action_modify_take_profit(action)
-                    case ActionID.CloseBuy | ActionID.CloseSell:
-                        self.send_action_close(action)
-                    case ActionID.AskAboveTarget:
-                        self.send_action_ask_above_target(action)
-                    case ActionID.AskBelowTarget:
-                        self.send_action_ask_below_target(action)
-                    case ActionID.BidAboveTarget:
-                        self.send_action_bid_above_target(action)
-                    case ActionID.BidBelowTarget:
-                        self.send_action_bid_below_target(action)
-                    case _:
-                        self._log.error(lambda: f"Sent invalid action ID: {action.ActionID}")
-                        raise
-            self.send_action_complete(CompleteAction())
+            self.dispatch(self.collect(system, analyst, manager))
                     
     @abstractmethod
     def run(self) -> None:
@@ -1,4 +1,3 @@
-import queue
 from typing import Type, Callable
 from datetime import datetime
 from dataclasses import dataclass
@@ -13,6 +12,7 @@ from Library.Analyst import AnalystAPI
 from Library.Manager import ManagerAPI
 from Library.Strategy import StrategyAPI
 from Library.System import SystemAPI
+from Library.System.Bus import QueueBusAPI
 
 from Library.Portfolio.Account import AccountAPI, AccountType, AssetType, MarginMode
 from Library.Universe.Contract import ContractAPI, CommissionMode, SwapMode, DayOfWeek
@@ -60,7 +60,7 @@ class TradingSystemAPI(SystemAPI):
         )
 
         self.api = api
-        self.queue: queue.Queue = queue.Queue()
+        self._bus: QueueBusAPI = QueueBusAPI()
 
         self._sync_buffer: list[BarAPI] = []
         self._initial_account: AccountAPI | None = None
@@ -326,26 +326,8 @@ class TradingSystemAPI(SystemAPI):
         except Exception:
             pass
 
-    def receive_update_id(self) -> UpdateID:
-        return self.queue.get()
-
-    def receive_update_account(self) -> AccountAPI:
-        return self.queue.get()
-
-    def receive_update_symbol(self) -> ContractAPI:
-        return self.queue.get()
-
-    def receive_update_position(self) -> PositionAPI:
-        return self.queue.get()
-
-    def receive_update_trade(self) -> TradeAPI:
-        return self.queue.get()
-
-    def receive_update_bar(self) -> BarAPI:
-        return self.queue.get()
-
-    def receive_update_target(self) -> TickAPI:
-        return self.queue.get()
+    def receive_update(self) -> tuple[UpdateID, tuple]:
+        return self._bus.get()
 
     def send_action_complete(self, action: CompleteAction) -> None:
         pass
@@ -479,8 +461,7 @@ class TradingSystemAPI(SystemAPI):
             self.api.Stop()
 
     def _enqueue_target(self, update_id: UpdateID, tick: _TickSnapshot) -> None:
-        self.queue.put(update_id)
-        self.queue.put(TickAPI(
+        self._bus.put(update_id, TickAPI(
             Timestamp=tick.Timestamp,
             Ask=tick.Ask,
             Bid=tick.Bid,
@@ -490,15 +471,14 @@ class TradingSystemAPI(SystemAPI):
             BidQuoteConversion=tick.BidQuoteConversion,
             symbol=self.manager.Symbol
         ))
-        self.queue.put(UpdateID.Complete)
+        self._bus.put(UpdateID.Complete)
 
     def on_bar_closed(self) -> None:
         try:
             last = self.api.Bars.LastBar
             bar = self._snapshot_bar(tick_volume=last.TickVolume)
-            self.queue.put(UpdateID.BarClosed)
-            self.queue.put(bar)
-            self.queue.put(UpdateID.Complete)
+            self._bus.put(UpdateID.BarClosed, bar)
+            self._bus.put(UpdateID.Complete)
             self._reset_running_bar(timestamp=last.OpenTime)
         except Exception as e:
             self._log.exception(lambda m=str(e): f"on_bar_closed: {m}")
@@ -515,11 +495,8 @@ class TradingSystemAPI(SystemAPI):
                 TakeProfit=pos.TakeProfit
             )
             update_id = UpdateID.OpenedBuy if int(pos.TradeType) == 0 else UpdateID.OpenedSell
-            self.queue.put(update_id)
-            self.queue.put(self._snapshot_bar(tick_volume=0.0))
-            self.queue.put(self._convert_account(self.api.Account))
-            self.queue.put(self._convert_position(pos))
-            self.queue.put(UpdateID.Complete)
+            self._bus.put(update_id, self._snapshot_bar(tick_volume=0.0), self._convert_account(self.api.Account), self._convert_position(pos))
+            self._bus.put(UpdateID.Complete)
         except Exception as e:
             self._log.exception(lambda m=str(e): f"on_position_opened: {m}")
             self.api.Stop()
@@ -537,32 +514,22 @@ class TradingSystemAPI(SystemAPI):
             if abs(pos.VolumeInUnits - last.Volume) > 1e-12:
                 trade = self._find_trade(pos.Id)
                 update_id = UpdateID.ModifiedBuyVolume if buy else UpdateID.ModifiedSellVolume
-                self.queue.put(update_id)
-                self.queue.put(self._snapshot_bar(tick_volume=0.0))
-                self.queue.put(self._convert_account(self.api.Account))
-                self.queue.put(self._convert_position(pos))
-                self.queue.put(self._convert_trade(trade) if trade is not None else None)
-                self.queue.put(UpdateID.Complete)
+                self._bus.put(update_id, self._snapshot_bar(tick_volume=0.0), self._convert_account(self.api.Account), self._convert_position(pos), self._convert_trade(trade) if trade is not None else None)
+                self._bus.put(UpdateID.Complete)
                 last.Volume = pos.VolumeInUnits
                 return
 
             if self._changed(last.StopLoss, pos.StopLoss):
                 update_id = UpdateID.ModifiedBuyStopLoss if buy else UpdateID.ModifiedSellStopLoss
-                self.queue.put(update_id)
-                self.queue.put(self._snapshot_bar(tick_volume=0.0))
-                self.queue.put(self._convert_account(self.api.Account))
-                self.queue.put(self._convert_position(pos))
-                self.queue.put(UpdateID.Complete)
+                self._bus.put(update_id, self._snapshot_bar(tick_volume=0.0), self._convert_account(self.api.Account), self._convert_position(pos))
+                self._bus.put(UpdateID.Complete)
                 last.StopLoss = pos.StopLoss
                 return
 
             if self._changed(last.TakeProfit, pos.TakeProfit):
                 update_id = UpdateID.ModifiedBuyTakeProfit if buy else UpdateID.ModifiedSellTakeProfit
-                self.queue.put(update_id)
-                self.queue.put(self._snapshot_bar(tick_volume=0.0))
-                self.queue.put(self._convert_account(self.api.Account))
-                self.queue.put(self._convert_position(pos))
-                self.queue.put(UpdateID.Complete)
+                self._bus.put(update_id, self._snapshot_bar(tick_volume=0.0), self._convert_account(self.api.Account), self._convert_position(pos))
+                self._bus.put(UpdateID.Complete)
                 last.TakeProfit = pos.TakeProfit
         except Exception as e:
             self._log.exception(lambda m=str(e): f"on_position_modified: {m}")
@@ -576,11 +543,8 @@ class TradingSystemAPI(SystemAPI):
             trade = self._find_trade(pos.Id)
             buy = int(pos.TradeType) == 0
             update_id = UpdateID.ClosedBuy if buy else UpdateID.ClosedSell
-            self.queue.put(update_id)
-            self.queue.put(self._snapshot_bar(tick_volume=0.0))
-            self.queue.put(self._convert_account(self.api.Account))
-            self.queue.put(self._convert_trade(trade) if trade is not None else None)
-            self.queue.put(UpdateID.Complete)
+            self._bus.put(update_id, self._snapshot_bar(tick_volume=0.0), self._convert_account(self.api.Account), self._convert_trade(trade) if trade is not None else None)
+            self._bus.put(UpdateID.Complete)
             self._positions.pop(pos.Id, None)
         except Exception as e:
             self._log.exception(lambda m=str(e): f"on_position_closed: {m}")
@@ -595,14 +559,11 @@ class TradingSystemAPI(SystemAPI):
         return abs(float(old) - float(new)) > 1e-12
 
     def on_shutdown(self) -> None:
-        self.queue.put(UpdateID.Shutdown)
+        self._bus.put(UpdateID.Shutdown)
 
     @timer
     def run(self) -> None:
-        self.queue.put(UpdateID.Account)
-        self.queue.put(self._convert_account(self.api.Account))
-        self.queue.put(UpdateID.Symbol)
-        self.queue.put(self._convert_symbol(self.api.Symbol))
-        self.queue.put(UpdateID.Complete)
+        self._bus.put(UpdateID.Account, self._convert_account(self.api.Account))
+        self._bus.put(UpdateID.Symbol, self._convert_symbol(self.api.Symbol))
+        self._bus.put(UpdateID.Complete)
         self.deploy(strategy=self.strategy, analyst=self.analyst, manager=self.manager)
-self.analyst, manager=self.manager)
@@ -1,13 +1,30 @@
-from Library.System.System import SystemAPI
-from Library.System.Trading import TradingSystemAPI
-from Library.System.Backtesting import BacktestingSystemAPI
-from Library.System.Optimization import OptimizationSystemAPI
-from Library.System.Learning import LearningSystemAPI
+from importlib import import_module
+
+_modules = {
+    "SystemAPI": "Library.System.System",
+    "FidelityType": "Library.System.Replay",
+    "TradingSystemAPI": "Library.System.Trading",
+    "BacktestingSystemAPI": "Library.System.Backtesting",
+    "SamplerType": "Library.System.Sampler",
+    "ExecutorType": "Library.System.Optimization",
+    "OptimizationSystemAPI": "Library.System.Optimization",
+    "PortfolioSystemAPI": "Library.System.Portfolio",
+    "LearningSystemAPI": "Library.System.Learning"
+}
+
+def __getattr__(name: str):
+    if name not in _modules:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    return getattr(import_module(_modules[name]), name)
 
 __all__ = [
     "SystemAPI",
+    "FidelityType",
     "TradingSystemAPI",
     "BacktestingSystemAPI",
+    "SamplerType",
+    "ExecutorType",
     "OptimizationSystemAPI",
+    "PortfolioSystemAPI",
     "LearningSystemAPI"
 ]
@@ -0,0 +1,77 @@
+import pytest
+import numpy as np
+import polars as pl
+
+from Library.Analyst import MarketAPI, ExpressionsAPI, IndicatorAPI
+
+OFFSETS = range(1, 60)
+SHIFTS = [0, 1, 2]
+OPERATIONS = ["over", "under", "crossover", "crossunder"]
+RULES = ["filter_buy", "filter_sell", "signal_buy", "signal_sell"]
+INDICATORS = [("SMA", [20]), ("HMA", [16]), ("EMAC", [5, 30]), ("AROON", [14]), ("CCI", [14]), ("MACD", [12, 26, 9]), ("PSAR", [0.02, 0.2]), ("ATR", [14]), ("TT", []), ("FF", [])]
+
+@pytest.fixture(scope="module")
+def market():
+    rng = np.random.default_rng(11)
+    fast = 100.0 + np.cumsum(rng.normal(size=64))
+    slow = 100.0 + np.cumsum(rng.normal(size=64) * 0.5)
+    fast[:5] = np.nan
+    slow[30] = np.nan
+    market = MarketAPI()
+    market.init_data(pl.DataFrame({"Fast": fast, "Slow": slow, "Volume": rng.integers(0, 200, 64)}))
+    return market
+
+@pytest.fixture(scope="module")
+def expressions(market):
+    return ExpressionsAPI({name: name for name in market.data().columns})
+
+def evaluate(market, expression):
+    return market.data().select(expression).to_series().to_numpy()
+
+@pytest.mark.parametrize("operation", OPERATIONS)
+@pytest.mark.parametrize("shift", SHIFTS)
+@pytest.mark.parametrize("other", ["Slow", 100.0, 0, None])
+def test_expression_matches_series(market, expressions, operation, shift, other):
+    series_other = getattr(market, other) if isinstance(other, str) else other
+    expression_other = getattr(expressions, other) if isinstance(other, str) else other
+    values = evaluate(market, getattr(expressions.Fast, operation)(expression_other, shift))
+    for offset in OFFSETS:
+        market.update_offset(offset)
+        assert values[values.shape[0] - offset] == getattr(market.Fast, operation)(series_other, shift)
+    market.update_offset(1)
+
+@pytest.mark.parametrize("operation", OPERATIONS)
+def test_expression_casts_integer_columns(market, expressions, operation):
+    values = evaluate(market, getattr(expressions.Volume, operation)(100, 1))
+    for offset in OFFSETS:
+        market.update_offset(offset)
+        assert values[values.shape[0] - offset] == getattr(market.Volume, operation)(100, 1)
+    market.update_offset(1)
+
+@pytest.fixture(scope="module")
+def bars():
+    rng = np.random.default_rng(3)
+    close = 100.0 + np.cumsum(rng.normal(size=400))
+    close[150] = np.nan
+    market = MarketAPI()
+    market.init_data(pl.DataFrame({"HighPrice": close + rng.random(400), "LowPrice": close - rng.random(400), "ClosePrice": close}))
+    return market
+
+@pytest.mark.parametrize("indicator, parameters", INDICATORS)
+def test_vectorized_rules_match_lambdas(bars, indicator, parameters):
+    cache, IndicatorAPI.Cache = IndicatorAPI.Cache, None
+    try:
+        vectorized = IndicatorAPI(indicator, parameters, vectorized=True)
+        lambdas = IndicatorAPI(indicator, parameters)
+        vectorized.init_data(bars)
+        lambdas.init_data(bars)
+        for offset in range(1, bars.data().height - 3):
+            for component in (bars, vectorized, lambdas):
+                component.update_offset(offset)
+            for shift in SHIFTS:
+                for rule in RULES:
+                    assert getattr(vectorized, rule)(bars, shift) == getattr(lambdas, rule)(bars, shift)
+        assert all(values is not None for values in vectorized._rules.values())
+    finally:
+        IndicatorAPI.Cache = cache
+        bars.update_offset(1)
@@ -0,0 +1,95 @@
+import math
+import talib
+import pytest
+import numpy as np
+import polars as pl
+
+from Library.Analyst import IndicatorCacheAPI, MarketAPI, NodeAPI, GraphAPI, IndicatorAPI
+
+def hull(window):
+    return NodeAPI("WMA", NodeAPI("HULL", NodeAPI("WMA", "ClosePrice", timeperiod=math.floor(window / 2)), NodeAPI("WMA", "ClosePrice", timeperiod=window)), timeperiod=math.floor(math.sqrt(window)))
+
+def hma(close, window):
+    return talib.WMA(2 * talib.WMA(close, timeperiod=math.floor(window / 2)) - talib.WMA(close, timeperiod=window), timeperiod=math.floor(math.sqrt(window)))
+
+REFERENCES = [
+    ("SMA", [20], lambda h, l, c, v: talib.SMA(c, timeperiod=20)),
+    ("EMA", [20], lambda h, l, c, v: talib.EMA(c, timeperiod=20)),
+    ("WMA", [20], lambda h, l, c, v: talib.WMA(c, timeperiod=20)),
+    ("HMA", [21], lambda h, l, c, v: hma(c, 21)),
+    ("DEMA", [20], lambda h, l, c, v: talib.DEMA(c, timeperiod=20)),
+    ("TEMA", [20], lambda h, l, c, v: talib.TEMA(c, timeperiod=20)),
+    ("TRIMA", [20], lambda h, l, c, v: talib.TRIMA(c, timeperiod=20)),
+    ("KAMA", [20], lambda h, l, c, v: talib.KAMA(c, timeperiod=20)),
+    ("SMAC", [10, 30], lambda h, l, c, v: (talib.SMA(c, timeperiod=10), talib.SMA(c, timeperiod=30))),
+    ("EMAC", [10, 30], lambda h, l, c, v: (talib.EMA(c, timeperiod=10), talib.EMA(c, timeperiod=30))),
+    ("WMAC", [10, 30], lambda h, l, c, v: (talib.WMA(c, timeperiod=10), talib.WMA(c, timeperiod=30))),
+    ("HMAC", [10, 30], lambda h, l, c, v: (hma(c, 10), hma(c, 30))),
+    ("DEMAC", [10, 30], lambda h, l, c, v: (talib.DEMA(c, timeperiod=10), talib.DEMA(c, timeperiod=30))),
+    ("TEMAC", [10, 30], lambda h, l, c, v: (talib.TEMA(c, timeperiod=10), talib.TEMA(c, timeperiod=30))),
+    ("TRIMAC", [10, 30], lambda h, l, c, v: (talib.TRIMA(c, timeperiod=10), talib.TRIMA(c, timeperiod=30))),
+    ("KAMAC", [10, 30], lambda h, l, c, v: (talib.KAMA(c, timeperiod=10), talib.KAMA(c, timeperiod=30))),
+    ("AROON", [14], lambda h, l, c, v: talib.AROON(h, l, timeperiod=14)),
+    ("CCI", [14], lambda h, l, c, v: talib.CCI(h, l, c, timeperiod=14)),
+    ("MACD", [12, 26, 9], lambda h, l, c, v: talib.MACD(c, fastperiod=12, slowperiod=26, signalperiod=9)),
+    ("PSAR", [0.02, 0.2], lambda h, l, c, v: talib.SAR(h, l, acceleration=0.02, maximum=0.2)),
+    ("ADOSC", [3, 10], lambda h, l, c, v: talib.ADOSC(h, l, c, v, fastperiod=3, slowperiod=10)),
+    ("ATR", [14], lambda h, l, c, v: talib.ATR(h, l, c, timeperiod=14))
+]
+
+@pytest.fixture(scope="module")
+def market():
+    rng = np.random.default_rng(5)
+    close = 100.0 + np.cumsum(rng.normal(size=1000))
+    market = MarketAPI()
+    market.init_data(pl.DataFrame({"HighPrice": close + rng.random(1000), "LowPrice": close - rng.random(1000), "ClosePrice": close, "TickVolume": rng.integers(1, 100, 1000)}))
+    return market
+
+def test_node_key_identifies_structure():
+    assert NodeAPI("SMA", "ClosePrice", timeperiod=np.int64(20)).Key == NodeAPI("SMA", "ClosePrice", timeperiod=20).Key
+    assert NodeAPI("SMA", "ClosePrice", timeperiod=20).Key != NodeAPI("SMA", "OpenPrice", timeperiod=20).Key
+    assert hull(20).digest() == hull(20).digest() != hull(21).digest()
+
+def test_graph_matches_talib(market):
+    close = market.ClosePrice.values()
+    expected = talib.WMA(2 * talib.WMA(close, timeperiod=10) - talib.WMA(close, timeperiod=20), timeperiod=4)
+    actual, = GraphAPI(market).evaluate(hull(20))
+    np.testing.assert_array_equal(actual, expected)
+
+def test_graph_flattens_outputs(market):
+    down, up = GraphAPI(market).evaluate(NodeAPI("AROON", "HighPrice", "LowPrice", timeperiod=14))
+    expected_down, expected_up = talib.AROON(market.HighPrice.values(), market.LowPrice.values(), timeperiod=14)
+    np.testing.assert_array_equal(down, expected_down)
+    np.testing.assert_array_equal(up, expected_up)
+
+def test_graph_shares_nodes(market):
+    graph = GraphAPI(market)
+    graph.evaluate(NodeAPI("WMA", "ClosePrice", timeperiod=20), NodeAPI("WMA", "ClosePrice", timeperiod=10))
+    graph.evaluate(hull(20), hull(40))
+    assert graph.Computed == 7
+
+def test_graph_window(market):
+    actual, = GraphAPI(market, window=100).evaluate(NodeAPI("SMA", "ClosePrice", timeperiod=20))
+    np.testing.assert_array_equal(actual, talib.SMA(market.ClosePrice.values()[-100:], timeperiod=20))
+
+def test_graph_cache(market):
+    cache = IndicatorCacheAPI()
+    GraphAPI(market, cache=cache).evaluate(hull(20))
+    graph = GraphAPI(market, cache=cache)
+    graph.evaluate(hull(20), NodeAPI("WMA", "ClosePrice", timeperiod=20))
+    assert graph.Computed == 0
+    assert cache.statistics()["Entries"] == 4
+
+@pytest.mark.parametrize("indicator, parameters, reference", REFERENCES)
+def test_indicator_graph_matches_talib(market, indicator, parameters, reference):
+    expected = reference(market.HighPrice.values(), market.LowPrice.values(), market.ClosePrice.values(), market.TickVolume.values().astype(np.float64))
+    expected = expected if isinstance(expected, tuple) else (expected,)
+    actual = IndicatorAPI(indicator, parameters).calculate(market)
+    assert actual.width == len(expected)
+    for series, values in zip(actual.iter_columns(), expected):
+        np.testing.assert_array_equal(series.to_numpy(), values)
+
+def test_indicator_inputs_follow_graph(market):
+    assert [series.data().name for series in IndicatorAPI("ATR", [14]).inputs(market)] == ["HighPrice", "LowPrice", "ClosePrice"]
+    assert [series.data().name for series in IndicatorAPI("HMAC", [10, 30]).inputs(market)] == ["ClosePrice"]
+    assert [series.data().name for series in IndicatorAPI("TT", []).inputs(market)] == ["ClosePrice"]
@@ -0,0 +1,76 @@
+import math
+import talib
+import pytest
+import numpy as np
+
+from Library.Analyst.Kernels import (
+    SMAKernelAPI,
+    EMAKernelAPI,
+    WMAKernelAPI,
+    HMAKernelAPI,
+    DEMAKernelAPI,
+    TEMAKernelAPI,
+    KAMAKernelAPI,
+    ATRKernelAPI,
+    RSIKernelAPI,
+    CrossKernelAPI
+)
+
+WINDOWS = [2, 5, 14, 30, 49]
+
+@pytest.fixture(scope="module")
+def market():
+    rng = np.random.default_rng(7)
+    close = 100.0 + np.cumsum(rng.normal(size=2000))
+    high = close + rng.random(2000)
+    low = close - rng.random(2000)
+    return high, low, close
+
+def hma(close, window):
+    return talib.WMA(2 * talib.WMA(close, timeperiod=math.floor(window / 2)) - talib.WMA(close, timeperiod=window), timeperiod=math.floor(math.sqrt(window)))
+
+def assert_equivalent(actual, expected, rtol=1e-10):
+    assert np.array_equal(np.isnan(actual), np.isnan(expected))
+    np.testing.assert_allclose(actual, expected, rtol=rtol, atol=0.0, equal_nan=True)
+
+@pytest.mark.parametrize("window", WINDOWS)
+@pytest.mark.parametrize("kernel, function", [
+    (SMAKernelAPI, talib.SMA),
+    (EMAKernelAPI, talib.EMA),
+    (WMAKernelAPI, talib.WMA),
+    (DEMAKernelAPI, talib.DEMA),
+    (TEMAKernelAPI, talib.TEMA),
+    (KAMAKernelAPI, talib.KAMA),
+    (RSIKernelAPI, talib.RSI)
+])
+def test_close(market, kernel, function, window):
+    _, _, close = market
+    assert_equivalent(kernel(window).seed(close)[:, 0], function(close, timeperiod=window))
+
+@pytest.mark.parametrize("window", WINDOWS)
+def test_atr(market, window):
+    high, low, close = market
+    assert_equivalent(ATRKernelAPI(window).seed(high, low, close)[:, 0], talib.ATR(high, low, close, timeperiod=window))
+
+@pytest.mark.parametrize("window", [4, 9, 25, 49])
+def test_hma(market, window):
+    _, _, close = market
+    assert_equivalent(HMAKernelAPI(window).seed(close)[:, 0], hma(close, window), rtol=1e-8)
+
+def test_cross(market):
+    _, _, close = market
+    output = CrossKernelAPI(SMAKernelAPI(5), EMAKernelAPI(20)).seed(close)
+    assert_equivalent(output[:, 0], talib.SMA(close, timeperiod=5))
+    assert_equivalent(output[:, 1], talib.EMA(close, timeperiod=20))
+
+def test_update(market):
+    _, _, close = market
+    kernel = EMAKernelAPI(14)
+    kernel.seed(close[:1500])
+    actual = np.array([kernel.update(value)[0] for value in close[1500:]])
+    assert_equivalent(actual, talib.EMA(close, timeperiod=14)[1500:])
+
+def test_leading_nan(market):
+    _, _, close = market
+    shifted = np.concatenate(([np.nan] * 10, close))
+    assert_equivalent(SMAKernelAPI(5).seed(shifted)[:, 0], talib.SMA(shifted, timeperiod=5))
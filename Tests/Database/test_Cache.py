@@ -0,0 +1,97 @@
+import pytest
+
+from datetime import date, datetime, timedelta
+
+from Library.Database.Dataframe import pl
+from Library.Database.Cache import CacheAPI
+
+@pytest.fixture
+def market():
+    timestamps = [datetime(2024, 1, 1) + timedelta(hours=6 * i) for i in range(800)]
+    return pl.DataFrame({"Timestamp": timestamps, "OpenPrice": [float(i) for i in range(len(timestamps))]})
+
+@pytest.fixture
+def pulls():
+    return []
+
+@pytest.fixture
+def pull(market, pulls):
+    def fn(start, stop):
+        pulls.append((start, stop))
+        return market.filter((pl.col("Timestamp") >= start) & (pl.col("Timestamp") < stop))
+    return fn
+
+def test_partitions():
+    assert CacheAPI.partitions(date(2024, 11, 15), date(2025, 2, 1)) == [
+        (date(2024, 11, 1), date(2024, 12, 1)),
+        (date(2024, 12, 1), date(2025, 1, 1)),
+        (date(2025, 1, 1), date(2025, 2, 1))
+    ]
+
+def test_read_through(tmp_path, market, pull, pulls):
+    cache = CacheAPI(path=tmp_path, key=("Broker", "Group", "EURUSD", "H6"), pull=pull)
+    expected = market.filter((pl.col("Timestamp") >= datetime(2024, 2, 10)) & (pl.col("Timestamp") < datetime(2024, 4, 5)))
+    assert cache.load(date(2024, 2, 10), date(2024, 4, 5)).equals(expected)
+    assert len(pulls) == 3
+    assert cache.load(date(2024, 2, 10), date(2024, 4, 5)).equals(expected)
+    assert len(pulls) == 3
+    assert (tmp_path / "Broker" / "Group" / "EURUSD" / "H6" / "2024-03.arrow").exists()
+
+def test_incremental_fill(tmp_path, pull, pulls):
+    cache = CacheAPI(path=tmp_path, key="EURUSD", pull=pull)
+    cache.load(date(2024, 2, 1), date(2024, 3, 1))
+    cache.load(date(2024, 1, 1), date(2024, 4, 1))
+    assert pulls == [(date(2024, 2, 1), date(2024, 3, 1)), (date(2024, 1, 1), date(2024, 2, 1)), (date(2024, 3, 1), date(2024, 4, 1))]
+
+def test_window(tmp_path, pull):
+    cache = CacheAPI(path=tmp_path, key="EURUSD", pull=pull)
+    df = cache.load(date(2024, 3, 2), date(2024, 3, 5), window=50)
+    assert df.height == 50 + 12
+    assert df["Timestamp"][50] == datetime(2024, 3, 2)
+
+def test_watermark(tmp_path, pull, pulls):
+    watermark = {"UpdatedAt": datetime(2024, 6, 1)}
+    cache = CacheAPI(path=tmp_path, key="EURUSD", pull=pull, watermark=lambda start, stop: watermark["UpdatedAt"])
+    cache.load(date(2024, 1, 1), date(2024, 2, 1))
+    cache.load(date(2024, 1, 1), date(2024, 2, 1))
+    assert len(pulls) == 1
+    watermark["UpdatedAt"] = datetime(2024, 7, 1)
+    cache.load(date(2024, 1, 1), date(2024, 2, 1))
+    assert len(pulls) == 2
+
+def test_invalidate(tmp_path, pull, pulls):
+    cache = CacheAPI(path=tmp_path, key="EURUSD", pull=pull)
+    cache.load(date(2024, 1, 1), date(2024, 3, 1))
+    cache.invalidate(start=date(2024, 2, 1))
+    cache.load(date(2024, 1, 1), date(2024, 3, 1))
+    assert pulls[-1] == (date(2024, 2, 1), date(2024, 3, 1))
+    assert len(pulls) == 3
+
+def test_open_month_pulls_new_rows(tmp_path):
+    today = date.today()
+    start, stop = today.replace(day=1), CacheAPI.partitions(today, today + timedelta(days=1))[0][1]
+    rows = {"Timestamp": [datetime.combine(start, datetime.min.time())], "OpenPrice": [1.0]}
+    pulls = []
+    def pull(partition_start, partition_stop):
+        pulls.append((partition_start, partition_stop))
+        return pl.DataFrame(rows).filter((pl.col("Timestamp") >= partition_start) & (pl.col("Timestamp") < partition_stop))
+    cache = CacheAPI(path=tmp_path, key="EURUSD", pull=pull)
+    assert cache.load(start, stop).height == 1
+    rows["Timestamp"].append(datetime.combine(today, datetime.min.time()) + timedelta(hours=1))
+    rows["OpenPrice"].append(2.0)
+    assert cache.load(start, stop)["OpenPrice"].to_list() == [1.0, 2.0]
+    assert pulls == [(start, stop), (start, stop)]
+    assert cache.load(start, stop)["OpenPrice"].to_list() == [1.0, 2.0]
+    assert pulls[-1] == (today, stop)
+
+def test_open_month_with_watermark(tmp_path, pull, pulls):
+    today = date.today()
+    start, stop = today.replace(day=1), CacheAPI.partitions(today, today + timedelta(days=1))[0][1]
+    watermark = {"UpdatedAt": datetime(2024, 6, 1)}
+    cache = CacheAPI(path=tmp_path, key="EURUSD", pull=pull, watermark=lambda start, stop: watermark["UpdatedAt"])
+    cache.load(start, stop)
+    cache.load(start, stop)
+    assert len(pulls) == 1
+    watermark["UpdatedAt"] = datetime(2024, 7, 1)
+    cache.load(start, stop)
+    assert len(pulls) == 2
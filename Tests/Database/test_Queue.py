@@ -0,0 +1,62 @@
+import os
+import time
+import pytest
+import threading
+
+from Library.Database.Queue import SpoolQueueAPI, PostgresQueueAPI
+
+@pytest.fixture
+def spool(tmp_path):
+    return SpoolQueueAPI(path=tmp_path, namespace="Optimization", lease=60.0)
+
+def test_publish_lease_complete(spool):
+    assert spool.publish("A", {"Window": 10})
+    assert not spool.publish("A", {"Window": 10})
+    assert spool.lease("Worker-1") == ("A", {"Window": 10})
+    assert not spool.publish("A", {"Window": 10})
+    assert spool.lease("Worker-2") is None
+    assert spool.collect(["A"]) == {}
+    spool.complete("A", "Worker-1", ("Statistics", None))
+    assert spool.collect(["A", "B"]) == {"A": ("Statistics", None)}
+    assert spool.collect(["A"]) == {}
+
+def test_expired_lease(spool, tmp_path):
+    spool.publish("A", 1)
+    assert spool.lease("Worker-1") == ("A", 1)
+    assert spool.renew("A", "Worker-1")
+    leased = tmp_path / "Optimization" / "Leased" / "A@Worker-1"
+    os.utime(leased, (time.time() - 120.0, time.time() - 120.0))
+    assert spool.lease("Worker-2") == ("A", 1)
+    assert not spool.renew("A", "Worker-1")
+    spool.complete("A", "Worker-2", 2)
+    assert spool.collect(["A"]) == {"A": 2}
+
+def test_concurrent_lease(spool):
+    tasks = [f"T{i:03d}" for i in range(200)]
+    for task in tasks:
+        spool.publish(task, task)
+    claimed = []
+    def work(worker):
+        while (task := spool.lease(worker)) is not None:
+            claimed.append(task[0])
+            spool.complete(task[0], worker, task[1])
+    workers = [threading.Thread(target=work, args=(f"Worker-{i}",)) for i in range(8)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    assert sorted(claimed) == tasks
+    assert spool.collect(tasks) == {task: task for task in tasks}
+
+def test_postgres(db):
+    queue = PostgresQueueAPI(database=db, namespace="Optimization", lease=0.0, table="TestQueue")
+    assert queue.publish("A", {"Window": 10})
+    assert not queue.publish("A", {"Window": 10})
+    assert queue.lease("Worker-1") == ("A", {"Window": 10})
+    time.sleep(0.01)
+    assert queue.lease("Worker-2") == ("A", {"Window": 10})
+    assert not queue.renew("A", "Worker-1")
+    queue.complete("A", "Worker-2", ("Statistics", None))
+    assert queue.lease("Worker-3") is None
+    assert queue.collect(["A"]) == {"A": ("Statistics", None)}
+    assert queue.collect(["A"]) == {}
@@ -0,0 +1,141 @@
+import pytest
+import numpy as np
+import polars as pl
+
+from datetime import date, datetime, timedelta
+
+from Library.Manager.Statistics import StatisticsAPI
+
+BALANCE = 10000.0
+
+RUNS = [
+    ("Randomized", 120, ("Buy", "Sell")),
+    ("Empty", 0, ("Buy", "Sell")),
+    ("Single", 1, ("Buy",)),
+    ("Buy", 25, ("Buy",)),
+    ("Sell", 25, ("Sell",))
+]
+
+def trades(rng, count, sides):
+    rows, timestamp, position = [], datetime(2024, 1, 1), 0
+    for index in range(count):
+        position += rng.random() < 0.7
+        entry = timestamp + timedelta(hours=int(rng.integers(1, 100)))
+        timestamp = entry + timedelta(minutes=int(rng.integers(1, 5000)))
+        pnl = float(rng.normal(0, 50)) if rng.random() < 0.8 else 0.0
+        rows.append({
+            "TradeID": index, "PositionID": int(position), "PositionType": "Normal", "TradeType": sides[int(rng.integers(len(sides)))],
+            "EntryTimestamp": entry, "ExitTimestamp": timestamp, "EntryPrice": 1.0, "ExitPrice": 1.1, "Volume": 1.0,
+            "Points": float(rng.normal(0, 10)), "Pips": float(rng.normal(0, 1)),
+            "GrossPnL": pnl + 1.0, "CommissionPnL": -0.5, "SwapPnL": -0.5, "NetPnL": pnl,
+            "DrawdownPoints": -1.0, "DrawdownPips": -0.1, "DrawdownPnL": -1.0, "DrawdownReturn": -0.01,
+            "NetReturn": pnl / BALANCE, "NetLogReturn": float(np.log1p(pnl / BALANCE)), "NetReturnDrawdown": 0.0,
+            "BaseBalance": BALANCE, "EntryBalance": BALANCE, "ExitBalance": BALANCE + pnl
+        })
+    return rows
+
+def streaks(rows, side):
+    rows = sorted(rows, key=lambda row: row["ExitTimestamp"])
+    longest, start, run = {True: (0, 0), False: (0, 0)}, 0, 0
+    for index, row in enumerate(rows):
+        winning = row["NetPnL"] > 0
+        start, run = (start, run + 1) if index and (rows[index - 1]["NetPnL"] > 0) == winning else (index, 1)
+        if run > longest[winning][1]:
+            longest[winning] = (start, run)
+    return {winning: sum(side is None or row["TradeType"] == side for row in rows[start:start + run]) for winning, (start, run) in longest.items()}
+
+def reference(rows, side):
+    selected = [row for row in rows if side is None or row["TradeType"] == side]
+    pnls = [row["NetPnL"] for row in sorted(selected, key=lambda row: row["ExitTimestamp"])]
+    winning = [pnl for pnl in pnls if pnl > 0]
+    losing = [pnl for pnl in pnls if pnl <= 0]
+    balance = peak = BALANCE
+    drawdowns, peaks = [], []
+    for pnl in pnls:
+        balance += pnl
+        peak = max(peak, balance)
+        drawdowns.append(peak - balance)
+        peaks.append(peak)
+    longest = streaks(rows, side)
+    return {
+        StatisticsAPI.TOTALTRADESVALUE: len(pnls),
+        StatisticsAPI.WINNINGTRADESVALUE: len(winning),
+        StatisticsAPI.LOSINGTRADESVALUE: len(losing),
+        StatisticsAPI.WINNINGRATEPERC: len(winning) / len(pnls) * 100 if pnls else 0.0,
+        StatisticsAPI.NETPNLVALUE: sum(pnls),
+        StatisticsAPI.GROSSPNLVALUE: sum(row["GrossPnL"] for row in selected),
+        StatisticsAPI.AVERAGETRADE: sum(pnls) / len(pnls) if pnls else 0.0,
+        StatisticsAPI.PROFITFACTOR: sum(winning) / abs(sum(losing)) if sum(losing) else 0.0,
+        StatisticsAPI.MAXDRAWDOWNVALUE: max(drawdowns, default=0.0),
+        StatisticsAPI.MAXDRAWDOWNPERC: max(drawdowns) / max(peaks) * 100 if pnls else 0.0,
+        StatisticsAPI.MAXWINNINGSTREAK: longest[True],
+        StatisticsAPI.MAXLOSINGSTREAK: longest[False]
+    }
+
+@pytest.fixture(scope="module")
+def runs():
+    rng = np.random.default_rng(18)
+    schema = pl.DataFrame(trades(rng, 1, ("Buy",))).schema
+    runs = {}
+    for backtest, (name, count, sides) in enumerate(RUNS):
+        rows = trades(rng, count, sides)
+        runs[name] = (backtest, rows, pl.DataFrame(rows, schema=schema), date(2024, 1, 1), date(2024, 1, 1) + timedelta(days=int(rng.integers(30, 400))))
+    return runs
+
+@pytest.fixture(scope="module")
+def batched(runs):
+    trades_df = pl.concat([trades_df.with_columns(pl.lit(backtest).alias(StatisticsAPI.BACKTEST_ID_LABEL)) for backtest, _, trades_df, _, _ in runs.values()])
+    runs_df = pl.DataFrame({
+        StatisticsAPI.BACKTEST_ID_LABEL: [backtest for backtest, _, _, _, _ in runs.values()],
+        StatisticsAPI.INITIAL_BALANCE_LABEL: [BALANCE] * len(runs),
+        StatisticsAPI.START_TIMESTAMP_LABEL: [start for _, _, _, start, _ in runs.values()],
+        StatisticsAPI.STOP_TIMESTAMP_LABEL: [stop for _, _, _, _, stop in runs.values()]
+    }, schema_overrides={StatisticsAPI.BACKTEST_ID_LABEL: trades_df.schema[StatisticsAPI.BACKTEST_ID_LABEL]})
+    return StatisticsAPI.split(StatisticsAPI.batch(trades_df, runs_df))
+
+@pytest.mark.parametrize("name", [name for name, _, _ in RUNS])
+def test_batch_matches_summary(runs, batched, name):
+    backtest, _, trades_df, start, stop = runs[name]
+    _, _, expected = StatisticsAPI.summary(trades_df, BALANCE, start, stop)
+    actual = batched[backtest]
+    assert actual.columns == expected.columns
+    assert actual[StatisticsAPI.STATISTICS_METRICS_LABEL].to_list() == StatisticsAPI.Metrics
+    for column in expected.columns[1:]:
+        np.testing.assert_allclose(actual[column].to_numpy(), expected[column].to_numpy(), rtol=1e-12, atol=1e-12, err_msg=f"{name}: {column}")
+
+@pytest.mark.parametrize("name", [name for name, _, _ in RUNS])
+@pytest.mark.parametrize("side, column", [(None, StatisticsAPI.TOTAL_METRICS_INDIVIDUAL), ("Buy", StatisticsAPI.BUY_METRICS_INDIVIDUAL), ("Sell", StatisticsAPI.SELL_METRICS_INDIVIDUAL)])
+def test_summary_matches_reference(runs, name, side, column):
+    _, rows, trades_df, start, stop = runs[name]
+    _, _, metrics_df = StatisticsAPI.summary(trades_df, BALANCE, start, stop)
+    metrics = dict(zip(metrics_df[StatisticsAPI.STATISTICS_METRICS_LABEL], metrics_df[column]))
+    for metric, value in reference(rows, side).items():
+        assert metrics[metric] == pytest.approx(value, rel=1e-9, abs=1e-9), f"{name}: {metric}"
+
+@pytest.mark.parametrize("name", [name for name, _, _ in RUNS])
+def test_summary_aggregates_positions(runs, name):
+    _, rows, trades_df, start, stop = runs[name]
+    individual_df, aggregated_df, metrics_df = StatisticsAPI.summary(trades_df, BALANCE, start, stop)
+    assert individual_df["ExitTimestamp"].is_sorted() and aggregated_df["ExitTimestamp"].is_sorted()
+    assert aggregated_df.height == len({row["PositionID"] for row in rows})
+    assert aggregated_df["NetPnL"].sum() == pytest.approx(sum(row["NetPnL"] for row in rows))
+    total = metrics_df.filter(pl.col(StatisticsAPI.STATISTICS_METRICS_LABEL) == StatisticsAPI.TOTALTRADESVALUE)
+    assert total[StatisticsAPI.TOTAL_METRICS_AGGREGATED].item() == aggregated_df.height
+
+def test_summary_combines_symbols(runs):
+    _, buy_rows, buy_df, start, _ = runs["Buy"]
+    _, sell_rows, sell_df, _, stop = runs["Sell"]
+    offset = max(row["PositionID"] for row in buy_rows) + 1
+    sell_rows = [{**row, "PositionID": row["PositionID"] + offset} for row in sell_rows]
+    trades_df = pl.concat([
+        buy_df.with_columns(pl.lit("EURUSD").alias("Symbol")),
+        sell_df.with_columns(pl.col("PositionID") + offset, pl.lit("GBPUSD").alias("Symbol"))
+    ])
+    individual_df, aggregated_df, metrics_df = StatisticsAPI.summary(trades_df, BALANCE, start, stop)
+    _, _, expected_df = StatisticsAPI.summary(trades_df.drop("Symbol"), BALANCE, start, stop)
+    assert individual_df["ExitTimestamp"].is_sorted() and individual_df["Symbol"].n_unique() == 2
+    assert aggregated_df.height == len({row["PositionID"] for row in buy_rows + sell_rows})
+    assert metrics_df.equals(expected_df)
+    metrics = dict(zip(metrics_df[StatisticsAPI.STATISTICS_METRICS_LABEL], metrics_df[StatisticsAPI.TOTAL_METRICS_INDIVIDUAL]))
+    for metric, value in reference(buy_rows + sell_rows, None).items():
+        assert metrics[metric] == pytest.approx(value, rel=1e-9, abs=1e-9), metric
@@ -0,0 +1,132 @@
+import pytest
+import numpy as np
+
+from enum import Enum
+from dataclasses import dataclass
+
+from Library.System.Book import BookAPI, TriggerType
+
+class TradeType(Enum):
+    Buy = 0
+    Sell = 1
+
+@dataclass
+class Price:
+    Price: float | None
+
+@dataclass
+class Position:
+    PositionID: int
+    TradeType: TradeType
+    StopLoss: Price
+    TakeProfit: Price
+    Volume: float = 1.0
+
+def position(pid, trade_type, stop_loss=None, take_profit=None):
+    return Position(pid, trade_type, Price(stop_loss), Price(take_profit))
+
+def baseline(positions, low_ask, low_bid, high_ask, high_bid, open_ask, open_bid):
+    triggered = []
+    for position in positions:
+        stop_loss, take_profit = position.StopLoss.Price, position.TakeProfit.Price
+        match position.TradeType:
+            case TradeType.Buy:
+                if stop_loss is not None:
+                    if low_bid <= stop_loss:
+                        triggered.append((position.PositionID, TriggerType.Low))
+                        continue
+                    if open_bid <= stop_loss:
+                        triggered.append((position.PositionID, TriggerType.Open))
+                        continue
+                if take_profit is not None:
+                    if high_bid >= take_profit:
+                        triggered.append((position.PositionID, TriggerType.High))
+                        continue
+                    if open_bid >= take_profit:
+                        triggered.append((position.PositionID, TriggerType.Open))
+                        continue
+            case TradeType.Sell:
+                if stop_loss is not None:
+                    if high_ask >= stop_loss:
+                        triggered.append((position.PositionID, TriggerType.High))
+                        continue
+                    if open_ask >= stop_loss:
+                        triggered.append((position.PositionID, TriggerType.Open))
+                        continue
+                if take_profit is not None:
+                    if low_ask <= take_profit:
+                        triggered.append((position.PositionID, TriggerType.Low))
+                        continue
+                    if open_ask <= take_profit:
+                        triggered.append((position.PositionID, TriggerType.Open))
+                        continue
+    return triggered
+
+def test_free_list_reuses_slots():
+    book = BookAPI(TradeType.Buy, capacity=2)
+    positions = [position(pid, TradeType.Buy, 1.0, 2.0) for pid in (1, 2, 3)]
+    for item in positions:
+        book.update(item)
+    assert len(book) == 3 and len(book.TradeType) == 4
+    assert [book.find(pid) for pid in (1, 2, 3)] == positions
+    slot = book._slots[2]
+    book.delete(2)
+    assert book.find(2) is None and len(book) == 2
+    assert book.TradeType[slot] == 0 and np.isnan(book.StopLoss[slot]) and np.isnan(book.TakeProfit[slot])
+    book.update(position(4, TradeType.Sell, 3.0))
+    assert book._slots[4] == slot and book.TradeType[slot] == -1
+    assert len(book.TradeType) == 4
+    for pid in (5, 6):
+        book.update(position(pid, TradeType.Buy))
+    assert len(book) == 5 and len(book.TradeType) == 8
+    assert sorted(book._slots.values()) == sorted(set(book._slots.values()))
+
+def test_update_keeps_slot():
+    book = BookAPI(TradeType.Buy)
+    book.update(position(1, TradeType.Buy, 1.0, 2.0))
+    slot = book._slots[1]
+    book.update(position(1, TradeType.Buy, 1.5, None))
+    assert book._slots[1] == slot and len(book) == 1
+    assert book.StopLoss[slot] == 1.5 and np.isnan(book.TakeProfit[slot])
+
+def test_levels():
+    book = BookAPI(TradeType.Buy)
+    assert book.levels() == (-np.inf, np.inf, np.inf, -np.inf)
+    book.update(position(1, TradeType.Buy, 1.0, 3.0))
+    book.update(position(2, TradeType.Buy, 1.2, None))
+    book.update(position(3, TradeType.Buy, None, 2.5))
+    book.update(position(4, TradeType.Sell, 4.0, 0.5))
+    book.update(position(5, TradeType.Sell, 3.5, None))
+    book.update(position(6, TradeType.Sell, None, 0.8))
+    assert book.levels() == (1.2, 2.5, 3.5, 0.8)
+    book.delete(2)
+    book.delete(6)
+    assert book.levels() == (1.0, 2.5, 3.5, 0.5)
+
+@pytest.mark.parametrize("seed", range(20))
+def test_triggered_matches_baseline(seed):
+    rng = np.random.default_rng(seed)
+    book = BookAPI(TradeType.Buy, capacity=4)
+    positions = {}
+    for pid in range(1, 40):
+        side = TradeType.Buy if rng.random() < 0.5 else TradeType.Sell
+        levels = [float(np.round(rng.normal(100, 2), 1)) if rng.random() < 0.7 else None for _ in range(2)]
+        positions[pid] = position(pid, side, *levels)
+        book.update(positions[pid])
+    for pid in rng.choice(list(positions), size=10, replace=False).tolist():
+        book.delete(pid)
+        del positions[pid]
+    for _ in range(50):
+        low, high, following = sorted(np.round(rng.normal(100, 2, 2), 1).tolist()) + [float(np.round(rng.normal(100, 2), 1))]
+        prices = (low + 0.2, low, high + 0.2, high, following + 0.2, following)
+        actual = [(item.PositionID, trigger) for item, trigger in book.triggered(*prices)]
+        assert actual == baseline(sorted(positions.values(), key=lambda item: item.PositionID), *prices)
+        assert all(book.find(pid) is positions[pid] for pid, _ in actual)
+
+def test_triggered_priority():
+    book = BookAPI(TradeType.Buy)
+    book.update(position(2, TradeType.Buy, 99.0, 101.0))
+    book.update(position(1, TradeType.Sell, 101.0, 99.0))
+    assert [(item.PositionID, trigger) for item, trigger in book.triggered(98.5, 98.0, 102.5, 102.0, 100.5, 100.0)] == [(1, TriggerType.High), (2, TriggerType.Low)]
+    assert [(item.PositionID, trigger) for item, trigger in book.triggered(99.5, 99.5, 100.5, 100.5, 101.5, 101.5)] == [(1, TriggerType.Open), (2, TriggerType.Open)]
+    assert book.triggered(99.5, 99.5, 100.5, 100.5, 100.0, 100.0) == []
@@ -0,0 +1,103 @@
+import pytest
+import threading
+
+from Library.Database.Queue import SpoolQueueAPI
+from Library.System.Coordinator import CoordinatorAPI
+
+NAMESPACE = "Optimization"
+
+class FlakyQueueAPI(SpoolQueueAPI):
+
+    def __init__(self, *, failures: int, **kwargs) -> None:
+        super().__init__(**kwargs)
+        self.Failures: int = failures
+        self.Attempts: int = 0
+
+    def collect(self, tasks):
+        self.Attempts += 1
+        if self.Attempts <= self.Failures:
+            raise ConnectionError("unreachable")
+        return super().collect(tasks)
+
+def window(payload):
+    return payload["Window"] * 2
+
+def fail(payload):
+    raise ValueError("boom")
+
+def queue(tmp_path) -> SpoolQueueAPI:
+    return SpoolQueueAPI(path=tmp_path, namespace=NAMESPACE, lease=0.5)
+
+def serve(tmp_path, worker: str, run, idle: float = 0.5) -> threading.Thread:
+    thread = threading.Thread(target=CoordinatorAPI.serve, args=(queue(tmp_path), worker, run, idle, 0.01), daemon=True)
+    thread.start()
+    return thread
+
+@pytest.fixture
+def coordinator(tmp_path):
+    coordinator = CoordinatorAPI(queue(tmp_path), poll=0.01)
+    yield coordinator
+    coordinator.shutdown(cancel_futures=True)
+
+def test_round_trip(tmp_path, coordinator):
+    futures = [coordinator.publish(f"Task{value}", {"Window": value}, lambda result: ("Done", result)) for value in (10, 20)]
+    served = []
+    serve(tmp_path, "Worker-1", lambda payload: served.append(payload["Window"]) or window(payload)).join(timeout=10)
+    assert [future.result(timeout=10) for future in futures] == [("Done", 20), ("Done", 40)]
+    assert sorted(served) == [10, 20]
+
+def test_duplicate_publish_shares_task(tmp_path, coordinator):
+    futures = [coordinator.publish("Task", {"Window": 10}, lambda result: result) for _ in range(2)]
+    served = []
+    serve(tmp_path, "Worker-1", lambda payload: served.append(payload) or window(payload)).join(timeout=10)
+    assert [future.result(timeout=10) for future in futures] == [20, 20]
+    assert len(served) == 1
+
+def test_error_propagates(tmp_path, coordinator):
+    future = coordinator.publish("Task", {"Window": 10}, lambda result: result)
+    serve(tmp_path, "Worker-1", fail).join(timeout=10)
+    with pytest.raises(RuntimeError, match="ValueError: boom"):
+        future.result(timeout=10)
+
+def test_dead_worker_is_released(tmp_path, coordinator):
+    future = coordinator.publish("Task", {"Window": 10}, lambda result: result)
+    dead = queue(tmp_path)
+    assert dead.lease("Worker-Dead") == ("Task", {"Window": 10})
+    served = []
+    serve(tmp_path, "Worker-1", lambda payload: served.append(payload) or window(payload), idle=2.0).join(timeout=10)
+    assert future.result(timeout=10) == 20
+    assert len(served) == 1
+    assert not dead.renew("Task", "Worker-Dead")
+
+def test_collect_retries_transient_errors(tmp_path):
+    flaky = FlakyQueueAPI(path=tmp_path, namespace=NAMESPACE, lease=0.5, failures=3)
+    coordinator = CoordinatorAPI(flaky, poll=0.01, retries=5)
+    try:
+        future = coordinator.publish("Task", {"Window": 10}, lambda result: result)
+        serve(tmp_path, "Worker-1", window).join(timeout=10)
+        assert future.result(timeout=10) == 20
+        assert flaky.Attempts > 3
+    finally:
+        coordinator.shutdown(cancel_futures=True)
+
+def test_collect_fails_after_retries(tmp_path):
+    flaky = FlakyQueueAPI(path=tmp_path, namespace=NAMESPACE, lease=0.5, failures=100)
+    coordinator = CoordinatorAPI(flaky, poll=0.01, retries=3)
+    try:
+        future = coordinator.publish("Task", {"Window": 10}, lambda result: result)
+        with pytest.raises(ConnectionError, match="unreachable"):
+            future.result(timeout=10)
+        assert flaky.Attempts >= 3
+    finally:
+        coordinator.shutdown(cancel_futures=True)
+
+def test_shutdown_fails_pending_after_error(tmp_path):
+    flaky = FlakyQueueAPI(path=tmp_path, namespace=NAMESPACE, lease=0.5, failures=100)
+    coordinator = CoordinatorAPI(flaky, poll=0.01, retries=1000)
+    future = coordinator.publish("Task", {"Window": 10}, lambda result: result)
+    while flaky.Attempts == 0:
+        threading.Event().wait(0.01)
+    assert not future.done()
+    coordinator.shutdown()
+    with pytest.raises(ConnectionError, match="unreachable"):
+        future.result(timeout=1)
@@ -0,0 +1,97 @@
+import pytest
+import numpy as np
+
+from datetime import datetime, timedelta
+
+from Library.System.Interleave import LegAPI, InterleaveAPI
+
+START = np.datetime64(datetime(2024, 1, 1), "us")
+
+class ScriptedLegAPI(LegAPI):
+
+    def __init__(self, symbol: str, minutes: list[int], log: list, limit: int | None = None) -> None:
+        self.Symbol: str = symbol
+        self.Timestamps: list[np.datetime64] = [START + np.timedelta64(timedelta(minutes=minute)) for minute in minutes]
+        self.Limit: int | None = limit
+        self.Primed: bool = False
+        self.Processed: int = 0
+        self.Fills: list[np.datetime64 | None] = []
+        self._log: list = log
+        self._cursor: int = 0
+        self._bus: list[np.datetime64] = []
+        self._terminated: bool = False
+
+    def prime(self) -> None:
+        self.Primed = True
+        self._log.append(("Prime", self.Symbol))
+
+    def clock(self) -> np.datetime64 | None:
+        return self.Timestamps[self._cursor] if self._cursor < len(self.Timestamps) else None
+
+    def fill(self, horizon: np.datetime64 | None) -> bool:
+        if self._bus:
+            return True
+        self.Fills.append(horizon)
+        if (timestamp := self.clock()) is None or (horizon is not None and timestamp > horizon):
+            return False
+        self._bus.append(timestamp)
+        self._cursor += 1
+        return True
+
+    def step(self) -> None:
+        if not self._bus:
+            self._terminated = True
+            self._log.append(("Shutdown", self.Symbol))
+            return
+        self._log.append(("Event", self.Symbol, self._bus.pop(0)))
+        self.Processed += 1
+        if self.Limit is not None and self.Processed >= self.Limit:
+            self._terminated = True
+            self._log.append(("Shutdown", self.Symbol))
+
+    def is_terminated(self) -> bool:
+        return self._terminated
+
+def merge(*scripts):
+    log = []
+    legs = [ScriptedLegAPI(symbol, minutes, log, limit) for symbol, minutes, limit in scripts]
+    InterleaveAPI.merge(legs)
+    return legs, log
+
+def events(log, symbol=None):
+    return [entry[2] for entry in log if entry[0] == "Event" and symbol in (None, entry[1])]
+
+def test_merge_interleaves_by_timestamp():
+    legs, log = merge(("EURUSD", [0, 5, 5, 12, 30, 31], None), ("GBPUSD", [1, 5, 11, 12, 13, 40], None))
+    assert [entry[0] for entry in log[:2]] == ["Prime", "Prime"]
+    assert events(log) == sorted(events(log))
+    assert [entry[1] for entry in log if entry[0] == "Event"] == ["EURUSD", "GBPUSD", "GBPUSD", "EURUSD", "EURUSD", "GBPUSD", "GBPUSD", "EURUSD", "GBPUSD", "EURUSD", "EURUSD", "GBPUSD"]
+    assert all(leg.Processed == len(leg.Timestamps) and leg.is_terminated() for leg in legs)
+    assert [entry for entry in log if entry[0] == "Shutdown"] == [("Shutdown", "EURUSD"), ("Shutdown", "GBPUSD")]
+
+def test_merge_bounds_fills_by_other_clock():
+    legs, log = merge(("EURUSD", [0, 10, 20], None), ("GBPUSD", [5, 15, 25], None))
+    eurusd, gbpusd = legs
+    assert eurusd.Fills[:2] == [START + np.timedelta64(5, "m")] * 2
+    assert gbpusd.Fills[:2] == [START + np.timedelta64(10, "m")] * 2
+    assert gbpusd.Fills[-1] is None
+
+def test_merge_continues_after_leg_terminates_early():
+    legs, log = merge(("EURUSD", [0, 2, 4, 6, 8], 2), ("GBPUSD", [1, 3, 5, 7, 9], None), ("USDJPY", [], None))
+    eurusd, gbpusd, usdjpy = legs
+    assert eurusd.Processed == 2 and eurusd.is_terminated()
+    assert gbpusd.Processed == 5 and gbpusd.is_terminated()
+    assert usdjpy.Primed and usdjpy.Processed == 0 and usdjpy.is_terminated()
+    assert events(log) == sorted(events(log))
+    assert log.index(("Shutdown", "USDJPY")) < log.index(("Event", "EURUSD", START))
+    assert log.index(("Shutdown", "EURUSD")) < log.index(("Event", "GBPUSD", START + np.timedelta64(3, "m")))
+    assert gbpusd.Fills[-1] is None
+
+@pytest.mark.parametrize("seed", range(10))
+def test_merge_matches_sorted_stream(seed):
+    rng = np.random.default_rng(seed)
+    scripts = [(symbol, sorted(rng.integers(0, 200, int(rng.integers(0, 40))).tolist()), None) for symbol in ("EURUSD", "GBPUSD", "USDJPY")]
+    legs, log = merge(*scripts)
+    assert events(log) == sorted(events(log))
+    for leg in legs:
+        assert events(log, leg.Symbol) == leg.Timestamps and leg.is_terminated()
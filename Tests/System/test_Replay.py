@@ -0,0 +1,261 @@
+import pytest
+import numpy as np
+import polars as pl
+
+from enum import Enum
+from collections import namedtuple
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+
+from Library.System.Book import BookAPI, TriggerType
+from Library.System.Replay import ReplayAPI
+
+Bar = namedtuple("Bar", ["Timestamp", "GapPrice", "OpenPrice", "HighPrice", "LowPrice", "ClosePrice", "TickVolume"])
+Tick = namedtuple("Tick", ["Timestamp", "Ask", "Bid"])
+
+SPREAD = 0.5
+START = datetime(2024, 1, 1)
+
+def spread_fee(timestamp, price):
+    return np.full(len(price), SPREAD)
+
+@pytest.fixture(scope="module")
+def market():
+    rng = np.random.default_rng(1)
+    timestamps = sorted(START + timedelta(seconds=int(second)) for second in rng.choice(6 * 3600, size=400, replace=False))
+    timestamps = [timestamp for timestamp in timestamps if not START + timedelta(hours=3) <= timestamp < START + timedelta(hours=4)]
+    prices = 100 + np.cumsum(rng.normal(0, 1, len(timestamps)))
+    spreads = np.abs(rng.normal(0, 0.5, len(timestamps)))
+    tick_df = pl.DataFrame({
+        "Timestamp": timestamps,
+        "GapPrice": prices,
+        "OpenPrice": prices,
+        "HighPrice": prices + spreads,
+        "LowPrice": prices - spreads,
+        "ClosePrice": prices + rng.normal(0, 0.1, len(timestamps)),
+        "TickVolume": rng.integers(1, 10, len(timestamps)).astype(float)
+    })
+    bar_df = pl.DataFrame({"Timestamp": [START + timedelta(hours=hour) for hour in range(7)]}).join(
+        ReplayAPI.resample(tick_df, 3600), on="Timestamp", how="left"
+    ).with_columns(pl.col("OpenPrice", "HighPrice", "LowPrice", "ClosePrice").fill_null(strategy="forward"), pl.col("TickVolume").fill_null(0.0))
+    return tick_df, bar_df.with_columns(pl.col("ClosePrice").shift(1).fill_null(pl.col("OpenPrice")).alias("GapPrice"))
+
+def chunks(tick_df, sizes):
+    offsets = np.cumsum([0, *sizes])
+    return [tick_df.slice(int(start), int(stop - start)) for start, stop in zip(offsets[:-1], offsets[1:]) if stop > start] + ([tick_df.slice(int(offsets[-1]))] if offsets[-1] < tick_df.height else [])
+
+def replay(tick_df, bar_df, sizes, bar_start=START):
+    return ReplayAPI(chunks(tick_df, sizes), bar_df, bar_start, spread_fee, Bar, Tick)
+
+def naive(tick_df, bar_df, bar_start=START):
+    rows, bars = list(tick_df.iter_rows(named=True)), list(bar_df.iter_rows(named=True))
+    cursor = next(index for index, bar in enumerate(bars) if bar["Timestamp"] >= bar_start)
+    gap = bars[cursor]["GapPrice"]
+    high = low = close = bars[cursor]["OpenPrice"]
+    volume, events = 0.0, []
+
+    def running():
+        return Bar(bars[cursor]["Timestamp"], gap, bars[cursor]["OpenPrice"], high, low, close, volume)
+
+    def close_bars(until):
+        nonlocal cursor, gap, high, low, close, volume
+        while cursor + 1 < len(bars) and (until is None or bars[cursor + 1]["Timestamp"] <= until):
+            events.append(("Bar", Bar(*bars[cursor].values()), running()))
+            gap = bars[cursor]["ClosePrice"]
+            cursor += 1
+            high = low = close = bars[cursor]["OpenPrice"]
+            volume = 0.0
+
+    for index, row in enumerate(rows):
+        close_bars(row["Timestamp"])
+        high, low, close, volume = max(high, row["HighPrice"]), min(low, row["LowPrice"]), row["ClosePrice"], volume + row["TickVolume"]
+        following = rows[min(index + 1, len(rows) - 1)]
+        events.append(("Tick", row["Timestamp"], Tick(following["Timestamp"], following["OpenPrice"] + SPREAD, following["OpenPrice"]), running()))
+    close_bars(None)
+    return events
+
+def walk(replay):
+    events = []
+    while replay.has_bar() or replay.has_tick():
+        if replay.is_bar_closed():
+            events.append(("Bar", replay.bar(), replay.running()))
+            replay.close_bar()
+            continue
+        index = replay.advance()
+        events.append(("Tick", replay.timestamp(index), replay.next_open(), replay.running()))
+    return events
+
+def assert_events(actual, expected):
+    assert [event[0] for event in actual] == [event[0] for event in expected]
+    for actual_event, expected_event in zip(actual, expected):
+        for actual_value, expected_value in zip(actual_event[1:], expected_event[1:]):
+            if isinstance(expected_value, tuple):
+                assert type(actual_value) is type(expected_value)
+                assert actual_value[0] == expected_value[0]
+                assert tuple(actual_value[1:]) == pytest.approx(tuple(expected_value[1:]))
+            else:
+                assert actual_value == expected_value
+
+@pytest.mark.parametrize("sizes", [[], [1] * 20, [7] * 60, [50, 1, 1, 120, 3], [199, 1, 200]], ids=["Single", "Ones", "Sevens", "Mixed", "Boundary"])
+def test_replay_matches_row_loop(market, sizes):
+    tick_df, bar_df = market
+    assert_events(walk(replay(tick_df, bar_df, sizes)), naive(tick_df, bar_df))
+
+def test_replay_chunks_at_bar_boundaries(market):
+    tick_df, bar_df = market
+    sizes = tick_df.group_by_dynamic("Timestamp", every="1h").agg(pl.len())["len"].to_list()
+    assert_events(walk(replay(tick_df, bar_df, sizes)), naive(tick_df, bar_df))
+
+def test_replay_from_bar_start(market):
+    tick_df, bar_df = market
+    bar_start = START + timedelta(hours=2)
+    tick_df = tick_df.filter(pl.col("Timestamp") >= bar_start)
+    assert_events(walk(replay(tick_df, bar_df, [30] * 10, bar_start)), naive(tick_df, bar_df, bar_start))
+
+def test_next_open_spans_chunks(market):
+    tick_df, bar_df = market
+    engine = replay(tick_df, bar_df, [5])
+    for _ in range(5):
+        engine.advance()
+    assert engine.TickLength == 5 and len(engine.TickOpen) == 6
+    assert engine.next_open() == Tick(tick_df["Timestamp"][5], tick_df["OpenPrice"][5] + SPREAD, tick_df["OpenPrice"][5])
+    assert engine.has_tick() and engine.TickCursor == 0
+    assert engine.timestamp(engine.advance()) == tick_df["Timestamp"][5]
+
+def test_bar_close_without_ticks(market):
+    tick_df, bar_df = market
+    engine = replay(tick_df.filter(pl.col("Timestamp") < START + timedelta(hours=3)), bar_df, [])
+    while engine.has_tick() or not engine.is_bar_closed():
+        if engine.is_bar_closed():
+            engine.close_bar()
+        else:
+            engine.advance()
+    closed = []
+    while engine.is_bar_closed():
+        closed.append(engine.bar().Timestamp)
+        engine.close_bar()
+        running = engine.running()
+        assert running.HighPrice == running.LowPrice == running.ClosePrice == running.OpenPrice == bar_df["OpenPrice"][engine.BarCursor]
+        assert running.TickVolume == 0.0
+    assert closed == [START + timedelta(hours=hour) for hour in range(2, 6)]
+    assert not engine.has_bar() and not engine.has_tick()
+
+class TradeType(Enum):
+    Buy = 0
+    Sell = 1
+
+@dataclass
+class Price:
+    Price: float | None
+
+@dataclass
+class Position:
+    PositionID: int
+    TradeType: TradeType
+    StopLoss: Price
+    TakeProfit: Price
+    Volume: float = 1.0
+
+TARGETS = ("AskAbove", "AskBelow", "BidAbove", "BidBelow")
+
+def hit(name, level, open_ask, open_bid):
+    price = open_ask if name.startswith("Ask") else open_bid
+    return price >= level if name.endswith("Above") else price <= level
+
+def simulate(engine, fast, strategy, book, targets):
+    events = []
+    while engine.has_bar() or engine.has_tick():
+        if engine.is_bar_closed():
+            events.append(("Bar", engine.bar(), engine.running()))
+            strategy(engine, book, targets)
+            engine.close_bar()
+            continue
+        if fast:
+            levels = (*book.levels(), *[targets.get(name) for name in TARGETS]) if book or targets else None
+            if (index := engine.forward(None, levels)) is None:
+                continue
+        else:
+            index = engine.advance()
+        following = engine.next_open_index()
+        open_ask, open_bid = engine.TickOpenAsk[following], engine.TickOpen[following]
+        for position, trigger in book.triggered(engine.TickLowAsk[index], engine.TickLow[index], engine.TickHighAsk[index], engine.TickHigh[index], open_ask, open_bid):
+            events.append(("Close", position.PositionID, trigger, engine.timestamp(index), engine.running()))
+            book.delete(position.PositionID)
+        for name in TARGETS:
+            if name in targets and hit(name, targets[name], open_ask, open_bid):
+                events.append(("Target", name, engine.next_open(), engine.running()))
+                del targets[name]
+    events.append(("End", engine.running()))
+    return events
+
+def random_strategy(seed):
+    rng = np.random.default_rng(seed)
+    positions = iter(range(1, 10_000))
+
+    def strategy(engine, book, targets):
+        tick = engine.next_open()
+        if rng.random() < 0.6:
+            side = TradeType.Buy if rng.random() < 0.5 else TradeType.Sell
+            sign = 1 if side == TradeType.Buy else -1
+            stop_loss = tick.Bid - sign * rng.uniform(0.5, 4) if rng.random() < 0.8 else None
+            take_profit = tick.Bid + sign * rng.uniform(0.5, 4) if rng.random() < 0.8 else None
+            book.update(Position(next(positions), side, Price(stop_loss), Price(take_profit)))
+        if rng.random() < 0.8:
+            name = TARGETS[int(rng.integers(len(TARGETS)))]
+            targets[name] = (tick.Ask if name.startswith("Ask") else tick.Bid) + (1 if name.endswith("Above") else -1) * rng.uniform(0, 3)
+
+    return strategy
+
+@pytest.mark.parametrize("seed", range(10))
+@pytest.mark.parametrize("sizes", [[], [7] * 60, [199, 1, 200]], ids=["Single", "Sevens", "Boundary"])
+def test_fast_forward_matches_tick_loop(market, seed, sizes):
+    tick_df, bar_df = market
+    fast = simulate(replay(tick_df, bar_df, sizes), True, random_strategy(seed), BookAPI(TradeType.Buy), {})
+    slow = simulate(replay(tick_df, bar_df, sizes), False, random_strategy(seed), BookAPI(TradeType.Buy), {})
+    assert any(event[0] == "Close" for event in slow) and any(event[0] == "Target" for event in slow)
+    assert_events(fast, slow)
+
+@pytest.mark.parametrize("sizes", [[], [3, 1], [4], [1] * 7], ids=["Single", "Split", "Boundary", "Ones"])
+def test_fast_forward_triggers_on_segment_end(sizes):
+    minutes = [0, 10, 20, 59, 60, 70, 120]
+    prices = [100.0, 100.0, 100.0, 100.0, 105.0, 105.0, 105.0]
+    tick_df = pl.DataFrame({
+        "Timestamp": [START + timedelta(minutes=minute) for minute in minutes],
+        "GapPrice": prices,
+        "OpenPrice": prices,
+        "HighPrice": prices,
+        "LowPrice": [99.0, 99.0, 99.0, 95.0, 104.0, 104.0, 104.0],
+        "ClosePrice": prices,
+        "TickVolume": [1.0] * len(prices)
+    })
+    bar_df = pl.DataFrame({"Timestamp": [START + timedelta(hours=hour) for hour in range(4)]}).join(
+        ReplayAPI.resample(tick_df, 3600), on="Timestamp", how="left"
+    ).with_columns(pl.col("GapPrice", "OpenPrice", "HighPrice", "LowPrice", "ClosePrice").fill_null(strategy="forward"), pl.col("TickVolume").fill_null(0.0))
+    events = {}
+    for fast in (True, False):
+        book, targets = BookAPI(TradeType.Buy), {"BidAbove": 105.0, "AskBelow": 95.0}
+        book.update(Position(1, TradeType.Buy, Price(95.0), Price(None)))
+        book.update(Position(2, TradeType.Sell, Price(None), Price(95.5)))
+        book.update(Position(3, TradeType.Buy, Price(None), Price(105.0)))
+        book.update(Position(4, TradeType.Sell, Price(105.5), Price(None)))
+        events[fast] = simulate(replay(tick_df, bar_df, sizes), fast, lambda engine, book, targets: None, book, targets)
+    assert_events(events[True], events[False])
+    segment_end = START + timedelta(minutes=59)
+    triggers = [event[:4] for event in events[True] if event[0] == "Close"]
+    assert triggers == [("Close", 1, TriggerType.Low, segment_end), ("Close", 2, TriggerType.Low, segment_end), ("Close", 3, TriggerType.Open, segment_end), ("Close", 4, TriggerType.Open, segment_end)]
+    assert [(event[1], event[2].Timestamp) for event in events[True] if event[0] == "Target"] == [("BidAbove", START + timedelta(hours=1))]
+    assert "AskBelow" not in [event[1] for event in events[False] if event[0] == "Target"]
+
+def test_fast_forward_stops_at_horizon(market):
+    tick_df, bar_df = market
+    horizon = np.datetime64(START + timedelta(minutes=150), "us")
+    engine = replay(tick_df, bar_df, [50] * 10)
+    while (timestamp := engine.peek()) is not None and timestamp <= horizon:
+        if engine.is_bar_closed():
+            engine.close_bar()
+        else:
+            assert engine.forward(horizon, None) is None
+    assert engine.TickTimestamp[engine.TickCursor] > horizon
+    expected = tick_df.filter((pl.col("Timestamp") >= START + timedelta(hours=2)) & (pl.col("Timestamp") <= horizon.item()))
+    assert engine.running().ClosePrice == pytest.approx(expected["ClosePrice"][-1])
+    assert engine.running().HighPrice == pytest.approx(max(expected["HighPrice"].max(), bar_df["OpenPrice"][2]))
@@ -0,0 +1,106 @@
+import os
+import time
+import pytest
+import numpy as np
+
+from time import localtime
+from datetime import datetime, timedelta
+
+from Library.System.Rollover import RolloverAPI
+
+PERIOD, SUMMER, WINTER, EXTRA = 24, 21, 22, 2
+
+START = datetime(2023, 1, 1)
+STOP = datetime(2025, 1, 1)
+
+SWITCHES = {
+    "Europe/Berlin": [datetime(2023, 3, 26), datetime(2023, 10, 29), datetime(2024, 3, 31), datetime(2024, 10, 27)],
+    "America/New_York": [datetime(2023, 3, 12), datetime(2023, 11, 5), datetime(2024, 3, 10), datetime(2024, 11, 3)],
+    "UTC": []
+}
+
+def baseline(entry_timestamp, exit_timestamp, period=PERIOD, summer=SUMMER, winter=WINTER, extra=EXTRA):
+
+    def isdst(timestamp):
+        return bool(localtime(timestamp.timestamp()).tm_isdst)
+
+    def rollover(at_timestamp, at_isdst):
+        to_timestamp = at_timestamp + timedelta(hours=period)
+        to_isdst = isdst(to_timestamp)
+        if at_isdst and not to_isdst:
+            return to_timestamp.replace(hour=winter), to_isdst
+        if not at_isdst and to_isdst:
+            return to_timestamp.replace(hour=summer), to_isdst
+        return to_timestamp, to_isdst
+
+    if exit_timestamp <= entry_timestamp:
+        return 0
+
+    rollover_isdst = isdst(entry_timestamp)
+    rollover_timestamp = datetime(year=entry_timestamp.year, month=entry_timestamp.month, day=entry_timestamp.day, hour=summer if rollover_isdst else winter)
+    while rollover_timestamp < entry_timestamp:
+        rollover_timestamp, rollover_isdst = rollover(rollover_timestamp, rollover_isdst)
+
+    overnights = 0
+    while rollover_timestamp < exit_timestamp:
+        match rollover_timestamp.weekday():
+            case weekday if weekday == extra:
+                overnights += 3
+            case 5 | 6:
+                overnights += 0
+            case _:
+                overnights += 1
+        rollover_timestamp, rollover_isdst = rollover(rollover_timestamp, rollover_isdst)
+    return overnights
+
+@pytest.fixture(params=list(SWITCHES))
+def timezone(request):
+    previous = os.environ.get("TZ")
+    os.environ["TZ"] = request.param
+    time.tzset()
+    yield request.param
+    if previous is None:
+        del os.environ["TZ"]
+    else:
+        os.environ["TZ"] = previous
+    time.tzset()
+
+def rollover(extra=EXTRA):
+    return RolloverAPI(START - timedelta(days=1), STOP + timedelta(days=1), PERIOD, SUMMER, WINTER, extra)
+
+def test_overnights_match_baseline(timezone):
+    rng = np.random.default_rng(3)
+    engine = rollover()
+    for _ in range(2000):
+        entry = START + timedelta(seconds=int(rng.integers(0, 680 * 86400)))
+        exit = entry + timedelta(seconds=int(rng.integers(-86400, 40 * 86400)))
+        assert engine.overnights(entry, exit) == baseline(entry, exit), (entry, exit)
+
+def test_overnights_across_dst_switches(timezone):
+    engine = rollover()
+    for switch in SWITCHES[timezone]:
+        for entry_hours in range(-72, 48, 5):
+            for exit_hours in (1, 12, 23, 24, 25, 47, 72, 169):
+                entry = switch + timedelta(hours=entry_hours, minutes=30)
+                exit = entry + timedelta(hours=exit_hours)
+                assert engine.overnights(entry, exit) == baseline(entry, exit), (entry, exit)
+
+def test_overnights_on_rollover_timestamps(timezone):
+    engine = rollover()
+    timestamps = [timestamp.item() for timestamp in engine.Timestamp if START <= timestamp.item() < STOP]
+    assert {timestamp.hour for timestamp in timestamps} <= {SUMMER, WINTER}
+    for entry, exit in zip(timestamps[::7], timestamps[3::7]):
+        assert engine.overnights(entry, exit) == baseline(entry, exit)
+        assert engine.overnights(entry, entry) == 0
+        assert engine.overnights(exit, entry) == 0
+        assert engine.overnights(entry, entry + timedelta(microseconds=1)) == baseline(entry, entry + timedelta(microseconds=1))
+
+@pytest.mark.parametrize("extra", range(7))
+def test_triple_swap_weekday(extra):
+    engine = rollover(extra)
+    monday = datetime(2024, 1, 8, 12)
+    for day in range(7):
+        entry = monday + timedelta(days=day)
+        expected = 3 if day == extra else 0 if day in (5, 6) else 1
+        assert engine.overnights(entry, entry + timedelta(days=1)) == expected == baseline(entry, entry + timedelta(days=1), extra=extra)
+    assert engine.overnights(monday, monday + timedelta(weeks=1)) == (7 if extra < 5 else 8) == baseline(monday, monday + timedelta(weeks=1), extra=extra)
@@ -0,0 +1,70 @@
+import pytest
+import polars as pl
+
+from datetime import date, datetime
+
+from Library.Analyst import IndicatorCacheAPI
+from Library.System.Store import StoreAPI
+
+START, STOP = date(2024, 1, 1), date(2024, 2, 1)
+
+def statistics(value: float) -> pl.DataFrame:
+    return pl.DataFrame({"Metric": ["Net PnL", "Trades"], "Total": [value, 2.0]})
+
+@pytest.fixture
+def store(tmp_path):
+    return StoreAPI(tmp_path, flush=2)
+
+def test_key_is_stable():
+    assert StoreAPI.key(strategy="Strategy", start=START, window=20) == StoreAPI.key(window=20, start=START, strategy="Strategy")
+    assert StoreAPI.key(strategy="Strategy", start=START, window=20) != StoreAPI.key(strategy="Strategy", start=START, window=21)
+
+def test_put_get(store):
+    key = StoreAPI.key(window=20)
+    assert store.get(key) is None
+    store.put(key, statistics(1.0), "Strategy", START, STOP, {"Window": 20})
+    assert key in store and len(store) == 1
+    assert store.get(key).equals(statistics(1.0))
+
+def test_duplicate_put_is_ignored(store):
+    store.put("A", statistics(1.0), "Strategy", START, STOP, {"Window": 20})
+    store.put("A", statistics(2.0), "Strategy", START, STOP, {"Window": 20})
+    assert store.get("A").equals(statistics(1.0))
+    assert store.read().height == 2
+
+def test_flush_and_reopen(store, tmp_path):
+    store.put("A", statistics(1.0), "Strategy", START, STOP, {"Window": 20})
+    assert not list(tmp_path.glob("*.parquet"))
+    store.put("B", statistics(2.0), "Strategy", START, STOP, {"Window": 30})
+    assert len(list(tmp_path.glob("*.parquet"))) == 1
+    store.put("C", statistics(3.0), "Strategy", START, STOP, {"Window": 40})
+    store.flush()
+    reopened = StoreAPI(tmp_path)
+    assert len(reopened) == 3
+    for key, value in [("A", 1.0), ("B", 2.0), ("C", 3.0)]:
+        assert reopened.get(key).equals(statistics(value))
+    assert reopened.read().filter(pl.col(StoreAPI.KEY) == "B")[StoreAPI.PARAMETERS].to_list() == ['{"Window": 30}'] * 2
+
+def test_schemas_split_part_files(store, tmp_path):
+    store.put("A", statistics(1.0), "Strategy", START, STOP, {"Window": 20})
+    store.put("B", statistics(2.0).with_columns(pl.col("Total").cast(pl.Float32)), "Strategy", START, STOP, {"Window": 30})
+    files = sorted(tmp_path.glob("*.parquet"))
+    assert len(files) == 2
+    assert {pl.read_parquet(file)["Total"].dtype for file in files} == {pl.Float64, pl.Float32}
+    reopened = StoreAPI(tmp_path)
+    assert reopened.get("A").equals(statistics(1.0))
+    assert reopened.get("B")["Total"].dtype == pl.Float32
+    assert reopened.read().height == 4
+
+def test_data_fingerprint_is_stable():
+    df = pl.DataFrame({"Timestamp": [datetime(2024, 1, 1), datetime(2024, 1, 2)], "ClosePrice": [1.5, None], "TickVolume": [10, 20]})
+    assert IndicatorCacheAPI.fingerprint(df) == "7ecc1cc6982b707c4d0b077597df09b3"
+    assert IndicatorCacheAPI.fingerprint(pl.concat([df.head(1), df.tail(1)], rechunk=False)) == IndicatorCacheAPI.fingerprint(df)
+    assert IndicatorCacheAPI.fingerprint(df.with_columns(pl.col("ClosePrice").fill_null(0.0))) != IndicatorCacheAPI.fingerprint(df)
+
+def test_key_tracks_data(store):
+    df = pl.DataFrame({"Timestamp": [datetime(2024, 1, 1), datetime(2024, 1, 2)], "ClosePrice": [1.5, 1.6]})
+    key = StoreAPI.key(strategy="Strategy", start=START, data=IndicatorCacheAPI.fingerprint(df))
+    store.put(key, statistics(1.0), "Strategy", START, STOP, {"Window": 20})
+    assert StoreAPI.key(strategy="Strategy", start=START, data=IndicatorCacheAPI.fingerprint(df.rechunk())) in store
+    assert StoreAPI.key(strategy="Strategy", start=START, data=IndicatorCacheAPI.fingerprint(df.with_columns(pl.col("ClosePrice") * 2))) not in store
@@ -0,0 +1,45 @@
+import pytest
+import numpy as np
+import polars as pl
+
+from datetime import date, datetime, timedelta
+
+from Library.System.Stream import StreamAPI
+from Library.System.Rate import TapRateAPI
+
+def pull(start, stop):
+    timestamps = pl.datetime_range(datetime.combine(start, datetime.min.time()), datetime.combine(stop, datetime.min.time()), "6h", closed="left", eager=True)
+    return pl.DataFrame({"Timestamp": timestamps, "OpenPrice": np.arange(timestamps.len(), dtype=np.float64)})
+
+def stream(days=1):
+    return StreamAPI(pull=pull, start=date(2024, 1, 1), stop=date(2024, 1, 10), days=days)
+
+def test_stream_partitions():
+    chunks = list(stream(days=3))
+    assert [chunk.height for chunk in chunks] == [12, 12, 12, 4]
+    assert pl.concat(chunks)["Timestamp"].is_sorted()
+
+def test_stream_close_joins_producer():
+    source = stream()
+    chunks = iter(source)
+    next(chunks)
+    source.close()
+    assert not any(thread.is_alive() for thread, _ in source._producers)
+
+def test_stream_raises_pull_errors():
+    def fail(start, stop):
+        raise RuntimeError("pull")
+    source = StreamAPI(pull=fail, start=date(2024, 1, 1), stop=date(2024, 1, 2), days=1)
+    with pytest.raises(RuntimeError, match="pull"):
+        list(source)
+
+def test_tap_rate_follows_chunks():
+    rate = TapRateAPI()
+    chunks = rate.tap(stream())
+    next(chunks)
+    assert rate.at(datetime(2024, 1, 1, 7)) == 1.0
+    next(chunks)
+    assert rate.at(datetime(2024, 1, 1, 19)) == 3.0
+    assert rate.at(datetime(2024, 1, 2, 13)) == 2.0
+    next(chunks)
+    assert rate.Timestamp[0] == np.datetime64("2024-01-02T00:00", "us")